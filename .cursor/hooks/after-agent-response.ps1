@@ -13,6 +13,11 @@
 .NOTES
     Input: JSON via stdin with response details
     Output: JSON (always allow)
+
+    Superseded by usage_analytics.py (afterAgentResponse in hook_handlers.py),
+    which writes the same JSONL log but updates the daily summary from
+    incremental aggregates instead of re-reading the whole month per response.
+    Kept for environments without Python.
 #>
 
 # Read input from stdin
@@ -88,13 +88,16 @@ try {
 
     # Check 5: SetLoadFields before Modify/Insert/Delete (line-by-line check)
     $lines = $content -split "`n"
+    $loadFieldsHits = @()
     for ($i = 0; $i -lt ($lines.Count - 1); $i++) {
         # Check if current line has SetLoadFields and next line has Modify/Insert/Delete
         if ($lines[$i] -match 'SetLoadFields' -and $lines[$i+1] -match '\.(Modify|Insert|Delete)\(') {
-            $violations += "❌ CRITICAL: SetLoadFields before Modify/Insert/Delete at line $($i+2)"
-            break
+            $loadFieldsHits += ($i + 2)
         }
     }
+    if ($loadFieldsHits.Count -gt 0) {
+        $violations += "❌ CRITICAL: SetLoadFields before Modify/Insert/Delete at line(s) $($loadFieldsHits -join ', ')"
+    }
 
     # Check 6: Direct Error() without TryFunction
     if ($content -match '\bError\s*\(' -and -not ($content -match '\[TryFunction\]')) {
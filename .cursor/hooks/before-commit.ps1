@@ -1,6 +1,8 @@
 #!/usr/bin/env pwsh
 # Before Commit Hook - Secret scanning before git commit
 # Scans for: API keys, passwords, connection strings, private keys
+# Superseded by secret_scan.py (streaming, file:line:col, .secretscan-allowlist);
+# kept for environments without Python.
 
 $inputJson = $input | Out-String | ConvertFrom-Json
 $files = $inputJson.files
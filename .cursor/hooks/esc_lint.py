@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+ESC Lint - Parallel, cached workspace-wide ESC audit for AL projects
+
+Runs the same rule set as the afterFileEdit hook (esc_rules.py) across every
+.al file in a workspace, including multi-app workspaces detected through
+app.json discovery. Files are scanned on a process pool and results are
+cached by content hash, so a re-run only re-scans changed files.
+
+Every violation is reported with line and column, as text, JSON or SARIF 2.1.0.
+
+Usage:
+    python .cursor/hooks/esc_lint.py [workspace] [--format text|json|sarif] [--output FILE]
+    python .cursor/hooks/esc_lint.py . --format sarif --output esc.sarif
+    python .cursor/hooks/esc_lint.py . --jobs 8 --fail-on error
+
+Cache: <workspace>/.cursor/esc-lint-cache.json (rebuilt when esc_rules.py changes)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import esc_rules
+
+CACHE_NAME = "esc-lint-cache.json"
+CACHE_VERSION = 1
+
+# Folders that never contain project source
+SKIP_DIRS = {".git", ".alpackages", ".alcache", ".altemplates", ".altestrunner", ".snapshots",
+             ".netpackages", "node_modules", ".vs", ".vscode", "symbols", ".agent"}
+
+# Below this many files a process pool costs more than it saves
+POOL_THRESHOLD = 32
+SEVERITY_ORDER = {"none": 3, "error": 2, "warning": 1}
+
+
+# ============================================================================
+# DISCOVERY
+# ============================================================================
+
+def discover(workspace):
+    """Return (al_files, app_roots) under `workspace`, skipping build folders."""
+    al_files, app_roots = [], []
+    for dirpath, dirnames, filenames in os.walk(workspace):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        if "app.json" in filenames:
+            app_roots.append(Path(dirpath))
+        al_files.extend(Path(dirpath) / name for name in sorted(filenames) if name.lower().endswith(".al"))
+    return al_files, app_roots
+
+
+def app_root_for(path, app_roots):
+    """Nearest enclosing app.json folder (deepest match wins)."""
+    best = None
+    for root in app_roots:
+        if root == path.parent or root in path.parents:
+            if best is None or len(root.parts) > len(best.parts):
+                best = root
+    return best
+
+
+def rules_fingerprint():
+    """Changes whenever esc_rules.py changes, invalidating cached results."""
+    source = Path(esc_rules.__file__).read_bytes()
+    return hashlib.sha256(source).hexdigest()[:16]
+
+
+# ============================================================================
+# SCANNING (runs in worker processes)
+# ============================================================================
+
+def scan_file(job):
+    """Worker: hash and check one file. Returns a cache entry dict."""
+    path, prefix = job
+    data = Path(path).read_bytes()
+    text = data.decode("utf-8-sig", errors="replace")
+    violations = esc_rules.check_text(text, prefix)
+    return path, {
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "prefix": prefix,
+        "violations": [[v.rule, v.line, v.column] for v in violations],
+    }
+
+
+def _load_cache(cache_path, fingerprint):
+    try:
+        cache = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != CACHE_VERSION or cache.get("rules") != fingerprint:
+        return {}
+    return cache.get("files", {})
+
+
+def _save_cache(cache_path, fingerprint, files):
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"version": CACHE_VERSION, "rules": fingerprint, "files": files}),
+                   encoding="utf-8")
+    os.replace(str(tmp), str(cache_path))
+
+
+def lint_workspace(workspace, jobs=None, prefix=None, use_cache=True):
+    """Lint every .al file under `workspace`. Returns (results, stats).
+
+    results: {relative_path: [(rule, line, column), ...]}
+    stats:   files, scanned, cached, apps, elapsed_ms
+    """
+    start = time.perf_counter()
+    workspace = Path(workspace).resolve()
+    fingerprint = rules_fingerprint()
+    cache_path = workspace / ".cursor" / CACHE_NAME
+    cached = _load_cache(cache_path, fingerprint) if use_cache else {}
+
+    al_files, app_roots = discover(workspace)
+    prefixes = {}
+    fresh, pending = {}, []
+    for path in al_files:
+        rel = path.relative_to(workspace).as_posix()
+        app = app_root_for(path, app_roots) or workspace
+        if app not in prefixes:
+            detected = esc_rules.detect_prefix(app)
+            if detected == esc_rules.DEFAULT_PREFIX and app != workspace:
+                detected = esc_rules.detect_prefix(workspace)
+            prefixes[app] = prefix or detected
+        file_prefix = prefixes[app]
+
+        stat = path.stat()
+        entry = cached.get(rel)
+        if (entry and entry["prefix"] == file_prefix
+                and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size):
+            fresh[rel] = entry
+            continue
+        pending.append((rel, str(path), file_prefix, stat))
+
+    # Content-hash check for files whose mtime moved but content may not have
+    still_pending = []
+    for rel, full, file_prefix, stat in pending:
+        entry = cached.get(rel)
+        if entry and entry["prefix"] == file_prefix:
+            with open(full, "rb") as handle:
+                digest = hashlib.sha256(handle.read()).hexdigest()
+            if digest == entry["sha256"]:
+                fresh[rel] = dict(entry, mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                continue
+        still_pending.append((rel, full, file_prefix, stat))
+
+    jobs_list = [(full, file_prefix) for _, full, file_prefix, _ in still_pending]
+    if len(jobs_list) >= POOL_THRESHOLD and (jobs or os.cpu_count() or 1) > 1:
+        workers = jobs or os.cpu_count()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunk = max(1, len(jobs_list) // (workers * 4))
+            scanned = list(pool.map(scan_file, jobs_list, chunksize=chunk))
+    else:
+        scanned = [scan_file(job) for job in jobs_list]
+
+    for (rel, _, _, stat), (_, entry) in zip(still_pending, scanned):
+        entry["mtime_ns"] = stat.st_mtime_ns
+        entry["size"] = stat.st_size
+        fresh[rel] = entry
+
+    if use_cache:
+        _save_cache(cache_path, fingerprint, fresh)
+
+    results = {rel: [tuple(v) for v in entry["violations"]] for rel, entry in sorted(fresh.items())}
+    stats = {
+        "files": len(al_files),
+        "scanned": len(still_pending),
+        "cached": len(al_files) - len(still_pending),
+        "apps": [root.relative_to(workspace).as_posix() or "." for root in app_roots],
+        "prefixes": sorted(set(prefixes.values())),
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+    }
+    return results, stats
+
+
+# ============================================================================
+# OUTPUT
+# ============================================================================
+
+def _rule_index(prefixes):
+    catalog = {}
+    for prefix in prefixes or [esc_rules.DEFAULT_PREFIX]:
+        for rule in esc_rules.rules_for(prefix):
+            catalog.setdefault(rule.id, rule)
+    return catalog
+
+
+def _plain(message):
+    """Rule message without the leading status icon."""
+    head, _, tail = message.partition(" ")
+    return tail if tail and not head.isalnum() else message
+
+
+def summary_line(results, stats):
+    total = sum(len(v) for v in results.values())
+    return (
+        "%d violation(s) in %d of %d file(s) - %d scanned, %d cached, %.1f ms"
+        % (total, sum(1 for v in results.values() if v), stats["files"],
+           stats["scanned"], stats["cached"], stats["elapsed_ms"])
+    )
+
+
+def format_text(results, stats):
+    catalog = _rule_index(stats["prefixes"])
+    lines = []
+    for rel, violations in results.items():
+        for rule, line, column in violations:
+            lines.append("%s:%d:%d: %s %s" % (rel, line, column, rule, catalog[rule].message))
+    lines.append(summary_line(results, stats))
+    return "\n".join(lines)
+
+
+def format_json(results, stats):
+    catalog = _rule_index(stats["prefixes"])
+    violations = [
+        {"file": rel, "line": line, "column": column, "rule": rule,
+         "severity": catalog[rule].severity, "message": _plain(catalog[rule].message)}
+        for rel, items in results.items() for rule, line, column in items
+    ]
+    return json.dumps({"stats": stats, "violations": violations}, indent=2, ensure_ascii=False)
+
+
+def format_sarif(results, stats):
+    catalog = _rule_index(stats["prefixes"])
+    rules = [
+        {
+            "id": rule.id,
+            "shortDescription": {"text": _plain(rule.message)},
+            "defaultConfiguration": {"level": rule.severity},
+            "helpUri": ".cursor/rules/002-development-patterns.mdc",
+        }
+        for rule in catalog.values()
+    ]
+    sarif_results = [
+        {
+            "ruleId": rule,
+            "level": catalog[rule].severity,
+            "message": {"text": _plain(catalog[rule].message)},
+            "locations": [{
+                "physicalLocation": {
+                    "artifactLocation": {"uri": rel, "uriBaseId": "%SRCROOT%"},
+                    "region": {"startLine": line, "startColumn": column},
+                }
+            }],
+        }
+        for rel, items in results.items() for rule, line, column in items
+    ]
+    sarif = {
+        "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+        "version": "2.1.0",
+        "runs": [{
+            "tool": {"driver": {"name": "esc-lint", "informationUri": "https://github.com/vanachterjacob/ProjectTemplate",
+                                "rules": rules}},
+            "results": sarif_results,
+        }],
+    }
+    return json.dumps(sarif, indent=2, ensure_ascii=False)
+
+
+FORMATTERS = {"text": format_text, "json": format_json, "sarif": format_sarif}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Workspace-wide ESC lint for AL projects")
+    parser.add_argument("workspace", nargs="?", default=".", help="Workspace or AL project root")
+    parser.add_argument("--format", choices=sorted(FORMATTERS), default="text")
+    parser.add_argument("--output", "-o", help="Write the report to a file instead of stdout")
+    parser.add_argument("--jobs", "-j", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--prefix", help="Override the project prefix (default: from 000-project-overview.mdc)")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not write the result cache")
+    parser.add_argument("--fail-on", choices=("error", "warning", "none"), default="error",
+                        help="Exit 1 when violations of this severity or worse exist (default: error)")
+    args = parser.parse_args(argv)
+
+    results, stats = lint_workspace(args.workspace, jobs=args.jobs, prefix=args.prefix,
+                                    use_cache=not args.no_cache)
+    report = FORMATTERS[args.format](results, stats)
+    if args.output:
+        Path(args.output).write_text(report + "\n", encoding="utf-8")
+        print(summary_line(results, stats))
+    else:
+        sys.stdout.buffer.write((report + "\n").encode("utf-8"))
+
+    threshold = SEVERITY_ORDER[args.fail_on]
+    catalog = _rule_index(stats["prefixes"])
+    worst = max((SEVERITY_ORDER[catalog[rule].severity] for items in results.values()
+                 for rule, _, _ in items), default=0)
+    return 1 if worst >= threshold else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+ESC Rules - Compiled ESC checks for AL files (shared by the hook daemon)
+
+Python port of the checks in after-file-edit.ps1. Every regex is compiled
+once at import time and every hit carries its line and column, so callers
+can re-check only the changed line ranges of a file.
+
+Checks (same order and messages as after-file-edit.ps1):
+    ESC001  Missing prefix in object name
+    ESC002  Dutch accented characters
+    ESC003  Dutch words in code
+    ESC004  Dutch variable names
+    ESC005  Nested if statements (use early exit)
+    ESC006  Direct Confirm() usage
+    ESC007  SetLoadFields before Modify/Insert/Delete
+    ESC008  Direct Error() without any [TryFunction] in the file
+    ESC009  Fields without any DataClassification in the file
+
+Like PowerShell's -match, patterns are case-insensitive.
+"""
+
+import re
+from collections import OrderedDict, namedtuple
+from pathlib import Path
+
+DEFAULT_PREFIX = "ABC"
+
+Violation = namedtuple("Violation", "rule line column")
+
+Rule = namedtuple("Rule", "id kind severity message pattern next_pattern gate")
+# kind:  "line" - pattern matched on one line
+#        "pair" - pattern on line N and next_pattern on line N+1 (hit reported on N + offset)
+# gate:  file-level pattern; hits are only reported when it is NOT found in the file
+
+_I = re.IGNORECASE
+
+OBJECT_TYPES = "table|page|codeunit|report|query|xmlport|enum|interface|controladdin|permissionset"
+DUTCH_WORDS = ("wordt", "deze", "voor", "naar", "van", "het", "een", "als", "bij", "ook", "maar",
+               "zijn", "met", "die", "dat", "de")
+
+
+def _prefix_pattern(prefix):
+    return re.compile(
+        r"\b(%s)(\s+extension)?\s+\d+\s+\"(?!%s\s)" % (OBJECT_TYPES, re.escape(prefix)), _I
+    )
+
+
+RULES = (
+    Rule("ESC001", "line", "error", "❌ Missing {prefix} prefix in object name",
+         None, None, None),  # pattern depends on the project prefix, see rules_for()
+    Rule("ESC002", "line", "error", "❌ Dutch accented characters detected - use English only",
+         re.compile(r"[àáâãäåæçèéêëìíîïðñòóôõöøùúûüýþÿ]", _I), None, None),
+    Rule("ESC003", "line", "error", "❌ Dutch words detected - use English only",
+         re.compile(r"\b(%s)\b" % "|".join(DUTCH_WORDS), _I), None, None),
+    Rule("ESC004", "line", "error", "❌ Dutch variable names detected",
+         re.compile(r"\b(gebruiker|klant|artikel|bedrijf|factuur|bestelling|levering)[A-Z]", _I),
+         None, None),
+    Rule("ESC005", "line", "warning", "⚠️ Nested if statements - use early exit pattern",
+         re.compile(r"\bif\s+.*\s+then\s+if\b", _I), None, None),
+    # after-file-edit.ps1 matches across lines (\s+ spans the newline), so
+    # "if A then" followed by "if B then" on the next line counts as well
+    Rule("ESC005", "pair", "warning", "⚠️ Nested if statements - use early exit pattern",
+         re.compile(r"\bif\s+.*\s+then\s*$", _I), re.compile(r"^\s*if\b", _I), None),
+    Rule("ESC006", "line", "error", "❌ Use ConfirmManagement.GetResponse() instead of Confirm()",
+         re.compile(r"\bConfirm\s*\(", _I), None, None),
+    Rule("ESC007", "pair", "error", "❌ CRITICAL: SetLoadFields before Modify/Insert/Delete",
+         re.compile(r"SetLoadFields", _I), re.compile(r"\.(Modify|Insert|Delete)\(", _I), None),
+    Rule("ESC008", "line", "warning", "⚠️ Direct Error() call - consider TryFunction pattern",
+         re.compile(r"\bError\s*\(", _I), None, re.compile(r"\[TryFunction\]", _I)),
+    Rule("ESC009", "line", "warning", "⚠️ Fields should have DataClassification property",
+         re.compile(r"field\s*\(\s*\d+", _I), None, re.compile(r"DataClassification", _I)),
+)
+
+# Pair rules look one line ahead; re-check this much context around edits
+CONTEXT_LINES = 1
+
+# Files whose scan state the daemon keeps (least recently checked are dropped)
+MAX_CACHED_FILES = 256
+
+_rules_cache = {}
+
+
+def rules_for(prefix=DEFAULT_PREFIX):
+    """Return the rule set with the prefix check compiled for `prefix` (cached)."""
+    rules = _rules_cache.get(prefix)
+    if rules is None:
+        first = RULES[0]._replace(pattern=_prefix_pattern(prefix),
+                                  message=RULES[0].message.format(prefix=prefix))
+        rules = _rules_cache[prefix] = (first,) + RULES[1:]
+    return rules
+
+
+_PREFIX_RE = re.compile(r"\*\*Prefix:\*\*\s*([A-Z]{3})\b")
+
+
+def detect_prefix(workspace_folder):
+    """Read the project prefix from .cursor/rules/000-project-overview.mdc.
+
+    The installer replaces ABC there with the customer prefix, so this keeps
+    ESC001 in sync with the project. Falls back to ABC.
+    """
+    if workspace_folder:
+        overview = Path(workspace_folder) / ".cursor" / "rules" / "000-project-overview.mdc"
+        try:
+            match = _PREFIX_RE.search(overview.read_text(encoding="utf-8"))
+            if match:
+                return match.group(1)
+        except OSError:
+            pass
+    return DEFAULT_PREFIX
+
+
+# ============================================================================
+# SCANNING
+# ============================================================================
+
+def scan_line(rules, lines, index):
+    """All ungated hits anchored at line `index` (0-based) as (rule, line, column)."""
+    hits = []
+    line = lines[index]
+    for rule in rules:
+        match = rule.pattern.search(line)
+        if not match:
+            continue
+        if rule.kind == "pair":
+            if index + 1 >= len(lines) or not rule.next_pattern.search(lines[index + 1]):
+                continue
+            if rule.id == "ESC007":
+                # Report the Modify/Insert/Delete line, like the PowerShell hook
+                follow = rule.next_pattern.search(lines[index + 1])
+                hits.append(Violation(rule.id, index + 2, follow.start() + 1))
+                continue
+        hits.append(Violation(rule.id, index + 1, match.start() + 1))
+    return hits
+
+
+def gates_open(rules, text):
+    """Rule ids whose file-level gate pattern is missing (so their hits count)."""
+    return {rule.id for rule in rules if rule.gate is not None and not rule.gate.search(text)}
+
+
+def apply_gates(rules, hits, text):
+    gated = {rule.id for rule in rules if rule.gate is not None}
+    open_ids = gates_open(rules, text)
+    return [hit for hit in hits if hit.rule not in gated or hit.rule in open_ids]
+
+
+def check_text(text, prefix=DEFAULT_PREFIX):
+    """Full scan of one AL source text. Returns violations sorted by line."""
+    rules = rules_for(prefix)
+    lines = text.split("\n")
+    hits = []
+    for index in range(len(lines)):
+        hits.extend(scan_line(rules, lines, index))
+    return sorted(set(apply_gates(rules, hits, text)))
+
+
+class IncrementalChecker:
+    """Keeps the last scanned lines and per-line hits for each file.
+
+    On re-check, the unchanged prefix and suffix of the file are detected in
+    O(n) and only the changed middle (plus CONTEXT_LINES around it) is
+    re-scanned; hits in the unchanged suffix are shifted by the line delta.
+    At most `max_files` files are kept (LRU), so a long-running daemon does
+    not grow with every file it has ever seen.
+    """
+
+    def __init__(self, max_files=MAX_CACHED_FILES):
+        self._files = OrderedDict()  # path -> (prefix, lines, per-line hits)
+        self.max_files = max_files
+
+    def check(self, path, text, prefix=DEFAULT_PREFIX):
+        rules = rules_for(prefix)
+        new_lines = text.split("\n")
+        cached = self._files.pop(path, None)
+        if cached is None or cached[0] != prefix:
+            per_line = [scan_line(rules, new_lines, i) for i in range(len(new_lines))]
+            rescanned = len(new_lines)
+        else:
+            per_line, rescanned = self._update(rules, cached[1], cached[2], new_lines)
+        self._files[path] = (prefix, new_lines, per_line)
+        while len(self._files) > self.max_files:
+            self._files.popitem(last=False)
+        hits = [hit for line_hits in per_line for hit in line_hits]
+        return sorted(set(apply_gates(rules, hits, text))), rescanned
+
+    def forget(self, path):
+        self._files.pop(path, None)
+
+    def __len__(self):
+        return len(self._files)
+
+    @staticmethod
+    def _update(rules, old_lines, old_hits, new_lines):
+        old_n, new_n = len(old_lines), len(new_lines)
+        top = 0
+        limit = min(old_n, new_n)
+        while top < limit and old_lines[top] == new_lines[top]:
+            top += 1
+        bottom = 0
+        while (bottom < limit - top
+               and old_lines[old_n - 1 - bottom] == new_lines[new_n - 1 - bottom]):
+            bottom += 1
+        if top == old_n == new_n:
+            return old_hits, 0
+
+        start = max(top - CONTEXT_LINES, 0)
+        old_end = min(old_n - bottom + CONTEXT_LINES, old_n)
+        new_end = min(new_n - bottom + CONTEXT_LINES, new_n)
+        delta = new_n - old_n
+
+        middle = [scan_line(rules, new_lines, i) for i in range(start, new_end)]
+        tail = [
+            [hit._replace(line=hit.line + delta) for hit in line_hits]
+            for line_hits in old_hits[old_end:]
+        ]
+        return old_hits[:start] + middle + tail, new_end - start
+
+
+# ============================================================================
+# REPORTING
+# ============================================================================
+
+def _line_list(lines, limit=10):
+    shown = ", ".join(str(n) for n in lines[:limit])
+    more = " +%d more" % (len(lines) - limit) if len(lines) > limit else ""
+    label = "line" if len(lines) == 1 else "lines"
+    return "%s %s%s" % (label, shown, more)
+
+
+def summarize(violations, prefix=DEFAULT_PREFIX):
+    """One message per rule in rule order, with the offending line numbers."""
+    rules = rules_for(prefix)
+    by_rule = {}
+    for hit in violations:
+        by_rule.setdefault(hit.rule, []).append(hit.line)
+    messages, seen = [], set()
+    for rule in rules:
+        if rule.id in by_rule and rule.id not in seen:
+            seen.add(rule.id)
+            lines = sorted(set(by_rule[rule.id]))
+            messages.append("%s (%s)" % (rule.message, _line_list(lines)))
+    return messages
+
+
+def build_response(file_path, violations, prefix=DEFAULT_PREFIX):
+    """Hook response with the same allow/userMessage/agentMessage contract as the .ps1."""
+    response = {"allow": True, "userMessage": "", "agentMessage": ""}
+    messages = summarize(violations, prefix)
+    if messages:
+        response["userMessage"] = "⚠️ ESC Standard Violations Detected:\n" + "\n".join(messages)
+        response["agentMessage"] = (
+            "ESC compliance issues found in %s:\n\n%s\n\n"
+            "Please review and fix these violations according to ESC standards.\n"
+            "Reference: .cursor/rules/002-development-patterns.mdc" % (file_path, "\n".join(messages))
+        )
+    else:
+        response["agentMessage"] = "✅ File passed basic ESC validation"
+    return response
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Hook Client - Tiny shim between Cursor and the hook daemon
+
+Configured as the hook command in hooks.json:
+    ["python", "${workspaceFolder}/.cursor/hooks/hook_client.py", "afterFileEdit"]
+
+Forwards Cursor's stdin JSON to hook_daemon.py and prints the daemon's
+allow/userMessage/agentMessage JSON. Only json/os/socket/zlib are imported
+on the fast path. If the daemon is not running, the client starts it in the
+background and answers this one request in-process, so a hook never fails
+because the daemon is down.
+
+Each hooks folder gets its own daemon (socket and state file are keyed by a
+hash of this folder), so projects with different hook versions never run
+each other's handlers. The client forwards its working directory; handlers
+resolve relative paths against it, not against the daemon's cwd.
+
+Usage:
+    echo '{"file_path":"test.al"}' | python hook_client.py afterFileEdit
+"""
+
+import json
+import os
+import socket
+import sys
+import zlib
+from pathlib import Path
+
+CONNECT_TIMEOUT = 2.0
+HOOKS_DIR = Path(__file__).resolve().parent
+
+# One daemon per hooks folder: a checkout only ever talks to its own handlers
+INSTANCE_ID = "%08x" % zlib.crc32(os.path.normcase(str(HOOKS_DIR)).encode("utf-8"))
+STATE_DIR = Path.home() / ".cursor"
+STATE_FILE = STATE_DIR / ("hooks-daemon-%s.json" % INSTANCE_ID)
+SOCKET_PATH = STATE_DIR / ("hooks-daemon-%s.sock" % INSTANCE_ID)
+LOCK_FILE = STATE_DIR / ("hooks-daemon-%s.lock" % INSTANCE_ID)
+
+
+def read_state():
+    try:
+        return json.loads(STATE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def connect(state, timeout=CONNECT_TIMEOUT):
+    if state["transport"] == "unix":
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        address = state["address"]
+    else:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        address = tuple(state["address"])
+    sock.settimeout(timeout)
+    try:
+        sock.connect(address)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def request(state, hook, raw_input="", timeout=CONNECT_TIMEOUT, cwd=None):
+    """Send one request to a running daemon and return the decoded response."""
+    message = json.dumps({"token": state["token"], "hook": hook, "input": raw_input, "cwd": cwd})
+    with connect(state, timeout) as sock:
+        sock.sendall(message.encode("utf-8") + b"\n")
+        sock.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    if not chunks:
+        raise ValueError("empty response from hook daemon")
+    return json.loads(b"".join(chunks).decode("utf-8"))
+
+
+def spawn_detached():
+    """Start the daemon in the background (first use or after idle exit)."""
+    import subprocess
+
+    command = [sys.executable, str(HOOKS_DIR / "hook_daemon.py"), "start", "--foreground"]
+    kwargs = {"stdin": subprocess.DEVNULL, "stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+    if os.name == "nt":
+        kwargs["creationflags"] = 0x00000008 | 0x00000200  # DETACHED_PROCESS | CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs["start_new_session"] = True
+    subprocess.Popen(command, close_fds=True, **kwargs)
+
+
+def _in_process(hook, raw_input, cwd):
+    sys.path.insert(0, str(HOOKS_DIR))
+    import hook_handlers
+
+    try:
+        payload = json.loads(raw_input or "{}")
+    except ValueError as exc:
+        return {"allow": True, "userMessage": "", "agentMessage": "⚠️ Hook error: %s" % exc}
+    return hook_handlers.handle(hook_handlers.create_handlers(), hook, payload, cwd=cwd)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Usage: hook_client.py <afterFileEdit|beforeReadFile|beforeShellExecution|...>", file=sys.stderr)
+        return 2
+    hook = argv[0]
+    raw_input = sys.stdin.buffer.read().decode("utf-8-sig", errors="replace")
+    cwd = os.getcwd()
+
+    response = None
+    state = read_state()
+    if state:
+        try:
+            response = request(state, hook, raw_input, cwd=cwd)
+        except (OSError, ValueError):
+            response = None
+    if response is None:
+        if os.environ.get("BC27_HOOKS_NO_DAEMON") != "1":
+            try:
+                spawn_detached()
+            except OSError:
+                pass
+        response = _in_process(hook, raw_input, cwd)
+
+    sys.stdout.buffer.write(json.dumps(response, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    sys.stdout.buffer.write(b"\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
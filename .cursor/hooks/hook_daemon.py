@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Hook Daemon - Persistent local server for the Cursor hooks
+
+Every Cursor hook in hooks.example.json used to spawn a fresh `pwsh -File`
+process, paying interpreter startup on every agent edit. This daemon stays
+running, keeps the compiled ESC regexes and per-file scan state warm, and
+re-checks only the changed line ranges of an edited .al file.
+
+Clients (hook_client.py) connect over a Unix socket (Linux/macOS) or a
+loopback TCP port guarded by a random token (Windows, where Python has no
+stdlib named-pipe server without multiprocessing overhead in the client).
+
+Usage:
+    python hook_daemon.py start [--foreground] [--idle-timeout 3600]
+    python hook_daemon.py status       # p50/p99 latency per hook type
+    python hook_daemon.py stop
+
+Wire protocol: one JSON line per connection.
+    -> {"token": "...", "hook": "afterFileEdit", "input": "<Cursor stdin JSON>", "cwd": "<client cwd>"}
+    <- {"allow": true, "userMessage": "", "agentMessage": "..."}
+Special hooks: "__ping__", "__stats__", "__shutdown__".
+
+One daemon per hooks folder: it only serves clients from the same folder, so
+it never runs another checkout's handlers. Relative paths in hook payloads
+are resolved against the client's forwarded cwd.
+
+State file: ~/.cursor/hooks-daemon-<hash of hooks folder>.json (address + token,
+user-only permissions)
+
+Only one daemon per hooks folder binds the socket: it holds an exclusive
+OS lock on ~/.cursor/hooks-daemon-<hash>.lock for its lifetime (released by
+the OS even if it is killed). Concurrent hook calls that all found the
+daemon down each spawn one; all but the lock holder exit immediately.
+"""
+
+import argparse
+import json
+import os
+import secrets
+import socket
+import socketserver
+import sys
+import threading
+import time
+from collections import deque
+
+import hook_handlers
+from hook_client import LOCK_FILE, SOCKET_PATH, STATE_DIR, STATE_FILE, read_state, request, spawn_detached
+
+DEFAULT_IDLE_TIMEOUT = 3600  # seconds without requests before the daemon exits
+LATENCY_WINDOW = 2000        # samples kept per hook type
+
+USE_UNIX_SOCKET = hasattr(socket, "AF_UNIX") and os.name != "nt"
+
+
+def _lock_instance():
+    """Exclusive, non-blocking lock for this hooks folder; fd or None if held elsewhere."""
+    STATE_DIR.mkdir(parents=True, exist_ok=True)
+    fd = os.open(str(LOCK_FILE), os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        if os.name == "nt":
+            import msvcrt
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _write_state(state):
+    STATE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = STATE_FILE.with_suffix(".tmp")
+    fd = os.open(str(tmp), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        json.dump(state, handle)
+    os.replace(str(tmp), str(STATE_FILE))
+
+
+# ============================================================================
+# LATENCY STATS
+# ============================================================================
+
+class LatencyStats:
+    def __init__(self, window=LATENCY_WINDOW):
+        self._samples = {}
+        self._counts = {}
+        self._window = window
+        self._lock = threading.Lock()
+
+    def record(self, hook, millis):
+        with self._lock:
+            self._samples.setdefault(hook, deque(maxlen=self._window)).append(millis)
+            self._counts[hook] = self._counts.get(hook, 0) + 1
+
+    @staticmethod
+    def _percentile(ordered, pct):
+        if not ordered:
+            return 0.0
+        index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+        return ordered[index]
+
+    def snapshot(self):
+        with self._lock:
+            result = {}
+            for hook, samples in self._samples.items():
+                ordered = sorted(samples)
+                result[hook] = {
+                    "count": self._counts[hook],
+                    "p50_ms": round(self._percentile(ordered, 50), 3),
+                    "p99_ms": round(self._percentile(ordered, 99), 3),
+                    "max_ms": round(ordered[-1], 3),
+                }
+            return result
+
+
+# ============================================================================
+# SERVER
+# ============================================================================
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        server = self.server
+        line = self.rfile.readline()
+        start = time.perf_counter()
+        try:
+            message = json.loads(line.decode("utf-8"))
+        except ValueError:
+            return
+        if not secrets.compare_digest(str(message.get("token", "")), server.token):
+            return
+
+        server.last_activity = time.monotonic()
+        hook = message.get("hook", "")
+        if hook == "__ping__":
+            response = {"ok": True, "pid": os.getpid()}
+        elif hook == "__stats__":
+            response = {"pid": os.getpid(), "uptime_s": round(time.time() - server.started, 1),
+                        "hooks": server.stats.snapshot()}
+        elif hook == "__shutdown__":
+            response = {"ok": True}
+            threading.Thread(target=server.shutdown, daemon=True).start()
+        else:
+            try:
+                payload = json.loads(message.get("input") or "{}")
+            except ValueError as exc:
+                payload = None
+                response = {"allow": True, "userMessage": "", "agentMessage": "⚠️ Hook error: %s" % exc}
+            if payload is not None:
+                with server.lock:
+                    response = hook_handlers.handle(server.handlers, hook, payload, cwd=message.get("cwd"))
+            server.stats.record(hook, (time.perf_counter() - start) * 1000)
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8"))
+
+
+def _make_server():
+    if USE_UNIX_SOCKET:
+        if SOCKET_PATH.exists():
+            SOCKET_PATH.unlink()
+        server = socketserver.ThreadingUnixStreamServer(str(SOCKET_PATH), _RequestHandler)
+        os.chmod(str(SOCKET_PATH), 0o600)
+        return server, "unix", str(SOCKET_PATH)
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _RequestHandler)
+    return server, "tcp", list(server.server_address)
+
+
+def _idle_watch(server, idle_timeout):
+    while True:
+        time.sleep(min(30, idle_timeout))
+        if time.monotonic() - server.last_activity > idle_timeout:
+            server.shutdown()
+            return
+
+
+def serve(idle_timeout=DEFAULT_IDLE_TIMEOUT):
+    lock = _lock_instance()
+    if lock is None:
+        return 0  # another daemon is serving (or starting) for this hooks folder
+    try:
+        return _serve_locked(idle_timeout)
+    finally:
+        os.close(lock)  # the lock file itself stays; unlinking it would race the next daemon
+
+
+def _serve_locked(idle_timeout):
+    state = read_state()
+    if state:
+        try:
+            request(state, "__ping__", timeout=0.5)
+            return 0  # a daemon from before the lock file existed is still serving
+        except (OSError, ValueError):
+            pass
+
+    server, transport, address = _make_server()
+    server.daemon_threads = True
+    server.token = secrets.token_hex(16)
+    server.handlers = hook_handlers.create_handlers()
+    server.lock = threading.Lock()
+    server.stats = LatencyStats()
+    server.started = time.time()
+    server.last_activity = time.monotonic()
+
+    _write_state({"pid": os.getpid(), "transport": transport, "address": address, "token": server.token})
+    if idle_timeout > 0:
+        threading.Thread(target=_idle_watch, args=(server, idle_timeout), daemon=True).start()
+    try:
+        server.serve_forever(poll_interval=0.5)
+    finally:
+        server.server_close()
+        current = read_state()
+        if current and current.get("pid") == os.getpid():
+            STATE_FILE.unlink()
+            if transport == "unix" and SOCKET_PATH.exists():
+                SOCKET_PATH.unlink()
+    return 0
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def cmd_start(args):
+    if args.foreground:
+        return serve(idle_timeout=args.idle_timeout)
+    spawn_detached()
+    for _ in range(50):
+        state = read_state()
+        if state:
+            try:
+                request(state, "__ping__", timeout=0.5)
+                print("[SUCCESS] Hook daemon running (pid %s, %s)" % (state["pid"], state["transport"]))
+                return 0
+            except (OSError, ValueError):
+                pass
+        time.sleep(0.1)
+    print("[ERROR] Hook daemon did not start", file=sys.stderr)
+    return 1
+
+
+def cmd_status(args):
+    state = read_state()
+    try:
+        stats = request(state, "__stats__") if state else None
+    except (OSError, ValueError):
+        stats = None
+    if not stats:
+        print("[INFO] Hook daemon is not running")
+        return 1
+    if args.json:
+        print(json.dumps(stats, indent=2))
+        return 0
+    print("Hook daemon pid %s, up %.0fs" % (stats["pid"], stats["uptime_s"]))
+    print("%-22s %8s %10s %10s %10s" % ("Hook", "Count", "p50 (ms)", "p99 (ms)", "max (ms)"))
+    for hook, row in sorted(stats["hooks"].items()):
+        print("%-22s %8d %10.2f %10.2f %10.2f" % (hook, row["count"], row["p50_ms"], row["p99_ms"], row["max_ms"]))
+    return 0
+
+
+def cmd_stop(args):
+    state = read_state()
+    try:
+        if state:
+            request(state, "__shutdown__")
+            print("[SUCCESS] Hook daemon stopped")
+            return 0
+    except (OSError, ValueError):
+        pass
+    print("[INFO] Hook daemon is not running")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Persistent Cursor hook daemon")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    start = sub.add_parser("start", help="Start the daemon (background unless --foreground)")
+    start.add_argument("--foreground", action="store_true")
+    start.add_argument("--idle-timeout", type=int, default=DEFAULT_IDLE_TIMEOUT,
+                       help="Exit after this many idle seconds (0 = never)")
+    start.set_defaults(func=cmd_start)
+
+    status = sub.add_parser("status", help="Show p50/p99 latency per hook type")
+    status.add_argument("--json", action="store_true")
+    status.set_defaults(func=cmd_status)
+
+    stop = sub.add_parser("stop", help="Stop the running daemon")
+    stop.set_defaults(func=cmd_stop)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
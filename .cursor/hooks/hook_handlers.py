@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Hook Handlers - In-process implementations of the Cursor hooks
+
+Python ports of after-file-edit.ps1, before-read-file.ps1,
+before-shell-execution.ps1, before-commit.ps1 and after-agent-response.ps1
+with the same JSON contract:
+
+    Input:  hook payload (dict parsed from Cursor's stdin JSON) and the
+            working directory of the hook client
+    Output: {"allow": bool, "userMessage": str, "agentMessage": str}
+
+Relative paths in payloads are resolved against the client's cwd, never the
+daemon's: one daemon outlives the shell that started it.
+
+Used by hook_daemon.py (warm, long-running) and by hook_client.py as an
+in-process fallback when the daemon is not reachable.
+"""
+
+import os
+import re
+from pathlib import Path
+
+import esc_rules
+import secret_scan
+import usage_analytics
+
+_I = re.IGNORECASE
+
+
+def _response(allow=True, user="", agent=""):
+    return {"allow": allow, "userMessage": user, "agentMessage": agent}
+
+
+def _resolve(path, cwd):
+    path = Path(path)
+    return path if path.is_absolute() else Path(cwd) / path
+
+
+# ============================================================================
+# afterFileEdit - ESC validation (after-file-edit.ps1)
+# ============================================================================
+
+class AfterFileEdit:
+    """Keeps an IncrementalChecker so repeated edits re-scan only changed lines."""
+
+    def __init__(self):
+        self.checker = esc_rules.IncrementalChecker()
+        self._prefixes = {}
+
+    def _prefix(self, workspace_folder):
+        key = workspace_folder or ""
+        if key not in self._prefixes:
+            self._prefixes[key] = esc_rules.detect_prefix(workspace_folder)
+        return self._prefixes[key]
+
+    def __call__(self, payload, cwd):
+        file_path = payload.get("file_path") or ""
+        if not re.search(r"\.al$", file_path, _I):
+            return _response()
+        path = _resolve(file_path, cwd)
+        key = str(path)
+        if not path.is_file():
+            self.checker.forget(key)
+            return _response(agent="⚠️ File does not exist: %s" % file_path)
+
+        prefix = self._prefix(payload.get("workspace_folder") or cwd)
+        text = path.read_text(encoding="utf-8-sig", errors="replace")
+        violations, _ = self.checker.check(key, text, prefix)
+        return esc_rules.build_response(file_path, violations, prefix)
+
+
+# ============================================================================
+# beforeReadFile - block sensitive files (before-read-file.ps1)
+# ============================================================================
+
+BLOCKED_READ_PATTERNS = tuple(
+    (pattern, re.compile(pattern, _I)) for pattern in (
+        r"\.env$", r"\.env\.local$", r"credentials\.json$", r"secrets\.json$",
+        r"\.key$", r"\.pem$", r"\.pfx$", r"launch\.json$",
+        r"\.app$", r"\.dll$", r"\.exe$",
+        r"\.csv$", r"\.xlsx$", r"\.xls$", r"\.db$",
+        r"\.bak$", r"\.backup$",
+    )
+)
+
+
+def before_read_file(payload, cwd):
+    file_path = payload.get("file_path") or ""
+    file_name = re.split(r"[\\/]", file_path)[-1]
+    for pattern, compiled in BLOCKED_READ_PATTERNS:
+        if compiled.search(file_name) or compiled.search(file_path):
+            return _response(
+                allow=False,
+                user="🛑 Blocked: Cannot read sensitive file '%s'" % file_name,
+                agent="Access to sensitive file blocked. Pattern: %s" % pattern,
+            )
+    return _response(agent="✅ File read allowed")
+
+
+# ============================================================================
+# beforeShellExecution - dangerous commands (before-shell-execution.ps1)
+# ============================================================================
+
+DANGEROUS_COMMANDS = (
+    (re.compile(r"git\s+push\s+.*--force", _I), "🚫 Blocked: git push --force",
+     "Force push can overwrite remote history and cause data loss.", False),
+    (re.compile(r"git\s+reset\s+--hard", _I), "🚫 Blocked: git reset --hard",
+     "Hard reset permanently deletes uncommitted changes.", False),
+    (re.compile(r"git\s+clean\s+-[dfx]", _I), "⚠️ Warning: git clean",
+     "This will delete untracked files permanently.", True),
+    (re.compile(r"rm\s+-rf\s+/", _I), "🚫 Blocked: rm -rf /",
+     "This would delete the entire filesystem.", False),
+    (re.compile(r"git\s+push\s+.*main|master", _I), "⚠️ Warning: Pushing to main/master",
+     "Direct push to main branch. Consider using pull request.", True),
+)
+_GIT_PUSH = re.compile(r"git\s+push", _I)
+_CLAUDE_BRANCH = re.compile(r"claude/", _I)
+
+
+def before_shell_execution(payload, cwd):
+    command = payload.get("command") or ""
+    for pattern, message, reason, allow_with_warning in DANGEROUS_COMMANDS:
+        if not pattern.search(command):
+            continue
+        footer = ("This operation is allowed but requires caution." if allow_with_warning
+                  else "If you really need to run this command, execute it manually.")
+        return _response(
+            allow=allow_with_warning,
+            user=message,
+            agent="%s\n\nCommand: %s\nReason: %s\n\n%s" % (message, command, reason, footer),
+        )
+
+    if _GIT_PUSH.search(command) and not _CLAUDE_BRANCH.search(command):
+        return _response(
+            user="⚠️ Pushing to non-claude branch",
+            agent=(
+                "Warning: Git push detected\n\nCommand: %s\n\n"
+                "ESC standard: Feature branches should start with 'claude/'\n"
+                "Current command doesn't match this pattern." % command
+            ),
+        )
+    return _response()
+
+
+# ============================================================================
+# beforeCommit - secret scanning (before-commit.ps1)
+# ============================================================================
+
+def before_commit(payload, cwd):
+    repo_root = payload.get("workspace_folder") or secret_scan.repo_root_of(cwd)
+    findings, stats = secret_scan.scan_files(payload.get("files") or [], repo_root, cwd=cwd)
+    return secret_scan.hook_response(findings, stats)
+
+
+# ============================================================================
+# DISPATCH
+# ============================================================================
+
+def create_handlers():
+    """Map Cursor hook names to handler callables (one instance per process)."""
+    return {
+        "afterFileEdit": AfterFileEdit(),
+        "beforeReadFile": before_read_file,
+        "beforeShellExecution": before_shell_execution,
+        "beforeCommit": before_commit,
+        "afterAgentResponse": usage_analytics.AfterAgentResponse(),
+    }
+
+
+def handle(handlers, hook, payload, cwd=None):
+    """Run one hook; like the .ps1 hooks, errors never block the workflow.
+
+    `cwd` is the hook client's working directory (forwarded by
+    hook_client.py); without it, the workspace folder stands in.
+    """
+    handler = handlers.get(hook)
+    if handler is None:
+        return _response(agent="⚠️ Hook error: unknown hook type '%s'" % hook)
+    cwd = cwd or payload.get("workspace_folder") or os.getcwd()
+    try:
+        return handler(payload, cwd)
+    except Exception as exc:
+        return _response(agent="⚠️ Hook error: %s" % exc)
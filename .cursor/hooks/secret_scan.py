@@ -0,0 +1,542 @@
+#!/usr/bin/env python3
+"""
+Secret Scan - Streaming multi-pattern secret scanner for commits
+
+Replacement for the scanning loop in before-commit.ps1, which reads every
+staged file whole (Get-Content -Raw) and runs five regexes over it. This
+scanner:
+    - reads files in fixed-size chunks (memory stays flat on huge XLF files)
+    - runs ONE combined regex per chunk instead of five passes per file
+    - carries partial lines across chunk boundaries so no hit is split or lost
+    - scans files in parallel on a process pool
+    - reports exact file:line:column for every hit (secret text redacted)
+    - honours a per-repo allowlist and baseline for known false positives
+
+Usage:
+    python .cursor/hooks/secret_scan.py --staged
+    python .cursor/hooks/secret_scan.py src/ Translations/ --format json
+    python .cursor/hooks/secret_scan.py --staged --update-baseline
+    python .cursor/hooks/secret_scan.py --bench 300
+    echo '{"files":["a.al"]}' | python .cursor/hooks/secret_scan.py --hook
+
+Allowlist (.secretscan-allowlist at the repo root, one entry per line):
+    path:<glob>           skip matching files           path:Translations/*.xlf
+    match:<regex>         drop hits whose text matches  match:^[0-9a-fA-F]{32}$
+    rule:<id> <regex>     same, for one rule only       rule:SEC001 ^[0-9A-F]{32}$
+Baseline (.secretscan-baseline.json): fingerprints of accepted hits, written
+by --update-baseline; fingerprints ignore line numbers so edits elsewhere in
+a file do not resurrect them.
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+CHUNK_SIZE = 1 << 20       # bytes read per chunk
+OVERLAP = 4096             # look-behind kept when a single line exceeds a chunk
+BINARY_SNIFF = 8192        # NUL byte in the first block => binary, skipped
+POOL_THRESHOLD = 8         # files (or MB) below which a pool is not worth it
+
+ALLOWLIST_NAME = ".secretscan-allowlist"
+BASELINE_NAME = ".secretscan-baseline.json"
+
+# id, group, icon, label - same checks and severities as before-commit.ps1
+RULES = (
+    ("SEC004", "private_key", "❌", "Private key"),
+    ("SEC003", "connection_string", "⚠️", "Connection string"),
+    ("SEC002", "password", "⚠️", "Password literal"),
+    ("SEC005", "bearer", "⚠️", "Bearer token"),
+    ("SEC001", "api_key", "⚠️", "Possible API key"),
+)
+RULE_BY_GROUP = {group: (rule_id, icon, label) for rule_id, group, icon, label in RULES}
+
+# One alternation = one pass; specific patterns first so they win at the same offset
+COMBINED = re.compile(
+    rb"(?P<private_key>BEGIN (?:RSA )?PRIVATE KEY)"
+    rb"|(?P<connection_string>Server=|Data Source=|Initial Catalog=)"
+    rb"|(?P<password>(?:password|pwd|passwd)[ \t]*[:=][ \t]*['\"][^'\"\r\n]+['\"])"
+    rb"|(?P<bearer>Bearer [A-Za-z0-9\-._~+/]+=*)"
+    rb"|(?P<api_key>[A-Za-z0-9]{32,})",
+    re.IGNORECASE,
+)
+
+# Prefilter: every match contains one of these needles, found with C-speed
+# bytes.find on a lower-cased view (literals) or an alnum->"a" view (api_key).
+# COMBINED then runs only on the lines that contain a needle; every pattern
+# is confined to one line, so the result equals a full finditer pass.
+LITERAL_NEEDLES = (b"private key", b"server=", b"data source=", b"initial catalog=",
+                   b"passw", b"pwd", b"bearer ")
+ALNUM_RUN = b"a" * 32
+ALNUM_TABLE = bytes(ord("a") if chr(i).isalnum() and i < 128 else ord(" ") for i in range(256))
+
+
+# ============================================================================
+# STREAMING SCAN
+# ============================================================================
+
+def scan_stream(handle, chunk_size=CHUNK_SIZE):
+    """Yield (group, line, column, matched_bytes) for one binary stream.
+
+    Each chunk is scanned up to its last newline; the partial line is carried
+    into the next chunk, so matches never straddle a boundary. A line longer
+    than a chunk is scanned up to OVERLAP bytes before its end; a match that
+    reaches the buffer end is deferred to the next chunk, and scanning always
+    resumes at the end of the last reported match.
+    """
+    carry = b""
+    base = 0            # absolute offset of carry[0]
+    line_no = 1         # line number at `base`
+    line_start = 0      # absolute offset where line `line_no` starts
+    reported_end = 0    # absolute end of the last reported match
+    eof = False
+
+    while not eof:
+        chunk = handle.read(chunk_size)
+        eof = not chunk
+        buf = carry + chunk
+        if not buf:
+            break
+
+        if eof:
+            cut, forced = len(buf), False
+        else:
+            newline = buf.rfind(b"\n")
+            if newline >= 0:
+                cut, forced = newline + 1, False
+            else:
+                cut, forced = max(0, len(buf) - OVERLAP), True
+
+        scan_end = len(buf) if forced else cut
+        defer_from = cut
+        pos, cur_line, cur_line_start = 0, line_no, line_start
+        # Resume where the last reported match ended, exactly like one finditer pass
+        resume = max(0, reported_end - base)
+        spans = [(resume, scan_end)] if forced else candidate_lines(buf, resume, scan_end)
+        for match in (m for lo, hi in spans for m in COMBINED.finditer(buf, lo, hi)):
+            start, end = match.span()
+            if forced and (start >= cut or end >= len(buf)):
+                if start < cut:
+                    defer_from = min(defer_from, start)
+                break
+            newlines = buf.count(b"\n", pos, start)
+            if newlines:
+                cur_line += newlines
+                cur_line_start = base + buf.rfind(b"\n", pos, start) + 1
+            pos = start
+            reported_end = base + end
+            yield match.lastgroup, cur_line, base + start - cur_line_start + 1, match.group()
+
+        # Advance line bookkeeping over the consumed region
+        consumed = defer_from
+        newlines = buf.count(b"\n", 0, consumed)
+        if newlines:
+            line_no += newlines
+            line_start = base + buf.rfind(b"\n", 0, consumed) + 1
+        carry = buf[consumed:]
+        base += consumed
+
+
+def candidate_lines(buf, lo, hi):
+    """Sorted, merged (start, end) line spans in buf[lo:hi] that contain a needle."""
+    spans = []
+    for view, needles in ((buf.lower(), LITERAL_NEEDLES), (buf.translate(ALNUM_TABLE), (ALNUM_RUN,))):
+        for needle in needles:
+            at = view.find(needle, lo, hi)
+            while at >= 0:
+                start = buf.rfind(b"\n", lo, at) + 1 or lo
+                end = buf.find(b"\n", at, hi)
+                end = hi if end < 0 else end + 1
+                spans.append((start, end))
+                at = view.find(needle, end, hi)
+    spans.sort()
+    merged = []
+    for start, end in spans:
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def redact(secret):
+    text = secret.decode("utf-8", "replace")
+    return text[:4] + "…" if len(text) > 4 else "…"
+
+
+def fingerprint(rule_id, path, secret):
+    digest = hashlib.sha256()
+    digest.update(("%s\0%s\0" % (rule_id, path)).encode("utf-8"))
+    digest.update(secret)
+    return digest.hexdigest()[:32]
+
+
+# ============================================================================
+# ALLOWLIST / BASELINE
+# ============================================================================
+
+class Allowlist:
+    def __init__(self, path_globs=(), match_patterns=(), rule_patterns=(), baseline=()):
+        self.path_globs = list(path_globs)
+        self.match_patterns = list(match_patterns)
+        self.rule_patterns = list(rule_patterns)
+        self.baseline = set(baseline)
+
+    @classmethod
+    def load(cls, repo_root):
+        allow = cls()
+        allow_file = Path(repo_root) / ALLOWLIST_NAME
+        if allow_file.is_file():
+            for raw in allow_file.read_text(encoding="utf-8").splitlines():
+                line = raw.strip()
+                if not line or line.startswith("#"):
+                    continue
+                kind, _, value = line.partition(":")
+                if kind == "path":
+                    allow.path_globs.append(value.strip())
+                elif kind == "match":
+                    allow.match_patterns.append(re.compile(value.strip().encode("utf-8")))
+                elif kind == "rule":
+                    rule_id, _, pattern = value.strip().partition(" ")
+                    allow.rule_patterns.append((rule_id, re.compile(pattern.strip().encode("utf-8"))))
+        baseline_file = Path(repo_root) / BASELINE_NAME
+        if baseline_file.is_file():
+            try:
+                data = json.loads(baseline_file.read_text(encoding="utf-8"))
+                allow.baseline.update(entry["fingerprint"] for entry in data.get("findings", []))
+            except (ValueError, KeyError, TypeError):
+                pass
+        return allow
+
+    def skips_path(self, rel_path):
+        return any(fnmatch.fnmatch(rel_path, glob) for glob in self.path_globs)
+
+    def suppresses(self, rule_id, secret, print_id):
+        if print_id in self.baseline:
+            return True
+        if any(p.search(secret) for p in self.match_patterns):
+            return True
+        return any(rule == rule_id and p.search(secret) for rule, p in self.rule_patterns)
+
+
+# ============================================================================
+# FILE / BATCH SCANNING
+# ============================================================================
+
+def scan_file(job):
+    """Worker: scan one file. Returns (rel_path, findings, bytes_scanned, skipped_reason)."""
+    full_path, rel_path, allow = job
+    findings = []
+    try:
+        size = os.path.getsize(full_path)
+        with open(full_path, "rb") as handle:
+            if b"\0" in handle.read(BINARY_SNIFF):
+                return rel_path, findings, 0, "binary"
+            handle.seek(0)
+            for group, line, column, secret in scan_stream(handle):
+                rule_id, icon, label = RULE_BY_GROUP[group]
+                print_id = fingerprint(rule_id, rel_path, secret)
+                if allow is not None and allow.suppresses(rule_id, secret, print_id):
+                    continue
+                findings.append({
+                    "file": rel_path, "line": line, "column": column, "rule": rule_id,
+                    "icon": icon, "label": label, "snippet": redact(secret), "fingerprint": print_id,
+                })
+    except OSError as exc:
+        return rel_path, findings, 0, str(exc)
+    return rel_path, findings, size, None
+
+
+def _locate(path, bases):
+    """First existing file for `path`, relative paths tried against each base."""
+    path = Path(path)
+    candidates = [path] if path.is_absolute() else [Path(base) / path for base in bases]
+    return next((c for c in candidates if c.is_file()), None)
+
+
+def scan_files(paths, repo_root, jobs=None, allow=None, cwd=None):
+    """Scan files in parallel. Returns (findings, stats).
+
+    Relative paths are resolved against `cwd` first (when given), then the
+    repo root. Paths that cannot be found or read are listed in
+    stats["unreadable"] - never silently dropped.
+    """
+    start = time.perf_counter()
+    repo_root = Path(repo_root).resolve()
+    bases = [repo_root] if cwd is None else [Path(cwd), repo_root]
+    allow = Allowlist.load(repo_root) if allow is None else allow
+    work, skipped, unreadable = [], [], []
+    for path in paths:
+        full = _locate(path, bases)
+        if full is None:
+            unreadable.append("%s (not found)" % path)
+            continue
+        try:
+            rel = full.resolve().relative_to(repo_root).as_posix()
+        except ValueError:
+            rel = full.as_posix()
+        if allow.skips_path(rel):
+            skipped.append(rel)
+            continue
+        work.append((str(full), rel, allow))
+
+    total_mb = sum(os.path.getsize(w[0]) for w in work) / (1 << 20)
+    workers = jobs or os.cpu_count() or 1
+    if workers > 1 and (len(work) >= POOL_THRESHOLD or total_mb >= POOL_THRESHOLD):
+        # Largest files first so one huge file does not finish last on its own
+        work.sort(key=lambda w: -os.path.getsize(w[0]))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(scan_file, work))
+    else:
+        results = [scan_file(job) for job in work]
+
+    findings, scanned_bytes, read_files = [], 0, 0
+    for rel, file_findings, size, reason in results:
+        findings.extend(file_findings)
+        scanned_bytes += size
+        if reason == "binary":
+            skipped.append("%s (binary)" % rel)
+        elif reason:
+            unreadable.append("%s (%s)" % (rel, reason))
+        else:
+            read_files += 1
+    findings.sort(key=lambda f: (f["file"], f["line"], f["column"]))
+    elapsed = time.perf_counter() - start
+    stats = {
+        "files": read_files,
+        "skipped": skipped,
+        "unreadable": unreadable,
+        "bytes": scanned_bytes,
+        "elapsed_ms": round(elapsed * 1000, 1),
+        "mb_per_s": round(scanned_bytes / (1 << 20) / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+    return findings, stats
+
+
+def staged_files(repo_root):
+    output = subprocess.run(
+        ["git", "diff", "--cached", "--name-only", "--diff-filter=ACMR", "-z"],
+        cwd=str(repo_root), capture_output=True, check=True,
+    ).stdout
+    return [p for p in output.decode("utf-8").split("\0") if p]
+
+
+def expand_paths(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames[:] = [d for d in dirnames if d != ".git"]
+                files.extend(os.path.join(dirpath, name) for name in filenames)
+        else:
+            files.append(path)
+    return files
+
+
+def repo_root_of(start="."):
+    try:
+        output = subprocess.run(["git", "rev-parse", "--show-toplevel"], cwd=start,
+                                capture_output=True, check=True).stdout
+        return Path(output.decode("utf-8").strip())
+    except (OSError, subprocess.CalledProcessError):
+        return Path(start).resolve()
+
+
+# ============================================================================
+# OUTPUT
+# ============================================================================
+
+def format_finding(finding):
+    return "%s %s:%d:%d: %s %s (%s)" % (
+        finding["icon"], finding["file"], finding["line"], finding["column"],
+        finding["rule"], finding["label"], finding["snippet"],
+    )
+
+
+def _unread_note(stats):
+    unreadable = (stats or {}).get("unreadable") or []
+    if not unreadable:
+        return ""
+    return "\n\nNot scanned (could not be read):\n%s" % "\n".join("- " + p for p in unreadable)
+
+
+def hook_response(findings, stats=None):
+    """before-commit.ps1 contract: block the commit when anything is found.
+
+    With `stats` from scan_files, unread paths are listed, and a commit where
+    none of the given files could be read is reported as unscanned, not clean.
+    """
+    response = {"allow": True, "userMessage": "", "agentMessage": ""}
+    unread = _unread_note(stats)
+    if not findings:
+        if unread and not stats["files"]:
+            response["userMessage"] = "⚠️ Secret scan skipped: none of the files could be read"
+            response["agentMessage"] = "⚠️ No files were scanned for secrets." + unread
+        elif unread:
+            response["userMessage"] = "⚠️ Secret scan incomplete: %d file(s) not read" % len(stats["unreadable"])
+            response["agentMessage"] = "✅ No secrets detected in the files that were read." + unread
+        else:
+            response["agentMessage"] = "✅ No secrets detected"
+        return response
+    response["allow"] = False
+    response["userMessage"] = "🛑 Commit blocked: Possible secrets detected"
+    response["agentMessage"] = (
+        "Secret scanning detected possible sensitive data:\n\n%s\n\n"
+        "**Actions:**\n"
+        "1. Remove secrets from files\n"
+        "2. Use SecretText type for sensitive AL fields\n"
+        "3. Store secrets in Azure Key Vault\n"
+        "4. Add sensitive files to .gitignore\n\n"
+        "**If these are false positives:**\n"
+        "- Review each detection carefully\n"
+        "- Add a path:/match:/rule: entry to %s\n"
+        "- Or accept current hits: python .cursor/hooks/secret_scan.py --staged --update-baseline"
+        % ("\n".join(format_finding(f) for f in findings), ALLOWLIST_NAME)
+    ) + unread
+    return response
+
+
+def write_baseline(repo_root, findings):
+    path = Path(repo_root) / BASELINE_NAME
+    existing = []
+    if path.is_file():
+        try:
+            existing = json.loads(path.read_text(encoding="utf-8")).get("findings", [])
+        except ValueError:
+            existing = []
+    known = {entry["fingerprint"] for entry in existing}
+    for finding in findings:
+        if finding["fingerprint"] not in known:
+            existing.append({"fingerprint": finding["fingerprint"], "rule": finding["rule"],
+                             "file": finding["file"]})
+            known.add(finding["fingerprint"])
+    path.write_text(json.dumps({"version": 1, "findings": existing}, indent=2) + "\n", encoding="utf-8")
+    return path, len(existing)
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def _synthetic_file(path, size_bytes, seed):
+    """XLF-like text with a sprinkling of GUIDs and secrets, ~size_bytes long."""
+    unit = (
+        '    <trans-unit id="Table 2061421513 - Field 1296262074 - Property 2879900210" '
+        'size-unit="char" translate="yes" xml:space="preserve">\n'
+        '      <source>Customer Posting Group %d</source>\n'
+        '      <target>Klantboekingsgroep %d</target>\n'
+        '      <note from="Xliff Generator">Table Customer - Field Posting Group</note>\n'
+        '    </trans-unit>\n'
+    )
+    secret_every = 5000
+    written, n = 0, seed
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write('<?xml version="1.0" encoding="utf-8"?>\n<xliff version="1.2">\n')
+        while written < size_bytes:
+            block = unit % (n, n)
+            if n % secret_every == 0:
+                block += '      <!-- password = "Hunter2-%d" 0f8fad5bd9cb469fa16570867728950e -->\n' % n
+            handle.write(block)
+            written += len(block)
+            n += 1
+        handle.write("</xliff>\n")
+
+
+def run_bench(total_mb, files, jobs):
+    with tempfile.TemporaryDirectory(prefix="secretscan-bench-") as tmp:
+        per_file = int(total_mb * (1 << 20) / files)
+        paths = []
+        for index in range(files):
+            path = os.path.join(tmp, "Translations", "App.%02d.xlf" % index)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            _synthetic_file(path, per_file, index * 100000)
+            paths.append(path)
+
+        print("[INFO] Synthetic commit: %d files, %.0f MB total" % (files, total_mb))
+        empty = Allowlist()
+        findings, stats = scan_files(paths, tmp, jobs=1, allow=empty)
+        print("[INFO] Streaming, 1 process : %7.1f MB/s  (%d hits, %.0f ms)"
+              % (stats["mb_per_s"], len(findings), stats["elapsed_ms"]))
+        if (jobs or os.cpu_count() or 1) > 1:
+            findings, stats = scan_files(paths, tmp, jobs=jobs, allow=empty)
+            print("[INFO] Streaming, %d processes: %7.1f MB/s  (%d hits, %.0f ms)"
+                  % (jobs or os.cpu_count(), stats["mb_per_s"], len(findings), stats["elapsed_ms"]))
+
+        # Reference: the before-commit.ps1 approach (whole file + five passes)
+        legacy = [re.compile(p, re.IGNORECASE) for p in (
+            rb"[A-Za-z0-9]{32,}", rb"(password|pwd|passwd)\s*[:=]\s*['\"]([^'\"]+)['\"]",
+            rb"Server=|Data Source=|Initial Catalog=", rb"BEGIN (RSA )?PRIVATE KEY",
+            rb"Bearer [A-Za-z0-9\-._~+/]+=*")]
+        start = time.perf_counter()
+        total = 0
+        for path in paths:
+            with open(path, "rb") as handle:
+                data = handle.read()
+            total += len(data)
+            for pattern in legacy:
+                pattern.search(data)
+        elapsed = time.perf_counter() - start
+        print("[INFO] Legacy (read whole file, 5 passes, first hit only): %7.1f MB/s"
+              % (total / (1 << 20) / elapsed))
+    return 0
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Streaming multi-pattern secret scanner")
+    parser.add_argument("paths", nargs="*", help="Files or folders to scan")
+    parser.add_argument("--staged", action="store_true", help="Scan files staged in git")
+    parser.add_argument("--hook", action="store_true", help='Read {"files": [...]} from stdin, answer like before-commit.ps1')
+    parser.add_argument("--format", choices=("text", "json"), default="text")
+    parser.add_argument("--jobs", "-j", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--update-baseline", action="store_true", help="Accept current hits into %s" % BASELINE_NAME)
+    parser.add_argument("--bench", type=float, metavar="MB", help="Benchmark on a synthetic commit of MB megabytes")
+    parser.add_argument("--bench-files", type=int, default=16, help="Files in the synthetic commit (default: 16)")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        return run_bench(args.bench, args.bench_files, args.jobs)
+
+    repo_root = repo_root_of()
+    if args.hook:
+        payload = json.loads(sys.stdin.buffer.read().decode("utf-8-sig") or "{}")
+        findings, stats = scan_files(payload.get("files") or [], repo_root, jobs=args.jobs, cwd=os.getcwd())
+        sys.stdout.buffer.write(json.dumps(hook_response(findings, stats), ensure_ascii=False).encode("utf-8") + b"\n")
+        return 0
+
+    if args.staged:
+        findings, stats = scan_files(staged_files(repo_root), repo_root, jobs=args.jobs)
+    else:
+        paths = expand_paths(args.paths or ["."])
+        findings, stats = scan_files(paths, repo_root, jobs=args.jobs, cwd=os.getcwd())
+
+    if args.update_baseline:
+        path, count = write_baseline(repo_root, findings)
+        print("[SUCCESS] Baseline %s now holds %d finding(s)" % (path, count))
+        return 0
+
+    if args.format == "json":
+        print(json.dumps({"stats": stats, "findings": findings}, indent=2, ensure_ascii=False))
+    else:
+        for finding in findings:
+            sys.stdout.buffer.write((format_finding(finding) + "\n").encode("utf-8"))
+        for path in stats["unreadable"]:
+            print("[WARNING] Not scanned: %s" % path, file=sys.stderr)
+        print("%d finding(s) in %d file(s), %.1f MB at %.1f MB/s"
+              % (len(findings), stats["files"], stats["bytes"] / (1 << 20), stats["mb_per_s"]))
+    return 1 if findings else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+Usage Analytics - Incremental Cursor usage log, aggregates and reports
+
+Replacement for after-agent-response.ps1, which appended one JSONL line and
+then re-read and re-parsed the whole month's log on every agent response to
+rebuild the daily summary (slower with every response, all month long).
+
+Here the JSONL log stays the append-only source of truth, and a small SQLite
+database next to it holds rolling aggregates per day/user/model/workspace and
+per day/user/tool. Each log file is ingested from the byte offset where the
+previous ingest stopped, so a hook call costs the same on day 1 and day 31,
+and reports are plain GROUP BY queries over pre-aggregated rows.
+
+Usage:
+    python usage_analytics.py report                                  # this month, by day
+    python usage_analytics.py report --from 2026-10-01 --to 2026-10-31 --by user,model
+    python usage_analytics.py report --by workspace --model gpt-5 --json
+    python usage_analytics.py tools --from 2026-10-01
+    python usage_analytics.py summary [--day 2026-10-17]
+    python usage_analytics.py --db team.sqlite3 import team-logs/*.jsonl
+    python usage_analytics.py rebuild
+
+Files (in ~/.cursor/logs):
+    cursor-usage-YYYY-MM.jsonl       append-only log (same format as the .ps1 hook)
+    cursor-usage.sqlite3             aggregates + per-file ingest offsets
+    daily-summary-YYYY-MM-DD.txt     rewritten from aggregates after each response
+"""
+
+import argparse
+import datetime as dt
+import getpass
+import json
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+LOGS_DIR = Path.home() / ".cursor" / "logs"
+DB_NAME = "cursor-usage.sqlite3"
+LOG_PATTERN = "cursor-usage-*.jsonl"
+SCHEMA_VERSION = 1
+
+GROUP_COLUMNS = ("day", "user", "model", "workspace")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS usage_daily (
+    day TEXT NOT NULL,
+    user TEXT NOT NULL,
+    model TEXT NOT NULL,
+    workspace TEXT NOT NULL,
+    responses INTEGER NOT NULL,
+    prompt_tokens INTEGER NOT NULL,
+    completion_tokens INTEGER NOT NULL,
+    total_tokens INTEGER NOT NULL,
+    PRIMARY KEY (day, user, model, workspace)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS tool_daily (
+    day TEXT NOT NULL,
+    user TEXT NOT NULL,
+    tool TEXT NOT NULL,
+    uses INTEGER NOT NULL,
+    PRIMARY KEY (day, user, tool)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS conversations (
+    day TEXT NOT NULL,
+    user TEXT NOT NULL,
+    workspace TEXT NOT NULL,
+    conversation_id TEXT NOT NULL,
+    PRIMARY KEY (day, user, workspace, conversation_id)
+) WITHOUT ROWID;
+"""
+
+
+# ============================================================================
+# LOG ENTRIES
+# ============================================================================
+
+def _int(value):
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def build_entry(payload, now=None):
+    """Log entry in the after-agent-response.ps1 format from a hook payload."""
+    usage = payload.get("usage") or {}
+    return {
+        "timestamp": (now or dt.datetime.now()).strftime("%Y-%m-%dT%H:%M:%S"),
+        "user": os.environ.get("USERNAME") or os.environ.get("USER") or getpass.getuser(),
+        "conversationId": payload.get("conversation_id"),
+        "generationId": payload.get("generation_id"),
+        "model": payload.get("model"),
+        "workspaceFolder": payload.get("workspace_folder"),
+        "usage": {
+            "promptTokens": usage.get("prompt_tokens"),
+            "completionTokens": usage.get("completion_tokens"),
+            "totalTokens": usage.get("total_tokens"),
+        },
+        "tools": payload.get("tools_used"),
+    }
+
+
+def log_path(logs_dir, day):
+    return Path(logs_dir) / ("cursor-usage-%s.jsonl" % day[:7])
+
+
+def append_entry(logs_dir, entry):
+    path = log_path(logs_dir, entry["timestamp"][:10])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+    with open(path, "ab") as handle:
+        handle.write(line.encode("utf-8"))
+    return path
+
+
+def _tools(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        return [str(key) for key in value]
+    names = []
+    for tool in value:
+        if isinstance(tool, dict):
+            tool = tool.get("name") or tool.get("tool") or json.dumps(tool, sort_keys=True)
+        names.append(str(tool))
+    return names
+
+
+# ============================================================================
+# DATABASE
+# ============================================================================
+
+def connect(db_path, create=True):
+    """Open (and migrate) the aggregate database.
+
+    Only the write paths (hook, import, rebuild) create the logs folder; with
+    create=False a missing folder yields an empty in-memory database, so a
+    read-only report never leaves ~/.cursor/logs behind.
+    """
+    db_path = Path(db_path)
+    target = str(db_path)
+    if create:
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+    elif not db_path.parent.is_dir():
+        target = ":memory:"
+    # check_same_thread=False: the hook daemon calls handlers from worker
+    # threads, one at a time under its lock
+    conn = sqlite3.connect(target, timeout=10, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    version = None
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        version = int(row[0]) if row else None
+    except sqlite3.OperationalError:
+        pass
+    if version != SCHEMA_VERSION:
+        # Aggregates are derived from the JSONL logs; dropping them resets the
+        # ingest offsets so the next ingest_all() rebuilds everything.
+        conn.executescript(
+            "DROP TABLE IF EXISTS conversations; DROP TABLE IF EXISTS tool_daily;"
+            "DROP TABLE IF EXISTS usage_daily; DROP TABLE IF EXISTS sources;"
+            "DROP TABLE IF EXISTS meta;"
+        )
+        conn.executescript(SCHEMA)
+        conn.execute("INSERT INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+        conn.commit()
+    return conn
+
+
+def _apply(conn, entry):
+    day = str(entry.get("timestamp") or "")[:10]
+    if len(day) != 10:
+        return False
+    user = entry.get("user") or ""
+    model = entry.get("model") or ""
+    workspace = entry.get("workspaceFolder") or ""
+    usage = entry.get("usage") or {}
+    conn.execute(
+        "INSERT INTO usage_daily VALUES (?, ?, ?, ?, 1, ?, ?, ?)"
+        " ON CONFLICT (day, user, model, workspace) DO UPDATE SET"
+        " responses = responses + 1,"
+        " prompt_tokens = prompt_tokens + excluded.prompt_tokens,"
+        " completion_tokens = completion_tokens + excluded.completion_tokens,"
+        " total_tokens = total_tokens + excluded.total_tokens",
+        (day, user, model, workspace, _int(usage.get("promptTokens")),
+         _int(usage.get("completionTokens")), _int(usage.get("totalTokens"))),
+    )
+    for tool in _tools(entry.get("tools")):
+        conn.execute(
+            "INSERT INTO tool_daily VALUES (?, ?, ?, 1)"
+            " ON CONFLICT (day, user, tool) DO UPDATE SET uses = uses + 1",
+            (day, user, tool),
+        )
+    if entry.get("conversationId"):
+        conn.execute("INSERT OR IGNORE INTO conversations VALUES (?, ?, ?, ?)",
+                     (day, user, workspace, str(entry["conversationId"])))
+    return True
+
+
+def ingest(conn, path):
+    """Fold the lines appended to `path` since the last ingest into the aggregates.
+
+    Only complete lines are consumed; a line still being written is picked up
+    next time. Returns the number of entries applied.
+    """
+    path = Path(path)
+    key = str(path.resolve())
+    try:
+        size = path.stat().st_size
+    except OSError:
+        return 0
+    row = conn.execute("SELECT offset FROM sources WHERE path = ?", (key,)).fetchone()
+    if row and row[0] == size:
+        return 0  # fast path: nothing appended since the last ingest
+
+    applied = 0
+    with conn:
+        # Re-read the offset under a write lock so concurrent hook processes
+        # never fold the same lines twice
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute("SELECT offset FROM sources WHERE path = ?", (key,)).fetchone()
+        offset = row[0] if row else 0
+        if size < offset:
+            offset = 0  # file was replaced or truncated
+        with open(path, "rb") as handle:
+            handle.seek(offset)
+            data = handle.read(size - offset)
+        end = data.rfind(b"\n") + 1
+        for raw in data[:end].splitlines():
+            try:
+                entry = json.loads(raw.decode("utf-8-sig"))
+            except ValueError:
+                continue
+            if isinstance(entry, dict) and _apply(conn, entry):
+                applied += 1
+        conn.execute("INSERT OR REPLACE INTO sources VALUES (?, ?)", (key, offset + end))
+    return applied
+
+
+def ingest_all(conn, logs_dir):
+    return sum(ingest(conn, path) for path in sorted(Path(logs_dir).glob(LOG_PATTERN)))
+
+
+# ============================================================================
+# QUERIES
+# ============================================================================
+
+def _where(date_from=None, date_to=None, **filters):
+    clauses, params = [], []
+    if date_from:
+        clauses.append("day >= ?")
+        params.append(date_from)
+    if date_to:
+        clauses.append("day <= ?")
+        params.append(date_to)
+    for column, value in filters.items():
+        if value:
+            clauses.append("%s = ?" % column)
+            params.append(value)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def token_totals(conn, by=("day",), date_from=None, date_to=None, user=None, model=None, workspace=None):
+    """Token totals grouped by any of day/user/model/workspace."""
+    for column in by:
+        if column not in GROUP_COLUMNS:
+            raise ValueError("cannot group by %r (use %s)" % (column, ", ".join(GROUP_COLUMNS)))
+    where, params = _where(date_from, date_to, user=user, model=model, workspace=workspace)
+    keys = ", ".join(by)
+    select = (keys + ", ") if by else ""
+    sql = (
+        "SELECT %sSUM(responses) AS responses, SUM(prompt_tokens) AS prompt_tokens,"
+        " SUM(completion_tokens) AS completion_tokens, SUM(total_tokens) AS total_tokens"
+        " FROM usage_daily%s" % (select, where)
+    )
+    if by:
+        sql += " GROUP BY %s ORDER BY %s" % (keys, "day" if by == ("day",) else "total_tokens DESC")
+    return [dict(row) for row in conn.execute(sql, params) if row["responses"]]
+
+
+def tool_totals(conn, date_from=None, date_to=None, user=None, limit=20):
+    where, params = _where(date_from, date_to, user=user)
+    sql = ("SELECT tool, SUM(uses) AS uses FROM tool_daily%s GROUP BY tool"
+           " ORDER BY uses DESC, tool LIMIT ?" % where)
+    return [dict(row) for row in conn.execute(sql, params + [limit])]
+
+
+def conversation_count(conn, date_from=None, date_to=None, user=None, workspace=None):
+    where, params = _where(date_from, date_to, user=user, workspace=workspace)
+    sql = "SELECT COUNT(DISTINCT conversation_id) FROM conversations%s" % where
+    return conn.execute(sql, params).fetchone()[0]
+
+
+def daily_summary(conn, day, user):
+    """Same content as the daily-summary-*.txt written by after-agent-response.ps1."""
+    totals = token_totals(conn, by=(), date_from=day, date_to=day, user=user)
+    total_tokens = totals[0]["total_tokens"] if totals else 0
+    conversations = conversation_count(conn, day, day, user=user)
+    models = token_totals(conn, by=("model",), date_from=day, date_to=day, user=user)
+    models.sort(key=lambda row: -row["responses"])
+    tools = tool_totals(conn, day, day, user=user, limit=5)
+    average = round(total_tokens / conversations) if conversations else 0
+    lines = [
+        "Cursor Usage Summary - %s" % day,
+        "User: %s" % user,
+        "===========================================",
+        "Total Conversations: %d" % conversations,
+        "Total Tokens Used: %d" % total_tokens,
+        "Average Tokens/Conversation: %d" % average,
+        "",
+        "Top Models Used:",
+    ]
+    lines += ["  - %s: %d times" % (row["model"], row["responses"]) for row in models[:3]]
+    lines += ["", "Tools Used:"]
+    lines += ["  - %s: %d times" % (row["tool"], row["uses"]) for row in tools]
+    return "\n".join(lines) + "\n"
+
+
+# ============================================================================
+# HOOK
+# ============================================================================
+
+class AfterAgentResponse:
+    """afterAgentResponse handler; keeps the database open in the hook daemon."""
+
+    def __init__(self, logs_dir=LOGS_DIR):
+        self.logs_dir = Path(logs_dir)
+        self._conn = None
+
+    def __call__(self, payload, cwd=None):
+        response = {"allow": True, "userMessage": "", "agentMessage": ""}
+        try:
+            if self._conn is None:
+                self._conn = connect(self.logs_dir / DB_NAME)
+            entry = build_entry(payload)
+            path = append_entry(self.logs_dir, entry)
+            ingest(self._conn, path)
+            day = entry["timestamp"][:10]
+            summary = daily_summary(self._conn, day, entry["user"])
+            (self.logs_dir / ("daily-summary-%s.txt" % day)).write_text(summary, encoding="utf-8")
+        except (OSError, sqlite3.Error, ValueError):
+            # Silently fail - don't interrupt workflow (as the .ps1 hook did)
+            pass
+        return response
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def _month_start():
+    return dt.date.today().replace(day=1).isoformat()
+
+
+def _open(args):
+    """Database for the read-only commands (report, tools, summary)."""
+    if args.db:
+        return connect(args.db, create=False)
+    conn = connect(Path(args.logs_dir) / DB_NAME, create=False)
+    ingest_all(conn, args.logs_dir)
+    return conn
+
+
+def cmd_report(args):
+    conn = _open(args)
+    by = tuple(part.strip() for part in args.by.split(",") if part.strip())
+    rows = token_totals(conn, by=by, date_from=args.date_from, date_to=args.date_to,
+                        user=args.user, model=args.model, workspace=args.workspace)
+    if args.json:
+        print(json.dumps(rows, indent=2, ensure_ascii=False))
+        return 0
+    header = [column.capitalize() for column in by] + ["Responses", "Prompt", "Completion", "Total"]
+    table = [[str(row[column]) for column in by]
+             + ["%d" % row["responses"], "%d" % row["prompt_tokens"],
+                "%d" % row["completion_tokens"], "%d" % row["total_tokens"]] for row in rows]
+    widths = [max([len(h)] + [len(r[i]) for r in table]) for i, h in enumerate(header)]
+    print("  ".join(h.ljust(w) for h, w in zip(header, widths)))
+    for row in table:
+        print("  ".join(cell.ljust(w) if i < len(by) else cell.rjust(w)
+                        for i, (cell, w) in enumerate(zip(row, widths))))
+    grand = sum(row["total_tokens"] for row in rows)
+    print("Total tokens %s..%s: %d" % (args.date_from or "start", args.date_to or "today", grand))
+    return 0
+
+
+def cmd_tools(args):
+    conn = _open(args)
+    rows = tool_totals(conn, args.date_from, args.date_to, user=args.user, limit=args.limit)
+    if args.json:
+        print(json.dumps(rows, indent=2, ensure_ascii=False))
+        return 0
+    for row in rows:
+        print("%8d  %s" % (row["uses"], row["tool"]))
+    return 0
+
+
+def cmd_summary(args):
+    conn = _open(args)
+    user = args.user or os.environ.get("USERNAME") or os.environ.get("USER") or getpass.getuser()
+    sys.stdout.write(daily_summary(conn, args.day or dt.date.today().isoformat(), user))
+    return 0
+
+
+def cmd_import(args):
+    conn = connect(args.db or Path(args.logs_dir) / DB_NAME)
+    total = sum(ingest(conn, path) for path in args.files)
+    print("[SUCCESS] Imported %d new entries from %d file(s)" % (total, len(args.files)))
+    return 0
+
+
+def cmd_rebuild(args):
+    db_path = Path(args.db or Path(args.logs_dir) / DB_NAME)
+    conn = connect(db_path)
+    with conn:
+        conn.executescript("DELETE FROM usage_daily; DELETE FROM tool_daily;"
+                           " DELETE FROM conversations; DELETE FROM sources;")
+    total = ingest_all(conn, args.logs_dir)
+    print("[SUCCESS] Rebuilt %s from %d entries" % (db_path, total))
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incremental Cursor usage analytics")
+    parser.add_argument("--logs-dir", default=str(LOGS_DIR), help="Folder with cursor-usage-*.jsonl (default: ~/.cursor/logs)")
+    parser.add_argument("--db", help="Aggregate database (default: <logs-dir>/%s; skips auto-ingest)" % DB_NAME)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_range(p):
+        p.add_argument("--from", dest="date_from", default=_month_start(),
+                       help="First day, YYYY-MM-DD (default: start of this month)")
+        p.add_argument("--to", dest="date_to", help="Last day, YYYY-MM-DD (inclusive)")
+        p.add_argument("--user")
+        p.add_argument("--json", action="store_true")
+
+    report = sub.add_parser("report", help="Token totals grouped by day/user/model/workspace")
+    add_range(report)
+    report.add_argument("--by", default="day", help="Comma-separated: day,user,model,workspace (default: day)")
+    report.add_argument("--model")
+    report.add_argument("--workspace")
+    report.set_defaults(func=cmd_report)
+
+    tools = sub.add_parser("tools", help="Most used tools")
+    add_range(tools)
+    tools.add_argument("--limit", type=int, default=20)
+    tools.set_defaults(func=cmd_tools)
+
+    summary = sub.add_parser("summary", help="Print the daily summary")
+    summary.add_argument("--day", help="YYYY-MM-DD (default: today)")
+    summary.add_argument("--user")
+    summary.set_defaults(func=cmd_summary)
+
+    imp = sub.add_parser("import", help="Fold JSONL logs (e.g. from team members) into a database")
+    imp.add_argument("files", nargs="+")
+    imp.set_defaults(func=cmd_import)
+
+    rebuild = sub.add_parser("rebuild", help="Re-create aggregates from all JSONL logs")
+    rebuild.set_defaults(func=cmd_rebuild)
+
+    args = parser.parse_args(argv)
+    try:
+        return args.func(args)
+    except ValueError as exc:
+        print("[ERROR] %s" % exc, file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
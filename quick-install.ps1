@@ -10,6 +10,11 @@
 #   With project type:
 #     Invoke-WebRequest -Uri "https://raw.githubusercontent.com/vanachterjacob/ProjectTemplate/main/quick-install.ps1" -OutFile "$env:TEMP\quick-install.ps1"; & "$env:TEMP\quick-install.ps1" -TargetProject "C:\Projects\MyProject" -ProjectPrefix "ABC" -ProjectType "sales"
 #
+#   The template checkout is cached in $env:BC27_TEMPLATE_CACHE (default: %LOCALAPPDATA%\bc27-template) and only
+#   re-fetched when the remote branch moved. Projects that already have
+#   .cursor\template-manifest.json (in the target or in an app folder below it, where the
+#   installer puts it) get an incremental update instead of a full install.
+#
 ####################################################################################################
 
 param(
@@ -29,7 +34,8 @@ $ErrorActionPreference = "Stop"
 # Configuration
 $REPO_URL = "https://github.com/vanachterjacob/ProjectTemplate.git"
 $REPO_BRANCH = "main"
-$TEMP_DIR = ""
+$CacheRoot = if ($env:BC27_TEMPLATE_CACHE) { $env:BC27_TEMPLATE_CACHE } else { Join-Path $env:LOCALAPPDATA "bc27-template" }
+$CACHE_DIR = Join-Path $CacheRoot $REPO_BRANCH
 
 # Helper functions
 function Write-Info { param([string]$Message) Write-Host ("ℹ " + $Message) -ForegroundColor Blue }
@@ -38,17 +44,6 @@ function Write-Warning { param([string]$Message) Write-Host ("⚠ " + $Message)
 function Write-CustomError { param([string]$Message) Write-Host ("✗ " + $Message) -ForegroundColor Red }
 function Write-Header { param([string]$Message) Write-Host $Message -ForegroundColor Cyan }
 
-# Cleanup function
-function Cleanup {
-    if ($TEMP_DIR -and (Test-Path $TEMP_DIR)) {
-        Write-Info "Cleaning up temporary files..."
-        Remove-Item -Path $TEMP_DIR -Recurse -Force -ErrorAction SilentlyContinue
-    }
-}
-
-# Register cleanup on exit
-Register-EngineEvent PowerShell.Exiting -Action { Cleanup } | Out-Null
-
 # Banner
 Write-Host ""
 Write-Header "╔════════════════════════════════════════════════════════════════╗"
@@ -158,48 +153,87 @@ if ([Environment]::UserInteractive) {
     Write-Host ""
 }
 
-# Step 1: Clone repository
-Write-Info "Downloading BC27 template from GitHub..."
-$TEMP_DIR = Join-Path $env:TEMP "bc27-template-$(Get-Random)"
+# Step 1: Fetch template (reuse cached checkout when the remote is unchanged)
+Write-Info "Checking BC27 template on GitHub..."
 
-try {
-    # Check if git is available
-    $gitAvailable = Get-Command git -ErrorAction SilentlyContinue
-    if (-not $gitAvailable) {
-        Write-CustomError "Git is not installed or not in PATH. Please install Git for Windows."
-        exit 1
+# Check if git is available
+$gitAvailable = Get-Command git -ErrorAction SilentlyContinue
+if (-not $gitAvailable) {
+    Write-CustomError "Git is not installed or not in PATH. Please install Git for Windows."
+    exit 1
+}
+
+$RemoteHead = ""
+$lsRemote = git ls-remote $REPO_URL "refs/heads/$REPO_BRANCH" 2>$null
+if ($LASTEXITCODE -eq 0 -and $lsRemote) {
+    $RemoteHead = ($lsRemote -split "\s+")[0]
+}
+
+if (Test-Path (Join-Path $CACHE_DIR ".git")) {
+    $CachedHead = git -C $CACHE_DIR rev-parse HEAD 2>$null
+    $CachedShort = if ($CachedHead) { $CachedHead.Substring(0, 7) } else { "unknown" }
+    if (-not $RemoteHead) {
+        Write-Warning "Could not reach $REPO_URL - using cached template ($CachedShort)"
     }
-    
-    # Clone repository
-    git clone -q -b $REPO_BRANCH --depth 1 $REPO_URL $TEMP_DIR 2>&1 | Out-Null
+    elseif ($RemoteHead -eq $CachedHead) {
+        Write-Success "Cached template is up to date ($CachedShort)"
+    }
+    else {
+        git -C $CACHE_DIR fetch -q --depth 1 origin $REPO_BRANCH 2>&1 | Out-Null
+        if ($LASTEXITCODE -eq 0) {
+            git -C $CACHE_DIR reset -q --hard FETCH_HEAD 2>&1 | Out-Null
+        }
+        if ($LASTEXITCODE -ne 0) {
+            Write-CustomError "Failed to update cached template in $CACHE_DIR"
+            exit 1
+        }
+        Write-Success "Template updated ($CachedShort → $($RemoteHead.Substring(0, 7)))"
+    }
+}
+else {
+    Write-Info "Downloading BC27 template from GitHub..."
+    if (Test-Path $CACHE_DIR) {
+        Remove-Item -Path $CACHE_DIR -Recurse -Force -ErrorAction SilentlyContinue
+    }
+    New-Item -ItemType Directory -Path $CacheRoot -Force | Out-Null
+
+    git clone -q -b $REPO_BRANCH --depth 1 $REPO_URL $CACHE_DIR 2>&1 | Out-Null
     if ($LASTEXITCODE -ne 0) {
-        throw "Git clone failed"
+        Remove-Item -Path $CACHE_DIR -Recurse -Force -ErrorAction SilentlyContinue
+        Write-CustomError "Failed to clone repository from $REPO_URL"
+        Write-Info "Please check your internet connection and try again"
+        exit 1
     }
-    
+
     Write-Success "Template downloaded"
 }
-catch {
-    Write-CustomError "Failed to clone repository from $REPO_URL"
-    Write-Info "Please check your internet connection and try again"
-    Cleanup
-    exit 1
-}
 
 # Step 2: Run installation script
 Write-Info "Running installation script..."
 Write-Host ""
 
-$INSTALL_SCRIPT = Join-Path $TEMP_DIR "scripts\install-rules.ps1"
+$INSTALL_SCRIPT = Join-Path $CACHE_DIR "scripts\install-rules.ps1"
 
 if (-not (Test-Path $INSTALL_SCRIPT)) {
     Write-CustomError "Installation script not found in repository"
-    Cleanup
     exit 1
 }
 
 # Run installer
+# The installer writes into the app.json folder (up to 3 levels below the
+# target), so look for manifests there too
+$Manifests = @(Get-ChildItem -Path $TargetProject -Filter "template-manifest.json" -Recurse -Depth 3 -File -Force -ErrorAction SilentlyContinue |
+    Where-Object { $_.Directory.Name -eq ".cursor" -and $_.FullName -notmatch '[\\/]node_modules[\\/]' })
 try {
-    if (-not [string]::IsNullOrWhiteSpace($ProjectType)) {
+    if ($Manifests.Count -gt 0) {
+        # Existing installation: incremental update (changed files only)
+        Write-Info "Existing installation found - updating changed files only"
+        foreach ($Manifest in $Manifests) {
+            & $INSTALL_SCRIPT -TargetDirectory $Manifest.Directory.Parent.FullName -ProjectPrefix $ProjectPrefix -Update
+            if ($LASTEXITCODE -ne 0) { break }
+        }
+    }
+    elseif (-not [string]::IsNullOrWhiteSpace($ProjectType)) {
         # Non-interactive with project type
         # Note: install-rules.ps1 doesn't currently support project type parameter
         # This would need to be added to install-rules.ps1 if needed
@@ -216,7 +250,6 @@ try {
 }
 catch {
     Write-CustomError "Installation failed: $_"
-    Cleanup
     exit 1
 }
 
@@ -255,6 +288,3 @@ Write-Host ""
 Write-Info "Happy coding with BC27! 🚀"
 Write-Host ""
 
-# Cleanup
-Cleanup
-
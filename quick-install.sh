@@ -14,6 +14,11 @@
 #   With project type:
 #     curl -sSL https://raw.githubusercontent.com/vanachterjacob/ProjectTemplate/main/quick-install.sh | bash -s -- /path/to/project ABC sales
 #
+#   The template checkout is cached in ${BC27_TEMPLATE_CACHE:-~/.cache/bc27-template} and only
+#   re-fetched when the remote branch moved. Projects that already have
+#   .cursor/template-manifest.json (in the target or in an app folder below it, where the
+#   installer puts it) get an incremental update instead of a full install.
+#
 ####################################################################################################
 
 set -e
@@ -36,16 +41,7 @@ print_header() { echo -e "${CYAN}${BOLD}$1${NC}"; }
 # Configuration
 REPO_URL="https://github.com/vanachterjacob/ProjectTemplate.git"
 REPO_BRANCH="main"
-TEMP_DIR=""
-
-# Cleanup on exit
-cleanup() {
-    if [ -n "$TEMP_DIR" ] && [ -d "$TEMP_DIR" ]; then
-        print_info "Cleaning up temporary files..."
-        rm -rf "$TEMP_DIR"
-    fi
-}
-trap cleanup EXIT
+CACHE_DIR="${BC27_TEMPLATE_CACHE:-${XDG_CACHE_HOME:-$HOME/.cache}/bc27-template}/$REPO_BRANCH"
 
 # Parse arguments
 TARGET_PROJECT="${1:-}"
@@ -154,23 +150,41 @@ if [ -t 0 ]; then  # Check if running interactively
     echo ""
 fi
 
-# Step 1: Clone repository
-print_info "Downloading BC27 template from GitHub..."
-TEMP_DIR=$(mktemp -d)
-
-if ! git clone -q -b "$REPO_BRANCH" --depth 1 "$REPO_URL" "$TEMP_DIR" 2>/dev/null; then
-    print_error "Failed to clone repository from $REPO_URL"
-    print_info "Please check your internet connection and try again"
-    exit 1
+# Step 1: Fetch template (reuse cached checkout when the remote is unchanged)
+print_info "Checking BC27 template on GitHub..."
+REMOTE_HEAD=$(git ls-remote "$REPO_URL" "refs/heads/$REPO_BRANCH" 2>/dev/null | cut -f1)
+
+if [ -d "$CACHE_DIR/.git" ]; then
+    CACHED_HEAD=$(git -C "$CACHE_DIR" rev-parse HEAD 2>/dev/null || echo "")
+    if [ -z "$REMOTE_HEAD" ]; then
+        print_warning "Could not reach $REPO_URL - using cached template (${CACHED_HEAD:0:7})"
+    elif [ "$REMOTE_HEAD" = "$CACHED_HEAD" ]; then
+        print_success "Cached template is up to date (${CACHED_HEAD:0:7})"
+    elif git -C "$CACHE_DIR" fetch -q --depth 1 origin "$REPO_BRANCH" 2>/dev/null && \
+         git -C "$CACHE_DIR" reset -q --hard FETCH_HEAD; then
+        print_success "Template updated (${CACHED_HEAD:0:7} → ${REMOTE_HEAD:0:7})"
+    else
+        print_error "Failed to update cached template in $CACHE_DIR"
+        exit 1
+    fi
+else
+    print_info "Downloading BC27 template from GitHub..."
+    mkdir -p "$(dirname "$CACHE_DIR")"
+    rm -rf "$CACHE_DIR"
+    if ! git clone -q -b "$REPO_BRANCH" --depth 1 "$REPO_URL" "$CACHE_DIR" 2>/dev/null; then
+        rm -rf "$CACHE_DIR"
+        print_error "Failed to clone repository from $REPO_URL"
+        print_info "Please check your internet connection and try again"
+        exit 1
+    fi
+    print_success "Template downloaded"
 fi
 
-print_success "Template downloaded"
-
 # Step 2: Run installation script
 print_info "Running installation script..."
 echo ""
 
-INSTALL_SCRIPT="$TEMP_DIR/scripts/install-rules.sh"
+INSTALL_SCRIPT="$CACHE_DIR/scripts/install-rules.sh"
 
 if [ ! -f "$INSTALL_SCRIPT" ]; then
     print_error "Installation script not found in repository"
@@ -179,8 +193,17 @@ fi
 
 chmod +x "$INSTALL_SCRIPT"
 
-# Run installer
-if [ -n "$PROJECT_TYPE" ]; then
+# Run installer (incremental when a previous install recorded its manifest).
+# The installer writes into the app.json folder (up to 3 levels below the
+# target), so look for manifests there too.
+mapfile -t MANIFESTS < <(find "$TARGET_PROJECT" -maxdepth 4 -path "*/node_modules" -prune -o \
+    -path "*/.cursor/template-manifest.json" -type f -print 2>/dev/null)
+if [ ${#MANIFESTS[@]} -gt 0 ]; then
+    print_info "Existing installation found - updating changed files only"
+    for MANIFEST in "${MANIFESTS[@]}"; do
+        bash "$INSTALL_SCRIPT" --update "$(dirname "$(dirname "$MANIFEST")")" "$PROJECT_PREFIX"
+    done
+elif [ -n "$PROJECT_TYPE" ]; then
     # Non-interactive with project type
     bash "$INSTALL_SCRIPT" "$TARGET_PROJECT" "$PROJECT_PREFIX" <<EOF
 y
@@ -0,0 +1,505 @@
+#!/usr/bin/env python3
+"""
+BC27 Context Benchmark - Offline context-efficiency benchmark for the BC27 docs
+
+Replays a fixed corpus of developer queries through the documented loading
+strategy (.cursor/rules/011-llm-optimization.mdc) and records, per query,
+the files and sections it reaches, the tokens spent per tier and the
+retrieval latency. Tiers are assigned once, per file, by _load_mode() and
+shared by `run` and `report`:
+
+    Tier 1  always-loaded context (CLAUDE.md, rules with alwaysApply: true
+            or an "Auto-load: Always" hint)
+    Tier 2  rules loaded on demand (the rules the query triggers)
+    Tier 3  BC27 docs: the entry document (BC27_LLM_QUICKREF.md) loaded
+            whole, plus bc27_sections.py ranking counted up to the sections
+            that answer the query (the minimal slice). Sections of files
+            already loaded whole are not counted again.
+
+Tokens per answer = Tier 1 + Tier 2 + Tier 3. "Saved" compares that with
+answering the same query without the tools: Tier 1 plus the files the
+"Find event for [X]" chain loads whole for that query (quick reference,
+event index and 010 workflow only as far as they are needed, then the
+catalog that documents the answer). `run` compares the result with
+a checked-in baseline and fails when a query regresses past the threshold
+or its answer no longer fits in the default slice budget, so a doc edit that
+doubles an always-loaded file shows up before it ships. Latency is printed
+but not stored in the baseline (it depends on the machine).
+
+`report` renders the per-file size/token table in
+docs/LLM_OPTIMIZATION_GUIDE.md from the files on disk.
+
+Usage:
+    python scripts/bc27_benchmark.py run [--threshold 0.10] [--json]
+    python scripts/bc27_benchmark.py run --update-baseline
+    python scripts/bc27_benchmark.py report [--write | --check]
+
+Token counts use bc27_common.estimate_tokens (~4 bytes per token).
+
+Baseline location: docs/context-benchmark.json
+"""
+
+import argparse
+import json
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from bc27_common import BYTES_PER_TOKEN, doc_files, estimate_tokens, rel_path, resolve_root
+from bc27_sections import DEFAULT_BUDGET, SectionReader, connect, rank_sections, refresh, slice_query
+
+BASELINE_VERSION = 1
+BASELINE_FILE = Path("docs") / "context-benchmark.json"
+GUIDE_FILE = Path("docs") / "LLM_OPTIMIZATION_GUIDE.md"
+RULES_DIR = Path(".cursor") / "rules"
+CONTEXT_FILES = ("CLAUDE.md", ".claude/CLAUDE.md")
+
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_REPEAT = 5
+
+QUICKREF = "BC27/BC27_LLM_QUICKREF.md"
+EVENT_INDEX = "BC27/BC27_EVENT_INDEX.md"
+MAIN_CATALOG = "BC27/BC27_EVENT_CATALOG.md"
+EVENT_RULE = ".cursor/rules/010-event-discovery.mdc"
+
+# Fixed query corpus: realistic developer questions, the files the strategy
+# loads whole for them (tier from _load_mode) and the events that answer
+# them. Answers are resolved to sections by heading, so moving an event to
+# another catalog or renaming its anchor does not break the corpus.
+CORPUS = (
+    {
+        "query": "validate before sales posting",
+        "load": [EVENT_RULE, QUICKREF],
+        "answer": ["OnBeforePostSalesDoc"],
+    },
+    {
+        "query": "FEFO pick strategy",
+        "load": [EVENT_RULE, QUICKREF],
+        "answer": ["OnBeforeCreatePick"],
+    },
+    {
+        "query": "depreciation hook",
+        "load": [EVENT_RULE, QUICKREF],
+        "answer": ["OnBeforeCalculateDepreciation"],
+    },
+    {
+        "query": "release production order",
+        "load": [EVENT_RULE, QUICKREF],
+        "answer": ["OnBeforeChangeProdOrderStatus"],
+    },
+    {
+        "query": "service order posting",
+        "load": [EVENT_RULE, QUICKREF],
+        "answer": ["OnBeforePostServiceDoc"],
+    },
+    {
+        "query": "job planning line",
+        "load": [EVENT_RULE, QUICKREF],
+        "answer": ["OnBeforeCreateJobPlanningLine"],
+    },
+    {
+        "query": "assembly order posting",
+        "load": [EVENT_RULE, QUICKREF],
+        "answer": ["OnBeforePostAssemblyOrder"],
+    },
+    {
+        "query": "bin content",
+        "load": [EVENT_RULE, QUICKREF],
+        "answer": ["OnBeforeCreateBinContent"],
+    },
+)
+
+FRONTMATTER_RE = re.compile(rb"\A---\s*\n(.*?)\n---", re.DOTALL)
+ALWAYS_APPLY_RE = re.compile(rb"^alwaysApply:\s*true\s*$", re.MULTILINE)
+GLOBS_RE = re.compile(rb"^globs:", re.MULTILINE)
+AUTO_LOAD_RE = re.compile(rb"Auto-load:\s*Always", re.IGNORECASE)
+
+REPORT_BEGIN = "<!-- BEGIN bc27_benchmark.py report -->"
+REPORT_END = "<!-- END bc27_benchmark.py report -->"
+TIER_TITLES = {
+    1: "Tier 1 - always loaded",
+    2: "Tier 2 - rules loaded on demand",
+    3: "Tier 3 - BC27 docs (QUICKREF whole, the rest sliced)",
+}
+
+
+# ============================================================================
+# CONTEXT FILES
+# ============================================================================
+
+def _load_mode(path, data):
+    """(tier, load) for a context file, from its location and rule metadata."""
+    if path.endswith("CLAUDE.md"):
+        return 1, "Always"
+    if path.endswith(".mdc"):
+        frontmatter = FRONTMATTER_RE.match(data)
+        head = frontmatter.group(1) if frontmatter else b""
+        if ALWAYS_APPLY_RE.search(head) or AUTO_LOAD_RE.search(data[:1024]):
+            return 1, "Always"
+        return 2, "File pattern" if GLOBS_RE.search(head) else "@-mention"
+    if path == QUICKREF:
+        return 3, "Entry point, loaded whole"
+    return 3, "Slice / on demand"
+
+
+def context_files(root):
+    """Size, line and token stats for every file an assistant may load."""
+    root = Path(root)
+    paths = [root / name for name in CONTEXT_FILES if (root / name).is_file()]
+    paths += sorted((root / RULES_DIR).glob("*.mdc"))
+    paths += doc_files(root)
+    stats = []
+    for file_path in paths:
+        data = file_path.read_bytes()
+        path = rel_path(file_path, root)
+        tier, load = _load_mode(path, data)
+        stats.append({
+            "path": path,
+            "tier": tier,
+            "load": load,
+            "bytes": len(data),
+            "lines": data.count(b"\n") + (1 if data and not data.endswith(b"\n") else 0),
+            "tokens": estimate_tokens(data),
+        })
+    return stats
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def _ref(section):
+    return "%s#%s" % (section["file"], section["anchor"])
+
+
+def _names(text, names):
+    """The answer names that `text` (bytes) mentions as whole words."""
+    return {name for name in names if re.search(rb"\b%s\b" % re.escape(name.encode()), text)}
+
+
+def answer_files(conn, names):
+    """Files holding a section titled with each answer name, main catalog first."""
+    found = {}
+    for name in names:
+        rows = conn.execute("SELECT DISTINCT file FROM sections WHERE title = ? COLLATE NOCASE", (name,))
+        paths = sorted((row[0] for row in rows), key=lambda path: (path != MAIN_CATALOG, path))
+        if paths:
+            found[name] = paths[0]
+    return found
+
+
+def manual_load(texts, found):
+    """Files an assistant loads whole to answer the query without the tools.
+
+    Follows "Find event for [X]" in 011-llm-optimization.mdc: the quick
+    reference, then the event index if the quick reference does not name
+    the event, then the 010 workflow (rule plus main catalog) if neither
+    does, and finally the catalogs that document the answer events.
+    """
+    names = set(found)
+    paths = [QUICKREF]
+    if names - _names(texts.get(QUICKREF, b""), names):
+        paths.append(EVENT_INDEX)
+        if names - _names(texts.get(EVENT_INDEX, b""), names):
+            paths += [EVENT_RULE, MAIN_CATALOG]
+    for path in found.values():
+        if path not in paths:
+            paths.append(path)
+    return paths
+
+
+def measure_query(conn, reader, files, texts, entry, budget=DEFAULT_BUDGET, repeat=DEFAULT_REPEAT):
+    """Tokens per tier, minimal sections and retrieval latency for one query."""
+    query, answer = entry["query"], entry["answer"]
+    tier1 = [f for f in files.values() if f["tier"] == 1]
+    loaded = [files[path] for path in entry["load"] if path in files and files[path]["tier"] != 1]
+    problems = ["missing entry document %s" % path for path in entry["load"] if path not in files]
+    whole_paths = {f["path"] for f in tier1 + loaded}
+
+    found = answer_files(conn, answer)
+    problems += ["answer not documented: %s" % name for name in answer if name not in found]
+
+    # Minimal slice: ranked sections up to (and including) the last answer
+    # section; sections of files already loaded whole cost nothing extra
+    reached, sliced_tokens, pending = [], 0, {name.lower() for name in found}
+    for section in rank_sections(conn, query):
+        pending.discard(section["title"].lower())
+        if section["file"] not in whole_paths:
+            reached.append(_ref(section))
+            sliced_tokens += section["tokens"]
+        if not pending:
+            break
+    if pending:
+        problems.append("answer not ranked: %s" % ", ".join(n for n in answer if n.lower() in pending))
+
+    timings = []
+    for _ in range(max(repeat, 1)):
+        start = time.perf_counter()
+        result = slice_query(conn, reader, query, budget=budget)
+        timings.append((time.perf_counter() - start) * 1000)
+    sliced = {section["title"].lower() for section in result["sections"]}
+    missing = [name for name in found if name.lower() not in sliced]
+    if missing and not pending:
+        problems.append("answer outside the %d-token slice: %s" % (budget, ", ".join(missing)))
+
+    tiers = {
+        "1": sum(f["tokens"] for f in tier1),
+        "2": sum(f["tokens"] for f in loaded if f["tier"] == 2),
+        "3": sum(f["tokens"] for f in loaded if f["tier"] == 3) + (sliced_tokens if not pending else 0),
+    }
+    tokens = sum(tiers.values())
+    # What answering without the tools costs: Tier 1 plus every file the
+    # manual lookup chain loads whole
+    manual = [path for path in manual_load(texts, found) if path in files and files[path]["tier"] != 1]
+    whole_tokens = tiers["1"] + sum(files[path]["tokens"] for path in manual)
+    return {
+        "query": query,
+        "tokens": tokens,
+        "tiers": tiers,
+        "files": [f["path"] for f in tier1 + loaded],
+        "sections": reached if not pending else [],
+        "slice_tokens": result["used_tokens"],
+        "manual_files": manual,
+        "whole_file_tokens": whole_tokens,
+        "saved": round(1 - tokens / whole_tokens, 3) if whole_tokens else 0.0,
+        "latency_ms": round(statistics.median(timings), 2),
+        "problems": problems,
+    }
+
+
+def run_benchmark(root, budget=DEFAULT_BUDGET, repeat=DEFAULT_REPEAT):
+    conn = connect(root)
+    refresh(conn, root)
+    reader = SectionReader(root)
+    try:
+        files = {f["path"]: f for f in context_files(root)}
+        texts = {path: (Path(root) / path).read_bytes() for path in (QUICKREF, EVENT_INDEX) if path in files}
+        queries = [measure_query(conn, reader, files, texts, entry, budget, repeat) for entry in CORPUS]
+    finally:
+        reader.close()
+        conn.close()
+    return {
+        "version": BASELINE_VERSION,
+        "bytes_per_token": BYTES_PER_TOKEN,
+        "budget": budget,
+        "tokens": sum(q["tokens"] for q in queries),
+        "queries": queries,
+    }
+
+
+def compare(current, baseline, threshold):
+    """Return (errors, notes) comparing a run with the baseline."""
+    errors, notes = [], []
+    previous = {q["query"]: q for q in (baseline or {}).get("queries", [])}
+    for query in current["queries"]:
+        name = query["query"]
+        errors.extend("%s: %s" % (name, problem) for problem in query["problems"])
+        before = previous.get(name)
+        if before is None:
+            if baseline is not None:
+                notes.append("%s: new query (not in baseline)" % name)
+            continue
+        query["delta"] = _growth(query["tokens"], before["tokens"])
+        if query["delta"] > threshold:
+            tiers = ", ".join(
+                "tier %s %d -> %d" % (tier, before["tiers"].get(tier, 0), tokens)
+                for tier, tokens in query["tiers"].items() if tokens != before["tiers"].get(tier, 0)
+            )
+            errors.append(
+                "%s: %d tokens per answer, baseline %d (%+.1f%%, limit %+.0f%%; %s)"
+                % (name, query["tokens"], before["tokens"], query["delta"] * 100, threshold * 100, tiers)
+            )
+        elif query["delta"] < -threshold:
+            notes.append("%s: %+.1f%% tokens per answer (update the baseline)" % (name, query["delta"] * 100))
+    if baseline is not None and baseline.get("tokens"):
+        current["delta"] = _growth(current["tokens"], baseline["tokens"])
+    return errors, notes
+
+
+def _growth(now, before):
+    return (now - before) / before if before else 0.0
+
+
+def baseline_view(result):
+    """The run result without machine-dependent fields (what gets checked in)."""
+    queries = [{k: v for k, v in q.items() if k != "latency_ms"} for q in result["queries"]]
+    return dict(result, queries=queries)
+
+
+def load_baseline(path):
+    if not path.is_file():
+        return None
+    baseline = json.loads(path.read_text(encoding="utf-8"))
+    return baseline if baseline.get("version") == BASELINE_VERSION else None
+
+
+def format_run(result):
+    header = "%-32s %6s %6s %6s %7s %7s %8s %6s %8s %8s" % (
+        "Query", "Tier1", "Tier2", "Tier3", "Tokens", "Slice", "Whole", "Saved", "ms", "Change",
+    )
+    lines = [header, "-" * len(header)]
+    for query in result["queries"]:
+        lines.append("%-32s %6d %6d %6d %7d %7d %8d %5.0f%% %8.2f %8s" % (
+            query["query"][:32], query["tiers"]["1"], query["tiers"]["2"], query["tiers"]["3"],
+            query["tokens"], query["slice_tokens"], query["whole_file_tokens"], query["saved"] * 100,
+            query["latency_ms"], "%+.1f%%" % (query["delta"] * 100) if "delta" in query else "-",
+        ))
+    lines.append("-" * len(header))
+    lines.append("%-32s %6s %6s %6s %7d %7s %8s %6s %8s %8s" % (
+        "Total", "", "", "", result["tokens"], "", "", "", "",
+        "%+.1f%%" % (result["delta"] * 100) if "delta" in result else "-",
+    ))
+    return "\n".join(lines)
+
+
+# ============================================================================
+# FILE SIZE REPORT
+# ============================================================================
+
+def render_report(stats):
+    """Markdown block (between the report markers) for the optimization guide."""
+    lines = [
+        REPORT_BEGIN,
+        "<!-- Generated by `python scripts/bc27_benchmark.py report --write`; do not edit by hand -->",
+        "",
+        "| File | Lines | Size | ~Tokens | Load |",
+        "|------|------:|-----:|--------:|------|",
+    ]
+    for tier, title in TIER_TITLES.items():
+        group = [f for f in stats if f["tier"] == tier]
+        if not group:
+            continue
+        lines.append("| **%s** | **%s** | **%s** | **%s** | |" % (
+            title, _number(sum(f["lines"] for f in group)), _size(sum(f["bytes"] for f in group)),
+            _number(sum(f["tokens"] for f in group)),
+        ))
+        for f in group:
+            lines.append("| `%s` | %s | %s | %s | %s |" % (
+                f["path"], _number(f["lines"]), _size(f["bytes"]), _number(f["tokens"]), f["load"],
+            ))
+    lines.append("| **Total** | **%s** | **%s** | **%s** | |" % (
+        _number(sum(f["lines"] for f in stats)), _size(sum(f["bytes"] for f in stats)),
+        _number(sum(f["tokens"] for f in stats)),
+    ))
+    lines += ["", REPORT_END]
+    return "\n".join(lines)
+
+
+def _number(value):
+    return "{:,}".format(value)
+
+
+def _size(size):
+    return "%.1f KB" % (size / 1024.0)
+
+
+def replace_report(text, block):
+    """Swap the generated block in the guide; None if the markers are missing."""
+    start, end = text.find(REPORT_BEGIN), text.find(REPORT_END)
+    if start < 0 or end < start:
+        return None
+    return text[:start] + block + text[end + len(REPORT_END):]
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def cmd_run(args):
+    root = resolve_root(args.root)
+    baseline_path = Path(args.baseline) if args.baseline else root / BASELINE_FILE
+    start = time.perf_counter()
+    result = run_benchmark(root, budget=args.budget, repeat=args.repeat)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    if args.update_baseline:
+        errors = [
+            "%s: %s" % (q["query"], problem) for q in result["queries"] for problem in q["problems"]
+        ]
+        for error in errors:
+            print("[ERROR] %s" % error, file=sys.stderr)
+        if errors:
+            print("[ERROR] Baseline not written; fix the corpus or docs first", file=sys.stderr)
+            return 1
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(baseline_view(result), indent=2) + "\n", encoding="utf-8")
+        print(format_run(result))
+        print("[SUCCESS] Baseline written to %s (%d queries, %d tokens)" % (
+            rel_path(baseline_path, root), len(result["queries"]), result["tokens"]))
+        return 0
+
+    baseline = load_baseline(baseline_path)
+    errors, notes = compare(result, baseline, args.threshold)
+    if args.json:
+        print(json.dumps(dict(result, errors=errors, notes=notes), indent=2))
+    else:
+        print(format_run(result))
+        if baseline is None:
+            print("[WARNING] No baseline at %s (run with --update-baseline)" % rel_path(baseline_path, root))
+        for note in notes:
+            print("[INFO] %s" % note)
+        for error in errors:
+            print("[ERROR] %s" % error)
+        if not errors and baseline is not None:
+            print("[SUCCESS] %d queries within %+.0f%% of the baseline" % (
+                len(result["queries"]), args.threshold * 100))
+    print("%d queries in %.1f ms" % (len(result["queries"]), elapsed), file=sys.stderr)
+    return 1 if errors else 0
+
+
+def cmd_report(args):
+    root = resolve_root(args.root)
+    block = render_report(context_files(root))
+    if not (args.write or args.check):
+        print(block)
+        return 0
+
+    guide = root / GUIDE_FILE
+    text = guide.read_text(encoding="utf-8") if guide.is_file() else ""
+    updated = replace_report(text, block)
+    if updated is None:
+        print("[ERROR] Report markers not found in %s" % GUIDE_FILE.as_posix(), file=sys.stderr)
+        return 1
+    if args.check:
+        if updated != text:
+            print("[ERROR] File size report in %s is out of date (run report --write)" % GUIDE_FILE.as_posix())
+            return 1
+        print("[SUCCESS] File size report is up to date")
+        return 0
+    if updated != text:
+        guide.write_text(updated, encoding="utf-8")
+        print("[SUCCESS] Updated file size report in %s" % GUIDE_FILE.as_posix())
+    else:
+        print("[INFO] File size report already up to date")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline context-efficiency benchmark for the BC27 docs")
+    parser.add_argument("--root", help="Project root containing BC27/ (default: this template)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Run the query corpus and compare with the baseline")
+    run.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                     help="Allowed growth in tokens per answer (default: 0.10 = 10%%)")
+    run.add_argument("--budget", type=int, default=DEFAULT_BUDGET, help="Slice token budget (default: 2000)")
+    run.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed runs per query (median)")
+    run.add_argument("--baseline", help="Baseline file (default: docs/context-benchmark.json)")
+    run.add_argument("--update-baseline", action="store_true", help="Write the current results as the baseline")
+    run.add_argument("--json", action="store_true", help="Machine-readable output")
+    run.set_defaults(func=cmd_run)
+
+    report = sub.add_parser("report", help="Per-file size/token report for the optimization guide")
+    mode = report.add_mutually_exclusive_group()
+    mode.add_argument("--write", action="store_true", help="Update the table in docs/LLM_OPTIMIZATION_GUIDE.md")
+    mode.add_argument("--check", action="store_true", help="Exit non-zero if the table in the guide is stale")
+    report.set_defaults(func=cmd_report)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
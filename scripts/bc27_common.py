@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+BC27 Template Tools - Shared helpers
+
+Small helpers used by the BC27 documentation tools in this folder:
+template root resolution, the on-disk index folder, content hashing,
+incremental change detection and token estimation.
+
+All tools only use the Python standard library (Python 3.9+).
+"""
+
+import hashlib
+import math
+import os
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+TEMPLATE_DIR = SCRIPT_DIR.parent
+
+# Generated indexes live next to the docs they describe (git/AI-ignored)
+INDEX_DIRNAME = ".index"
+
+
+def resolve_root(root=None):
+    """Return the project root that contains the BC27/ folder.
+
+    Order: explicit --root, the current directory, then the first parent of
+    this script that has a BC27/ folder (template checkout or the
+    .claude/tools/ copy in an installed AL project).
+    """
+    if root:
+        return Path(root).resolve()
+    cwd = Path.cwd()
+    if (cwd / "BC27").is_dir():
+        return cwd
+    for candidate in SCRIPT_DIR.parents:
+        if (candidate / "BC27").is_dir():
+            return candidate
+    return TEMPLATE_DIR
+
+
+def bc27_dir(root):
+    return Path(root) / "BC27"
+
+
+def index_dir(root):
+    """Return (and create) the BC27/.index/ folder for generated indexes."""
+    path = bc27_dir(root) / INDEX_DIRNAME
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def event_catalog_files(root):
+    """Main event catalog plus every module-specific catalog, sorted."""
+    base = bc27_dir(root)
+    files = []
+    main = base / "BC27_EVENT_CATALOG.md"
+    if main.is_file():
+        files.append(main)
+    files.extend(sorted((base / "events").glob("*.md")))
+    return files
+
+
+def doc_files(root):
+    """Every BC27 markdown document (top level and events/), sorted."""
+    base = bc27_dir(root)
+    return sorted(base.glob("*.md")) + sorted((base / "events").glob("*.md"))
+
+
+def rel_path(path, root):
+    """Root-relative path with forward slashes (stable across OSes)."""
+    return Path(os.path.relpath(path, root)).as_posix()
+
+
+def sha256_file(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def scan_changes(known, files, root, force=False):
+    """Compare files on disk against previously indexed file state.
+
+    `known` maps root-relative path -> object with sha256/mtime_ns/size
+    (a sqlite3.Row or dict). Files whose mtime/size are unchanged are not
+    hashed; files whose hash is unchanged are not re-parsed.
+
+    Returns a dict with:
+        changed   - [(path, file_path, sha256, stat)] to (re-)parse
+        touched   - [(path, stat)] content identical, only mtime/size moved
+        unchanged - [path]
+        removed   - [path] indexed before, no longer on disk
+    """
+    report = {"changed": [], "touched": [], "unchanged": [], "removed": []}
+    seen = set()
+    for file_path in files:
+        path = rel_path(file_path, root)
+        seen.add(path)
+        stat = file_path.stat()
+        row = known.get(path)
+        if not force and row and row["mtime_ns"] == stat.st_mtime_ns and row["size"] == stat.st_size:
+            report["unchanged"].append(path)
+            continue
+        digest = sha256_file(file_path)
+        if not force and row and row["sha256"] == digest:
+            report["touched"].append((path, stat))
+            report["unchanged"].append(path)
+            continue
+        report["changed"].append((path, file_path, digest, stat))
+    report["removed"] = sorted(set(known) - seen)
+    return report
+
+
+# Rough, model-agnostic estimate used across the docs (~4 bytes per token)
+BYTES_PER_TOKEN = 4
+
+
+def estimate_tokens(size_or_text):
+    """Estimate tokens for a byte count, bytes or str."""
+    if isinstance(size_or_text, str):
+        size_or_text = len(size_or_text.encode("utf-8"))
+    elif isinstance(size_or_text, (bytes, bytearray, memoryview)):
+        size_or_text = len(size_or_text)
+    return int(math.ceil(size_or_text / BYTES_PER_TOKEN))
@@ -0,0 +1,790 @@
+#!/usr/bin/env python3
+"""
+BC27 Dependency Graph - Precomputed module dependencies and impact queries
+
+Parses BC27/BC27_DEPENDENCY_REFERENCE.md (ASCII dependency trees, the
+dependency matrix, "A → B" lists and conditional dependencies) together
+with BC27/BC27_MODULES_OVERVIEW.md and BC27/BC27_MODULES_BY_CATEGORY.md
+into one typed module graph:
+
+    requires  (→)  direct dependency
+    optional  (⤳)  optional dependency / enhanced functionality
+    events    (≈)  loosely coupled via events
+
+The transitive closure and reverse dependencies are precomputed for every
+combination of edge types and stored as bitsets, so upstream/downstream/
+impact questions are answered with a few lines instead of reading 650
+lines of trees. `check` reports dependency cycles and module names that
+do not resolve to a module in the overview, so the docs stay consistent.
+
+Usage:
+    python scripts/bc27_dependencies.py build [--force]
+    python scripts/bc27_dependencies.py show StatisticalAccounts
+    python scripts/bc27_dependencies.py upstream Sustainability [--edges requires] [--direct]
+    python scripts/bc27_dependencies.py downstream "EDocument Core"
+    python scripts/bc27_dependencies.py impact BaseApp --edges requires,optional [--json]
+    python scripts/bc27_dependencies.py check
+
+Module names are matched loosely: case, spaces and punctuation are ignored,
+folder names (APIReportsFinance) and unique prefixes (SalesAndInventory)
+work as well.
+
+Index location: BC27/.index/dependencies.json (git/AI-ignored)
+"""
+
+import argparse
+import difflib
+import json
+import re
+import sys
+import time
+
+from bc27_common import bc27_dir, index_dir, rel_path, resolve_root, scan_changes
+
+SCHEMA_VERSION = 1
+INDEX_NAME = "dependencies.json"
+
+REFERENCE_DOC = "BC27_DEPENDENCY_REFERENCE.md"
+OVERVIEW_DOC = "BC27_MODULES_OVERVIEW.md"
+CATEGORY_DOC = "BC27_MODULES_BY_CATEGORY.md"
+SOURCE_DOCS = (REFERENCE_DOC, OVERVIEW_DOC, CATEGORY_DOC)
+
+EDGE_TYPES = ("requires", "optional", "events")
+ARROWS = {"→": "requires", "⤳": "optional", "≈": "events"}
+ALL_EDGES = (1 << len(EDGE_TYPES)) - 1
+
+# Abbreviations used in the dependency matrix that neither match a module
+# name/folder exactly nor as a unique prefix
+ALIASES = {
+    "esgstatacctsdemotool": "ESG Statistical Accounts Demo Tool",
+    "statacct": "StatisticalAccounts",
+    "statacccts": "StatisticalAccounts",
+    "stataccts": "StatisticalAccounts",
+    "simplifiedbankimport": "SimplifiedBankStatementImport",
+    "salesinventoryfcast": "SalesAndInventoryForecast",
+    "edocs": "EDocument Core",
+    "emailm365connector": "Email - Microsoft 365 Connector",
+    "emailm365": "Email - Microsoft 365 Connector",
+    "azureblobconnector": "External File Storage - Azure Blob Service Connector",
+    "azurefileconnector": "External File Storage - Azure File Service Connector",
+    "sharepointconnector": "External File Storage - SharePoint Connector",
+    "contosocoffee": "ContosoCoffeeDemoDataset",
+    "sustain": "Sustainability",
+    "sustainabilitycoffedemo": "Sustainability Contoso Coffee Demo Dataset",
+    "errormessagesrecmn": "ErrorMessagesWithRecommendations",
+    "createproductcopilot": "Create Product Information With Copilot",
+}
+
+# Prerequisites in the overview that are services, not BC27 modules
+EXTERNAL_RE = re.compile(r"\b(api|service|authentication|graph)\b", re.IGNORECASE)
+
+FENCE_RE = re.compile(r"^\s*(```|~~~)")
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+LIST_ARROW_RE = re.compile(r"^\s*-\s+([^→⤳≈:]+?)\s*([→⤳≈])\s*(.+)$")
+FIELD_RE = re.compile(r"^\s*-\s+\*\*([^*]+)\*\*:\s*(.*)$")
+PAREN_RE = re.compile(r"\s*\([^()]*\)")
+NUMBERED_RE = re.compile(r"^\d+\.\s*")
+
+
+# ============================================================================
+# NAMES
+# ============================================================================
+
+def name_key(name):
+    """Comparison key: lowercase letters and digits only."""
+    return re.sub(r"[^a-z0-9]", "", name.lower())
+
+
+def clean_name(text):
+    """Strip markdown, list markers and "(...)" annotations from a name."""
+    text = text.strip().strip("*`").strip()
+    text = re.sub(r"^[-*]\s+", "", text)
+    return PAREN_RE.sub("", text).strip(" .:")
+
+
+def split_names(text):
+    """Split "A, B (note, more)" into ["A", "B"] (commas inside parens kept)."""
+    text = PAREN_RE.sub("", text)
+    return [part for part in (clean_name(p) for p in text.split(",")) if part]
+
+
+class Resolver:
+    """Maps the many spellings used across the docs to canonical names."""
+
+    def __init__(self, modules):
+        self.names = sorted(modules)
+        self.keys = {}
+        for name, info in modules.items():
+            for alias in [name] + info["aliases"]:
+                self.keys.setdefault(name_key(alias), name)
+        for key, name in ALIASES.items():
+            if name in modules:
+                self.keys.setdefault(key, name)
+
+    def resolve(self, text):
+        # Exact spelling first: "Contoso Coffee Demo Dataset (BE)" is a name
+        for key in (name_key(text), name_key(clean_name(text))):
+            if key in self.keys:
+                return self.keys[key]
+        if not key:
+            return None
+        matches = {name for k, name in self.keys.items() if k.startswith(key)}
+        return matches.pop() if len(matches) == 1 else None
+
+    def suggest(self, text):
+        return difflib.get_close_matches(clean_name(text), self.names, n=3, cutoff=0.5)
+
+
+# ============================================================================
+# PARSING
+# ============================================================================
+
+def _lines(text):
+    """(line_no, line, in_code) for every line; fence lines are skipped."""
+    in_code = False
+    for line_no, line in enumerate(text.splitlines(), 1):
+        if FENCE_RE.match(line):
+            in_code = not in_code
+            continue
+        yield line_no, line, in_code
+
+
+def heading_name(title):
+    """Split "DataCorrectionFA (Troubleshoot FA Ledger Entries)" into name and note.
+
+    Only annotations containing a space are dropped, so "Contoso Coffee Demo
+    Dataset (BE)" keeps its country suffix.
+    """
+    annotation = re.search(r"\(([^()]*\s[^()]*)\)\s*$", title)
+    if annotation:
+        return title[:annotation.start()].strip(), annotation.group(1)
+    return title.strip(), None
+
+
+def _title(text):
+    """"API & INTEGRATION MODULES" -> "API & Integration Modules"."""
+    return re.sub(r"[A-Za-z]{4,}", lambda m: m.group(0).capitalize(), text)
+
+
+def parse_overview(text, doc):
+    """Canonical modules from the numbered sections of the overview.
+
+    Returns {name: {"category", "path", "aliases", "source", "requires"}}
+    where `requires` holds the raw "**Dependencies**" names with line refs.
+    """
+    modules = {}
+    category = None
+    current = None
+    for line_no, line, in_code in _lines(text):
+        if in_code:
+            continue
+        heading = HEADING_RE.match(line)
+        if heading:
+            level, title = len(heading.group(1)), heading.group(2)
+            if level == 2:
+                category = _title(NUMBERED_RE.sub("", title)) if NUMBERED_RE.match(title) else None
+                current = None
+            elif level == 3 and category:
+                title, note = heading_name(title)
+                aliases = [note] if note else []
+                current = modules.setdefault(title, {
+                    "category": category, "path": "", "aliases": aliases,
+                    "source": "%s:%d" % (doc, line_no), "requires": [],
+                })
+            continue
+        field = FIELD_RE.match(line)
+        if not (field and current):
+            continue
+        label, value = field.group(1).strip().lower(), field.group(2).strip()
+        if label == "path":
+            path = value.strip("`")
+            current["path"] = path
+            folder = path.strip("/").split("/")[0]
+            if folder:
+                current["aliases"].append(folder)
+        elif label == "dependencies" and not value.lower().startswith("none"):
+            for name in split_names(value):
+                current["requires"].append((name, "%s:%d" % (doc, line_no)))
+    return modules
+
+
+def parse_by_category(text, doc):
+    """Module headings and "**Depends On**" lines from the category doc.
+
+    Only sections that carry a "**Count**:" line list modules; the
+    recommendation sections at the end use ### headings for company types.
+    Returns (mentions, edges) as lists of (name, line_ref) and
+    (source, target, type, line_ref).
+    """
+    mentions, edges = [], []
+    in_modules = False
+    current = None
+    for line_no, line, in_code in _lines(text):
+        if in_code:
+            continue
+        ref = "%s:%d" % (doc, line_no)
+        heading = HEADING_RE.match(line)
+        if heading:
+            level = len(heading.group(1))
+            if level <= 2:
+                in_modules = False
+                current = None
+            elif level == 3 and in_modules:
+                current = heading_name(heading.group(2))[0]
+                mentions.append((current, ref))
+            continue
+        if line.startswith("**Count**:"):
+            in_modules = True
+            continue
+        field = FIELD_RE.match(line)
+        if field and current and field.group(1).strip().lower() == "depends on":
+            for name in split_names(field.group(2)):
+                edges.append((current, name, "requires", ref))
+    return mentions, edges
+
+
+def _block_edges(block, resolver, doc):
+    """Edges from one fenced ASCII tree block.
+
+    Lines at the block's base indentation name a module; deeper lines that
+    start with an arrow list its dependencies. `←` lines ("← depends on: A,
+    B", "← A (optional)") read from the dependent's side. Blocks whose
+    roots are not modules (feature lists, flow charts) yield nothing.
+    """
+    edges = []
+    rows = [(n, l) for n, l in block if l.strip()]
+    if not rows:
+        return edges
+    base = min(len(l) - len(l.lstrip()) for _, l in rows)
+    current = None
+    for line_no, line in rows:
+        indent = len(line) - len(line.lstrip())
+        body = line.strip()
+        if indent == base:
+            current = resolver.resolve(body)
+            continue
+        if not current:
+            continue
+        ref = "%s:%d" % (doc, line_no)
+        arrow = body[0]
+        if arrow in ARROWS:
+            for name in split_names(body[1:]):
+                edges.append((current, name, ARROWS[arrow], ref))
+        elif arrow == "←":
+            rest = re.sub(r"^depends on:\s*", "", body[1:].strip(), flags=re.IGNORECASE)
+            kind = "optional" if "optional" in rest.lower() else "requires"
+            for name in split_names(rest):
+                edges.append((current, name, kind, ref))
+    return edges
+
+
+def _table_edges(rows, resolver, doc):
+    """Edges from a markdown table with "Module" and "Depends On" columns."""
+    edges, dangling = [], []
+    header = [c.strip().lower() for c in rows[0][1].strip().strip("|").split("|")]
+    if "module" not in header or "depends on" not in header:
+        return edges, dangling
+    col_module, col_deps = header.index("module"), header.index("depends on")
+    for line_no, line in rows[2:]:
+        cells = [c.strip() for c in line.strip().strip("|").split("|")]
+        if len(cells) <= max(col_module, col_deps):
+            continue
+        ref = "%s:%d" % (doc, line_no)
+        source = resolver.resolve(cells[col_module])
+        if not source:
+            dangling.append((cells[col_module], ref))
+            continue
+        if cells[col_deps] in ("", "-"):
+            continue
+        for name in split_names(cells[col_deps]):
+            edges.append((source, name, "requires", ref))
+    return edges, dangling
+
+
+def parse_reference(text, resolver, doc):
+    """Edges from the dependency reference: trees, lists, matrix, conditionals.
+
+    Returns (edges, dangling) where dangling holds module names used as an
+    edge source that resolve to nothing.
+    """
+    edges, dangling = [], []
+    block, table = None, []
+    section, current = "", None
+    in_code = False
+
+    def flush_table():
+        if len(table) > 2:
+            found, missing = _table_edges(table, resolver, doc)
+            edges.extend(found)
+            dangling.extend(missing)
+        del table[:]
+
+    for line_no, line in enumerate(text.splitlines(), 1):
+        if FENCE_RE.match(line):
+            in_code = not in_code
+            if in_code:
+                block = []
+            else:
+                edges.extend(_block_edges(block, resolver, doc))
+                block = None
+            continue
+        if in_code:
+            block.append((line_no, line))
+            continue
+        if line.lstrip().startswith("|"):
+            table.append((line_no, line))
+            continue
+        flush_table()
+
+        ref = "%s:%d" % (doc, line_no)
+        heading = HEADING_RE.match(line)
+        if heading:
+            level, title = len(heading.group(1)), heading.group(2)
+            if level <= 2:
+                section = title.lower()
+                current = None
+            elif "conditional" in section:
+                current = resolver.resolve(title)
+                if not current:
+                    dangling.append((clean_name(title), ref))
+            continue
+
+        field = FIELD_RE.match(line)
+        if field and current:
+            label = field.group(1).strip().lower()
+            kind = {"requires": "requires", "enhanced by": "optional"}.get(label)
+            for name in split_names(field.group(2)) if kind else ():
+                edges.append((current, name, kind, ref))
+            continue
+
+        arrow = LIST_ARROW_RE.match(line)
+        if arrow:
+            source = resolver.resolve(arrow.group(1))
+            if source:
+                for name in split_names(arrow.group(3)):
+                    edges.append((source, name, ARROWS[arrow.group(2)], ref))
+    flush_table()
+    return edges, dangling
+
+
+# ============================================================================
+# GRAPH
+# ============================================================================
+
+def _closure(adjacency, start):
+    """Bitset of every node reachable from `start` (excluding itself unless cyclic)."""
+    seen = 0
+    stack = [start]
+    while stack:
+        node = stack.pop()
+        bits = adjacency[node] & ~seen
+        seen |= bits
+        while bits:
+            low = bits & -bits
+            stack.append(low.bit_length() - 1)
+            bits ^= low
+    return seen
+
+
+def _indices(bits):
+    result = []
+    while bits:
+        low = bits & -bits
+        result.append(low.bit_length() - 1)
+        bits ^= low
+    return result
+
+
+def find_cycles(names, edges, mask=ALL_EDGES):
+    """Strongly connected components with more than one module (or a self-loop).
+
+    Tarjan's algorithm, iterative. `edges` are (src, dst, type_index) with
+    integer node ids; only edge types in `mask` are followed.
+    """
+    adjacency = [[] for _ in names]
+    for src, dst, kind in edges:
+        if mask & (1 << kind):
+            adjacency[src].append(dst)
+    index_of, low, on_stack, stack, cycles = {}, {}, set(), [], []
+    counter = 0
+    for root in range(len(names)):
+        if root in index_of:
+            continue
+        work = [(root, 0)]
+        while work:
+            node, child = work.pop()
+            if child == 0:
+                index_of[node] = low[node] = counter
+                counter += 1
+                stack.append(node)
+                on_stack.add(node)
+            if child < len(adjacency[node]):
+                work.append((node, child + 1))
+                target = adjacency[node][child]
+                if target not in index_of:
+                    work.append((target, 0))
+                elif target in on_stack:
+                    low[node] = min(low[node], index_of[target])
+                continue
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index_of[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                if len(component) > 1 or node in adjacency[node]:
+                    cycles.append(sorted(component))
+    return cycles
+
+
+def build_graph(root):
+    """Parse the three source docs into the serializable graph structure."""
+    base = bc27_dir(root)
+    texts = {}
+    for doc in SOURCE_DOCS:
+        path = base / doc
+        texts[doc] = path.read_text(encoding="utf-8") if path.is_file() else ""
+
+    modules = parse_overview(texts[OVERVIEW_DOC], OVERVIEW_DOC)
+    resolver = Resolver(modules)
+    raw_edges, dangling, externals = [], [], {}
+
+    for name, info in modules.items():
+        for target, ref in info["requires"]:
+            if resolver.resolve(target) or not EXTERNAL_RE.search(target):
+                raw_edges.append((name, target, "requires", ref))
+            else:
+                externals.setdefault(name, []).append(target)
+
+    mentions, category_edges = parse_by_category(texts[CATEGORY_DOC], CATEGORY_DOC)
+    for name, ref in mentions:
+        if not resolver.resolve(name):
+            dangling.append((name, ref))
+    raw_edges.extend(category_edges)
+
+    reference_edges, reference_dangling = parse_reference(texts[REFERENCE_DOC], resolver, REFERENCE_DOC)
+    raw_edges.extend(reference_edges)
+    dangling.extend(reference_dangling)
+
+    names = sorted(modules, key=str.lower)
+    ids = {name: index for index, name in enumerate(names)}
+    merged = {}
+    for source, target, kind, ref in raw_edges:
+        src, dst = resolver.resolve(source), resolver.resolve(target)
+        if not src:
+            dangling.append((source, ref))
+            continue
+        if not dst:
+            dangling.append((target, ref))
+            continue
+        merged.setdefault((ids[src], ids[dst], EDGE_TYPES.index(kind)), []).append(ref)
+    edges = sorted(merged)
+
+    # Direct adjacency per edge type, then closures for every type mask
+    direct = {"up": [[0] * len(names) for _ in EDGE_TYPES], "down": [[0] * len(names) for _ in EDGE_TYPES]}
+    for src, dst, kind in edges:
+        direct["up"][kind][src] |= 1 << dst
+        direct["down"][kind][dst] |= 1 << src
+    closure = {}
+    for mask in range(1, ALL_EDGES + 1):
+        kinds = [k for k in range(len(EDGE_TYPES)) if mask & (1 << k)]
+        entry = {}
+        for direction in ("up", "down"):
+            adjacency = [0] * len(names)
+            for kind in kinds:
+                adjacency = [a | b for a, b in zip(adjacency, direct[direction][kind])]
+            entry[direction] = ["%x" % _closure(adjacency, node) for node in range(len(names))]
+        closure[str(mask)] = entry
+
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "edge_types": list(EDGE_TYPES),
+        "modules": [
+            {
+                "name": name, "category": modules[name]["category"], "path": modules[name]["path"],
+                "aliases": modules[name]["aliases"], "source": modules[name]["source"],
+                "external": externals.get(name, []),
+            }
+            for name in names
+        ],
+        "edges": [[src, dst, kind, merged[(src, dst, kind)]] for src, dst, kind in edges],
+        "direct": {d: [["%x" % bits for bits in per_kind] for per_kind in direct[d]] for d in direct},
+        "closure": closure,
+        "cycles": [[names[i] for i in cycle] for cycle in find_cycles(names, edges)],
+        "dangling": sorted(set(dangling), key=lambda item: item[1]),
+    }
+
+
+# ============================================================================
+# INDEX STORAGE
+# ============================================================================
+
+def _source_files(root):
+    base = bc27_dir(root)
+    return [base / doc for doc in SOURCE_DOCS if (base / doc).is_file()]
+
+
+def load_graph(root, force=False):
+    """Load the precomputed graph, rebuilding it when a source doc changed.
+
+    Returns (graph, rebuilt). Unchanged docs are detected by mtime/size and
+    then SHA-256, exactly like the other BC27 indexes.
+    """
+    path = index_dir(root) / INDEX_NAME
+    graph = None
+    if path.is_file() and not force:
+        try:
+            graph = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError:
+            graph = None
+    if graph and graph.get("schema_version") != SCHEMA_VERSION:
+        graph = None
+
+    known = graph["files"] if graph else {}
+    files = _source_files(root)
+    changes = scan_changes(known, files, root, force=graph is None)
+    if graph and not changes["changed"] and not changes["removed"] and not changes["touched"]:
+        return Graph(graph), False
+
+    rebuilt = graph is None or bool(changes["changed"] or changes["removed"])
+    if rebuilt:
+        graph = build_graph(root)
+    digests = {path: digest for path, _, digest, _ in changes["changed"]}
+    state = {}
+    for file_path in files:
+        key = rel_path(file_path, root)
+        stat = file_path.stat()
+        state[key] = {
+            "sha256": digests.get(key) or known[key]["sha256"],
+            "mtime_ns": stat.st_mtime_ns, "size": stat.st_size,
+        }
+    graph["files"] = state
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(graph, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    tmp.replace(path)
+    return Graph(graph), rebuilt
+
+
+def edge_mask(edges):
+    """"requires,optional" -> type bitmask (all types when empty)."""
+    if not edges:
+        return ALL_EDGES
+    mask = 0
+    for name in edges.replace(",", " ").split():
+        kind = ARROWS.get(name, name.lower())
+        if kind not in EDGE_TYPES:
+            raise ValueError("unknown edge type '%s' (use %s)" % (name, ", ".join(EDGE_TYPES)))
+        mask |= 1 << EDGE_TYPES.index(kind)
+    return mask
+
+
+class Graph:
+    """Read-only view over the serialized graph; every lookup is a bitset read."""
+
+    def __init__(self, data):
+        self.data = data
+        self.modules = data["modules"]
+        self.names = [m["name"] for m in self.modules]
+        self.ids = {name: index for index, name in enumerate(self.names)}
+        self.resolver = Resolver({m["name"]: m for m in self.modules})
+
+    def resolve(self, text):
+        name = self.resolver.resolve(text)
+        if name is None:
+            hint = self.resolver.suggest(text)
+            raise KeyError("unknown module '%s'%s" % (text, " (did you mean: %s?)" % ", ".join(hint) if hint else ""))
+        return name
+
+    def _direct(self, direction, node, mask):
+        bits = 0
+        for kind, per_kind in enumerate(self.data["direct"][direction]):
+            if mask & (1 << kind):
+                bits |= int(per_kind[node], 16)
+        return bits
+
+    def _names(self, bits):
+        return sorted((self.names[i] for i in _indices(bits)), key=str.lower)
+
+    def related(self, module, direction, mask=ALL_EDGES, direct_only=False):
+        """{"direct": [...], "transitive": [...]} for direction "up" or "down"."""
+        node = self.ids[self.resolve(module)]
+        direct = self._direct(direction, node, mask)
+        if direct_only:
+            return {"direct": self._names(direct), "transitive": []}
+        reach = int(self.data["closure"][str(mask)][direction][node], 16)
+        return {"direct": self._names(direct), "transitive": self._names(reach & ~direct)}
+
+    def upstream(self, module, mask=ALL_EDGES, direct_only=False):
+        return self.related(module, "up", mask, direct_only)
+
+    def downstream(self, module, mask=ALL_EDGES, direct_only=False):
+        return self.related(module, "down", mask, direct_only)
+
+    def impact(self, module, mask=ALL_EDGES):
+        """Modules affected when `module` changes, grouped by category."""
+        result = self.downstream(module, mask)
+        affected = result["direct"] + result["transitive"]
+        by_category = {}
+        for name in affected:
+            by_category.setdefault(self.modules[self.ids[name]]["category"] or "Other", []).append(name)
+        result["count"] = len(affected)
+        result["by_category"] = by_category
+        return result
+
+    def edges_of(self, module):
+        """Direct edges touching `module` as (src, dst, type, refs)."""
+        node = self.ids[self.resolve(module)]
+        return [
+            (self.names[src], self.names[dst], EDGE_TYPES[kind], refs)
+            for src, dst, kind, refs in self.data["edges"]
+            if node in (src, dst)
+        ]
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def _mask_label(mask):
+    return ", ".join(t for i, t in enumerate(EDGE_TYPES) if mask & (1 << i))
+
+
+def _load(args):
+    graph, _ = load_graph(resolve_root(args.root))
+    return graph
+
+
+def cmd_build(args):
+    root = resolve_root(args.root)
+    start = time.perf_counter()
+    graph, rebuilt = load_graph(root, force=args.force)
+    elapsed = (time.perf_counter() - start) * 1000
+    size = (index_dir(root) / INDEX_NAME).stat().st_size
+    print(
+        "[SUCCESS] %d modules, %d edges %s (%d bytes) in %.1f ms"
+        % (len(graph.names), len(graph.data["edges"]), "rebuilt" if rebuilt else "up to date", size, elapsed)
+    )
+    if graph.data["cycles"] or graph.data["dangling"]:
+        print(
+            "[WARNING] %d cycle(s), %d dangling name(s) - run 'check'"
+            % (len(graph.data["cycles"]), len(graph.data["dangling"]))
+        )
+    return 0
+
+
+def cmd_show(args):
+    graph = _load(args)
+    name = graph.resolve(args.module)
+    info = graph.modules[graph.ids[name]]
+    print("%s  [%s]  %s" % (name, info["category"], info["path"]))
+    for src, dst, kind, refs in graph.edges_of(name):
+        if src == name:
+            text = "%s %s" % (next(s for s, t in ARROWS.items() if t == kind), dst)
+        else:
+            text = "← %s (%s)" % (src, kind)
+        print("  %-55s %s" % (text, refs[0] if not args.verbose else ", ".join(refs)))
+    if info["external"]:
+        print("  external: %s" % ", ".join(info["external"]))
+    return 0
+
+
+def _cmd_related(args, direction):
+    start = time.perf_counter()
+    graph = _load(args)
+    mask = edge_mask(args.edges)
+    name = graph.resolve(args.module)
+    if direction == "impact":
+        result = graph.impact(name, mask)
+    else:
+        result = graph.related(name, direction, mask, direct_only=args.direct)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    if args.json:
+        print(json.dumps(dict(result, module=name, edges=_mask_label(mask).split(", ")), indent=2))
+    elif direction == "impact":
+        print("Changing %s affects %d module(s) via %s:" % (name, result["count"], _mask_label(mask)))
+        for category, names in sorted(result["by_category"].items()):
+            marked = ["%s%s" % (n, "" if n in result["direct"] else "*") for n in names]
+            print("  %-32s %s" % (category + ":", ", ".join(marked)))
+        if result["transitive"]:
+            print("  (* = indirect)")
+    else:
+        label = "depends on" if direction == "up" else "is required by"
+        print("%s %s (%s):" % (name, label, _mask_label(mask)))
+        print("  direct:     %s" % (", ".join(result["direct"]) or "-"))
+        if not args.direct:
+            print("  transitive: %s" % (", ".join(result["transitive"]) or "-"))
+    print("in %.1f ms" % elapsed, file=sys.stderr)
+    return 0
+
+
+def cmd_check(args):
+    graph = _load(args)
+    cycles, dangling = graph.data["cycles"], graph.data["dangling"]
+    if args.json:
+        print(json.dumps({"cycles": cycles, "dangling": dangling}, indent=2))
+        return 1 if cycles or dangling else 0
+    for cycle in cycles:
+        members = set(cycle)
+        print("[ERROR] Dependency cycle: %s" % " <-> ".join(cycle))
+        for src, dst, kind, refs in graph.data["edges"]:
+            if graph.names[src] in members and graph.names[dst] in members:
+                print("          %s %s %s  (%s)" % (graph.names[src], EDGE_TYPES[kind], graph.names[dst], refs[0]))
+    for name, ref in dangling:
+        hint = graph.resolver.suggest(name)
+        print("[ERROR] %s: unknown module '%s'%s" % (ref, name, " (did you mean %s?)" % hint[0] if hint else ""))
+    if cycles or dangling:
+        return 1
+    print(
+        "[SUCCESS] %d modules, %d edges: no cycles, no dangling module names"
+        % (len(graph.names), len(graph.data["edges"]))
+    )
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precomputed BC27 module dependency graph")
+    parser.add_argument("--root", help="Project root containing BC27/ (default: this template)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Build or refresh the dependency graph")
+    build.add_argument("--force", action="store_true", help="Rebuild even if the docs are unchanged")
+    build.set_defaults(func=cmd_build)
+
+    show = sub.add_parser("show", help="Direct edges of one module with their doc line references")
+    show.add_argument("module")
+    show.add_argument("-v", "--verbose", action="store_true", help="List every source line per edge")
+    show.set_defaults(func=cmd_show)
+
+    for command, direction, text in (
+        ("upstream", "up", "Modules the given module depends on"),
+        ("downstream", "down", "Modules that depend on the given module"),
+        ("impact", "impact", "Everything affected when the given module changes"),
+    ):
+        query = sub.add_parser(command, help=text)
+        query.add_argument("module")
+        query.add_argument("--edges", help="Edge types: requires,optional,events (default: all)")
+        if direction != "impact":
+            query.add_argument("--direct", action="store_true", help="Direct edges only")
+        query.add_argument("--json", action="store_true", help="Machine-readable output")
+        query.set_defaults(func=lambda args, d=direction: _cmd_related(args, d))
+
+    check = sub.add_parser("check", help="Report dependency cycles and dangling module names")
+    check.add_argument("--json", action="store_true", help="Machine-readable output")
+    check.set_defaults(func=cmd_check)
+
+    args = parser.parse_args(argv)
+    try:
+        return args.func(args)
+    except (KeyError, ValueError) as exc:
+        print("[ERROR] %s" % (exc.args[0] if exc.args else exc), file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
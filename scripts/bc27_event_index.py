@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""
+BC27 Event Index - Compiled, queryable index of the BC27 event catalogs
+
+Parses every `### OnXxx` / `#### OnXxx` block in BC27/BC27_EVENT_CATALOG.md
+and BC27/events/*.md into structured records (publisher object + ID,
+parameters, cancellable flag, uses, source link) and stores them in a SQLite
+database with an FTS5 full-text table plus indexed fields.
+
+Rebuilds are incremental: each catalog is tracked by mtime/size and SHA-256,
+so editing one catalog only re-parses that file.
+
+Usage:
+    python scripts/bc27_event_index.py build [--force]
+    python scripts/bc27_event_index.py query publisher:Codeunit 7312 cancellable:yes pick
+    python scripts/bc27_event_index.py query 'publisher:"Sales-Post"' validation --verbose
+    python scripts/bc27_event_index.py stats
+
+Query syntax:
+    free words               full-text match (prefix) on name, publisher,
+                             parameters, when, uses and section
+    publisher:<value>        "Codeunit 7312", "7312", or part of the name
+    type:<value>             publisher object type (codeunit, table, ...)
+    id:<number>              publisher object ID
+    event:<value>            IntegrationEvent / BusinessEvent
+    cancellable:yes|no
+    name:<value>             event name (supports * wildcard)
+    file:<value>             catalog file (e.g. warehouse, manufacturing)
+
+Index location: BC27/.index/events.sqlite3 (git/AI-ignored)
+"""
+
+import argparse
+import json
+import re
+import shlex
+import sqlite3
+import sys
+import time
+
+from bc27_common import event_catalog_files, index_dir, resolve_root, scan_changes
+
+SCHEMA_VERSION = 1
+DB_NAME = "events.sqlite3"
+
+OBJECT_TYPES = ("Codeunit", "Table", "Page", "Report", "Query", "XmlPort", "Enum", "Interface")
+
+HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*$")
+EVENT_HEADING_RE = re.compile(r"^(On[A-Z]\w*)(?:\s*\((.+)\))?\s*$")
+FIELD_RE = re.compile(r"^-\s+\*\*([^*]+)\*\*:\s*(.*)$")
+SUBITEM_RE = re.compile(r"^\s+[-*]\s+(.*)$")
+PUBLISHER_RE = re.compile(
+    r"^(%s)\s+(\d+)\s*(?:\"([^\"]+)\"|(.+))?" % "|".join(OBJECT_TYPES), re.IGNORECASE
+)
+LINK_RE = re.compile(r"\[([^\]]*)\]\(([^)]+)\)")
+
+FTS_COLUMNS = ("name", "publisher", "parameters", "when_text", "uses", "section")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    event_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    qualifier TEXT,
+    publisher TEXT,
+    object_type TEXT,
+    object_id INTEGER,
+    object_name TEXT,
+    event_type TEXT,
+    parameters TEXT,
+    cancellable INTEGER,
+    cancellable_text TEXT,
+    when_text TEXT,
+    uses TEXT,
+    source_url TEXT,
+    section TEXT,
+    file TEXT NOT NULL,
+    line INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_events_name ON events (name);
+CREATE INDEX IF NOT EXISTS ix_events_object ON events (object_type, object_id);
+CREATE INDEX IF NOT EXISTS ix_events_file ON events (file);
+CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5 (
+    name, publisher, parameters, when_text, uses, section,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+
+# ============================================================================
+# PARSING
+# ============================================================================
+
+def _strip_md(text):
+    """Drop inline markdown (links, code ticks, bold) from a field value."""
+    text = LINK_RE.sub(r"\1", text)
+    return text.replace("`", "").replace("**", "").strip()
+
+
+def _parse_publisher(value):
+    match = PUBLISHER_RE.match(value)
+    if not match:
+        return None, None, None
+    object_type = next(t for t in OBJECT_TYPES if t.lower() == match.group(1).lower())
+    object_name = match.group(3) or (match.group(4) or "").strip() or None
+    return object_type, int(match.group(2)), object_name
+
+
+def _parse_cancellable(value):
+    if value is None:
+        return None
+    lowered = value.lower()
+    if lowered.startswith("yes"):
+        return 1
+    if lowered.startswith("no"):
+        return 0
+    return None
+
+
+def _build_record(name, qualifier, fields, uses_items, section, line):
+    publisher = _strip_md(fields.get("publisher", "")) or None
+    object_type, object_id, object_name = _parse_publisher(publisher or "")
+    uses = fields.get("uses") or fields.get("common uses") or ""
+    uses_parts = [part for part in [_strip_md(uses)] + uses_items if part]
+    source = fields.get("source", "")
+    link = LINK_RE.search(source)
+    cancellable_text = fields.get("cancellable")
+    return {
+        "name": name,
+        "qualifier": qualifier,
+        "publisher": publisher,
+        "object_type": object_type,
+        "object_id": object_id,
+        "object_name": object_name,
+        "event_type": _strip_md(fields.get("type", "")) or None,
+        "parameters": _strip_md(fields.get("parameters", "")) or None,
+        "cancellable": _parse_cancellable(cancellable_text),
+        "cancellable_text": _strip_md(cancellable_text) if cancellable_text else None,
+        "when_text": _strip_md(fields.get("when", "")) or None,
+        "uses": "; ".join(uses_parts) or None,
+        "source_url": link.group(2) if link else (_strip_md(source) or None),
+        "section": section,
+        "line": line,
+    }
+
+
+def parse_catalog(text):
+    """Parse one catalog markdown document into a list of event records.
+
+    An event block starts at a heading whose text begins with `On<Upper>`
+    and runs until the next heading or horizontal rule. Only blocks with a
+    **Publisher** field are treated as events.
+    """
+    records = []
+    section_stack = {}
+    current = None  # (name, qualifier, fields, uses_items, section, line)
+    last_field = None
+    in_code = False
+
+    def flush():
+        if current and "publisher" in current[2]:
+            records.append(_build_record(*current))
+
+    for number, raw in enumerate(text.splitlines(), start=1):
+        if raw.lstrip().startswith("```"):
+            in_code = not in_code
+            continue
+        if in_code:
+            continue
+
+        heading = HEADING_RE.match(raw)
+        if heading:
+            flush()
+            current, last_field = None, None
+            level, title = len(heading.group(1)), heading.group(2)
+            event = EVENT_HEADING_RE.match(title)
+            if event:
+                section = " / ".join(
+                    section_stack[lvl] for lvl in sorted(section_stack) if lvl < level
+                )
+                current = (event.group(1), event.group(2), {}, [], section, number)
+            else:
+                section_stack = {lvl: t for lvl, t in section_stack.items() if lvl < level}
+                if level >= 2:
+                    section_stack[level] = title
+            continue
+
+        if current is None:
+            continue
+        if raw.strip() == "---":
+            flush()
+            current, last_field = None, None
+            continue
+
+        field = FIELD_RE.match(raw)
+        if field:
+            last_field = field.group(1).strip().lower()
+            current[2][last_field] = field.group(2).strip()
+            continue
+        item = SUBITEM_RE.match(raw)
+        if item and last_field in ("uses", "common uses"):
+            current[3].append(_strip_md(item.group(1)))
+
+    flush()
+    return records
+
+
+# ============================================================================
+# INDEX STORAGE
+# ============================================================================
+
+def connect(root):
+    conn = sqlite3.connect(str(index_dir(root) / DB_NAME))
+    conn.row_factory = sqlite3.Row
+    version = None
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        version = int(row[0]) if row else None
+    except sqlite3.OperationalError:
+        pass
+    if version != SCHEMA_VERSION:
+        conn.executescript(
+            "DROP TABLE IF EXISTS events_fts; DROP TABLE IF EXISTS events;"
+            "DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS meta;"
+        )
+        conn.executescript(SCHEMA)
+        conn.execute("INSERT INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+        conn.commit()
+    return conn
+
+
+def _delete_file_events(conn, path):
+    conn.execute(
+        "DELETE FROM events_fts WHERE rowid IN (SELECT id FROM events WHERE file = ?)", (path,)
+    )
+    conn.execute("DELETE FROM events WHERE file = ?", (path,))
+
+
+def _insert_events(conn, path, records):
+    for record in records:
+        cursor = conn.execute(
+            "INSERT INTO events (name, qualifier, publisher, object_type, object_id, object_name,"
+            " event_type, parameters, cancellable, cancellable_text, when_text, uses, source_url,"
+            " section, file, line) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                record["name"], record["qualifier"], record["publisher"], record["object_type"],
+                record["object_id"], record["object_name"], record["event_type"],
+                record["parameters"], record["cancellable"], record["cancellable_text"],
+                record["when_text"], record["uses"], record["source_url"], record["section"],
+                path, record["line"],
+            ),
+        )
+        fts_values = [record[col] or "" for col in FTS_COLUMNS]
+        fts_values[0] = " ".join(filter(None, [record["name"], record["qualifier"]]))
+        conn.execute(
+            "INSERT INTO events_fts (rowid, %s) VALUES (?, ?, ?, ?, ?, ?, ?)" % ", ".join(FTS_COLUMNS),
+            [cursor.lastrowid] + fts_values,
+        )
+
+
+def refresh(conn, root, force=False):
+    """Bring the index up to date with the catalogs on disk.
+
+    Files whose mtime/size are unchanged are skipped without hashing; files
+    whose content hash is unchanged are skipped without parsing. Returns a
+    dict with the parsed, unchanged and removed file lists.
+    """
+    known = {row["path"]: row for row in conn.execute("SELECT * FROM files")}
+    changes = scan_changes(known, event_catalog_files(root), root, force=force)
+
+    for path, stat in changes["touched"]:
+        conn.execute(
+            "UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?",
+            (stat.st_mtime_ns, stat.st_size, path),
+        )
+    for path, file_path, digest, stat in changes["changed"]:
+        records = parse_catalog(file_path.read_text(encoding="utf-8"))
+        _delete_file_events(conn, path)
+        _insert_events(conn, path, records)
+        conn.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+            (path, digest, stat.st_mtime_ns, stat.st_size, len(records)),
+        )
+    for path in changes["removed"]:
+        _delete_file_events(conn, path)
+        conn.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    conn.commit()
+    return {
+        "parsed": [change[0] for change in changes["changed"]],
+        "unchanged": changes["unchanged"],
+        "removed": changes["removed"],
+    }
+
+
+# ============================================================================
+# QUERYING
+# ============================================================================
+
+def _fts_term(word):
+    cleaned = word.replace('"', "").strip("*")
+    return '"%s"*' % cleaned if cleaned else None
+
+
+def parse_query(text_or_tokens):
+    """Split a query into (field filters, free-text words).
+
+    `publisher:Codeunit 7312` is accepted without quotes: an object type
+    value followed by a bare number is read as one publisher value.
+    """
+    tokens = shlex.split(text_or_tokens) if isinstance(text_or_tokens, str) else list(text_or_tokens)
+    filters, words = [], []
+    index = 0
+    while index < len(tokens):
+        token = tokens[index]
+        key, sep, value = token.partition(":")
+        if sep and key.lower() in ("publisher", "type", "id", "event", "cancellable", "name", "file"):
+            key = key.lower()
+            if (
+                key == "publisher"
+                and value.lower() in (t.lower() for t in OBJECT_TYPES)
+                and index + 1 < len(tokens)
+                and tokens[index + 1].isdigit()
+            ):
+                value = "%s %s" % (value, tokens[index + 1])
+                index += 1
+            filters.append((key, value))
+        else:
+            words.append(token)
+        index += 1
+    return filters, words
+
+
+def build_sql(filters, words, limit):
+    where, params = [], []
+    for key, value in filters:
+        if key == "publisher":
+            object_type, object_id, _ = _parse_publisher(value)
+            if object_id is not None:
+                where.append("e.object_type = ? AND e.object_id = ?")
+                params += [object_type, object_id]
+            elif value.isdigit():
+                where.append("e.object_id = ?")
+                params.append(int(value))
+            else:
+                where.append("e.publisher LIKE ?")
+                params.append("%%%s%%" % value)
+        elif key == "type":
+            where.append("e.object_type = ? COLLATE NOCASE")
+            params.append(value)
+        elif key == "id":
+            where.append("e.object_id = ?")
+            params.append(int(value) if value.isdigit() else -1)
+        elif key == "event":
+            where.append("e.event_type LIKE ?")
+            params.append("%%%s%%" % value)
+        elif key == "cancellable":
+            if value.lower() in ("yes", "y", "true", "1"):
+                where.append("e.cancellable = 1")
+            else:
+                where.append("(e.cancellable IS NULL OR e.cancellable = 0)")
+        elif key == "name":
+            where.append("e.name LIKE ?")
+            params.append(value.replace("*", "%") if "*" in value else "%%%s%%" % value)
+        elif key == "file":
+            where.append("e.file LIKE ?")
+            params.append("%%%s%%" % value)
+
+    terms = [t for t in (_fts_term(w) for w in words) if t]
+    if terms:
+        sql = (
+            "SELECT e.*, bm25(events_fts, 10.0, 4.0, 1.0, 2.0, 2.0, 1.0) AS score"
+            " FROM events_fts JOIN events e ON e.id = events_fts.rowid"
+            " WHERE events_fts MATCH ?"
+        )
+        params.insert(0, " AND ".join(terms))
+        order = " ORDER BY score"
+    else:
+        sql = "SELECT e.*, 0.0 AS score FROM events e WHERE 1 = 1"
+        order = " ORDER BY e.file, e.line"
+    if where:
+        sql += " AND " + " AND ".join(where)
+    return sql + order + " LIMIT ?", params + [limit]
+
+
+def query(conn, tokens, limit=20):
+    filters, words = parse_query(tokens)
+    sql, params = build_sql(filters, words, limit)
+    return [dict(row) for row in conn.execute(sql, params)]
+
+
+def format_event(event, verbose=False):
+    title = event["name"] + (" (%s)" % event["qualifier"] if event["qualifier"] else "")
+    flag = " [cancellable]" if event["cancellable"] == 1 else ""
+    line = "%s - %s%s  %s:%d" % (title, event["publisher"], flag, event["file"], event["line"])
+    if not verbose:
+        return line
+    details = [line]
+    for label, key in (("Params", "parameters"), ("When", "when_text"), ("Uses", "uses"), ("Source", "source_url")):
+        if event[key]:
+            details.append("    %s: %s" % (label, event[key]))
+    return "\n".join(details)
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def cmd_build(args):
+    root = resolve_root(args.root)
+    start = time.perf_counter()
+    conn = connect(root)
+    report = refresh(conn, root, force=args.force)
+    total = conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+    elapsed = (time.perf_counter() - start) * 1000
+    for path in report["parsed"]:
+        print("[INFO] Parsed %s" % path)
+    for path in report["removed"]:
+        print("[INFO] Removed %s" % path)
+    print(
+        "[SUCCESS] %d events indexed (%d parsed, %d unchanged) in %.1f ms"
+        % (total, len(report["parsed"]), len(report["unchanged"]), elapsed)
+    )
+    return 0
+
+
+def cmd_query(args):
+    root = resolve_root(args.root)
+    start = time.perf_counter()
+    conn = connect(root)
+    if not args.no_refresh:
+        refresh(conn, root)
+    results = query(conn, args.terms, limit=args.limit)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for event in results:
+            print(format_event(event, verbose=args.verbose))
+    print("%d event(s) in %.1f ms" % (len(results), elapsed), file=sys.stderr)
+    return 0 if results else 1
+
+
+def cmd_stats(args):
+    root = resolve_root(args.root)
+    conn = connect(root)
+    refresh(conn, root)
+    for row in conn.execute("SELECT path, event_count, substr(sha256, 1, 12) AS hash FROM files ORDER BY path"):
+        print("%-45s %4d events  %s" % (row["path"], row["event_count"], row["hash"]))
+    total, cancellable = conn.execute(
+        "SELECT COUNT(*), SUM(cancellable = 1) FROM events"
+    ).fetchone()
+    print("Total: %d events (%d cancellable)" % (total, cancellable or 0))
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compiled, queryable BC27 event index")
+    parser.add_argument("--root", help="Project root containing BC27/ (default: this template)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Build or incrementally refresh the index")
+    build.add_argument("--force", action="store_true", help="Re-parse every catalog")
+    build.set_defaults(func=cmd_build)
+
+    search = sub.add_parser("query", help="Query events (see module docstring for syntax)")
+    search.add_argument("terms", nargs="+")
+    search.add_argument("--limit", type=int, default=20)
+    search.add_argument("--verbose", "-v", action="store_true", help="Show parameters and uses")
+    search.add_argument("--json", action="store_true", help="Machine-readable output")
+    search.add_argument("--no-refresh", action="store_true", help="Skip the incremental freshness check")
+    search.set_defaults(func=cmd_query)
+
+    stats = sub.add_parser("stats", help="Show indexed files and event counts")
+    stats.set_defaults(func=cmd_stats)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,531 @@
+#!/usr/bin/env python3
+"""
+BC27 Section Slicer - Token-budgeted retrieval of BC27 doc fragments
+
+Builds a byte-offset index of every heading (and its GitHub-style anchor)
+across BC27/*.md and BC27/events/*.md, then answers "query + token budget"
+requests with the best set of sections packed under that budget. Section
+text is read from the markdown files with memory-mapped offset reads, never
+by loading whole files, and every section carries a token estimate.
+
+This turns the "layered loading" pattern from docs/LLM_OPTIMIZATION_GUIDE.md
+into an enforced mechanism: ask for 2000 tokens, get at most 2000 tokens.
+
+Usage:
+    python scripts/bc27_sections.py build [--force]
+    python scripts/bc27_sections.py slice "validate before sales posting" --budget 2000
+    python scripts/bc27_sections.py get BC27/BC27_EVENT_CATALOG.md#onbeforepostsalesdoc
+    python scripts/bc27_sections.py toc BC27/events/BC27_EVENTS_WAREHOUSE.md
+    python scripts/bc27_sections.py serve
+
+Service protocol (serve): one JSON request per stdin line, one JSON response
+per stdout line.
+    {"id": 1, "query": "FEFO pick strategy", "budget": 2000}
+    {"id": 2, "query": "depreciation", "budget": 1500, "files": ["fixedassets"]}
+    {"id": 3, "get": "BC27/BC27_EVENT_CATALOG.md#onbeforepostsalesdoc"}
+    {"id": 4, "cmd": "refresh"}
+
+Index location: BC27/.index/sections.sqlite3 (git/AI-ignored)
+"""
+
+import argparse
+import json
+import mmap
+import os
+import re
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+from bc27_common import BYTES_PER_TOKEN, doc_files, estimate_tokens, index_dir, resolve_root, scan_changes
+
+SCHEMA_VERSION = 1
+DB_NAME = "sections.sqlite3"
+
+DEFAULT_BUDGET = 2000
+CANDIDATE_LIMIT = 60
+
+HEADING_RE = re.compile(rb"^(#{1,6})[ \t]+(.+?)[ \t#]*$")
+FENCE_RE = re.compile(rb"^\s*(```|~~~)")
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    section_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sections (
+    id INTEGER PRIMARY KEY,
+    file TEXT NOT NULL,
+    ordinal INTEGER NOT NULL,
+    level INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    anchor TEXT NOT NULL,
+    breadcrumb TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL,
+    subtree_end INTEGER NOT NULL,
+    tokens INTEGER NOT NULL,
+    subtree_tokens INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_sections_anchor ON sections (file, anchor);
+CREATE INDEX IF NOT EXISTS ix_sections_file ON sections (file, ordinal);
+CREATE VIRTUAL TABLE IF NOT EXISTS sections_fts USING fts5 (
+    title, breadcrumb, body,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+
+# ============================================================================
+# PARSING
+# ============================================================================
+
+def slugify(title):
+    """GitHub-style heading anchor (lowercase, punctuation dropped, spaces -> -)."""
+    text = title.strip().lower()
+    text = re.sub(r"[^\w\- ]", "", text, flags=re.UNICODE)
+    return text.replace(" ", "-")
+
+
+def parse_sections(data):
+    """Split markdown bytes into heading-delimited sections with byte offsets.
+
+    Each section runs from its heading line to the next heading of any level
+    (`end`); `subtree_end` extends to the next heading of the same or higher
+    level, so a section can also be served with all of its children. Text
+    before the first heading becomes a level-0 "preamble" section.
+    """
+    sections = []
+    stack = []  # open (level, title) pairs for breadcrumbs
+    anchors = {}   # base slug -> next suffix to try
+    used = set()   # every anchor emitted in this file
+    in_code = False
+    offset = 0
+    line_no = 0
+
+    def open_section(level, title, start, line):
+        base = slugify(title) if level else ""
+        # Like GitHub: a duplicate gets the first free -N suffix, so a second
+        # "Example" never takes the anchor of a real "Example 1" heading
+        anchor, count = base, anchors.get(base, 0)
+        while anchor in used:
+            count += 1
+            anchor = "%s-%d" % (base, count)
+        anchors[base] = count
+        used.add(anchor)
+        while stack and stack[-1][0] >= level:
+            stack.pop()
+        breadcrumb = " > ".join(t for _, t in stack)
+        if level:
+            stack.append((level, title))
+        sections.append({
+            "level": level, "title": title, "anchor": anchor, "breadcrumb": breadcrumb,
+            "line": line, "start": start,
+        })
+
+    open_section(0, "(preamble)", 0, 1)
+    for raw in data.splitlines(keepends=True):
+        line_no += 1
+        line = raw.rstrip(b"\r\n")
+        if FENCE_RE.match(line):
+            in_code = not in_code
+        elif not in_code:
+            heading = HEADING_RE.match(line)
+            if heading:
+                title = heading.group(2).decode("utf-8", "replace").strip()
+                open_section(len(heading.group(1)), title, offset, line_no)
+        offset += len(raw)
+
+    for index, section in enumerate(sections):
+        section["end"] = sections[index + 1]["start"] if index + 1 < len(sections) else len(data)
+        subtree_end = len(data)
+        for later in sections[index + 1:]:
+            if section["level"] and later["level"] <= section["level"]:
+                subtree_end = later["start"]
+                break
+        section["subtree_end"] = subtree_end if section["level"] else section["end"]
+        section["tokens"] = estimate_tokens(section["end"] - section["start"])
+        section["subtree_tokens"] = estimate_tokens(section["subtree_end"] - section["start"])
+
+    # An empty preamble (file starts with a heading) is not worth serving
+    if sections[0]["end"] == 0:
+        sections.pop(0)
+    return sections
+
+
+# ============================================================================
+# INDEX STORAGE
+# ============================================================================
+
+def connect(root):
+    conn = sqlite3.connect(str(index_dir(root) / DB_NAME))
+    conn.row_factory = sqlite3.Row
+    version = None
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        version = int(row[0]) if row else None
+    except sqlite3.OperationalError:
+        pass
+    if version != SCHEMA_VERSION:
+        conn.executescript(
+            "DROP TABLE IF EXISTS sections_fts; DROP TABLE IF EXISTS sections;"
+            "DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS meta;"
+        )
+        conn.executescript(SCHEMA)
+        conn.execute("INSERT INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+        conn.commit()
+    return conn
+
+
+def _delete_file_sections(conn, path):
+    conn.execute(
+        "DELETE FROM sections_fts WHERE rowid IN (SELECT id FROM sections WHERE file = ?)", (path,)
+    )
+    conn.execute("DELETE FROM sections WHERE file = ?", (path,))
+
+
+def refresh(conn, root, force=False):
+    """Re-index changed docs only (mtime/size, then SHA-256)."""
+    known = {row["path"]: row for row in conn.execute("SELECT * FROM files")}
+    changes = scan_changes(known, doc_files(root), root, force=force)
+
+    for path, stat in changes["touched"]:
+        conn.execute(
+            "UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?",
+            (stat.st_mtime_ns, stat.st_size, path),
+        )
+    for path, file_path, digest, stat in changes["changed"]:
+        data = file_path.read_bytes()
+        sections = parse_sections(data)
+        _delete_file_sections(conn, path)
+        for ordinal, section in enumerate(sections):
+            cursor = conn.execute(
+                "INSERT INTO sections (file, ordinal, level, title, anchor, breadcrumb, line,"
+                " start, end, subtree_end, tokens, subtree_tokens)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    path, ordinal, section["level"], section["title"], section["anchor"],
+                    section["breadcrumb"], section["line"], section["start"], section["end"],
+                    section["subtree_end"], section["tokens"], section["subtree_tokens"],
+                ),
+            )
+            body = data[section["start"]:section["end"]].decode("utf-8", "replace")
+            conn.execute(
+                "INSERT INTO sections_fts (rowid, title, breadcrumb, body) VALUES (?, ?, ?, ?)",
+                (cursor.lastrowid, section["title"], section["breadcrumb"], body),
+            )
+        conn.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+            (path, digest, stat.st_mtime_ns, stat.st_size, len(sections)),
+        )
+    for path in changes["removed"]:
+        _delete_file_sections(conn, path)
+        conn.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    conn.commit()
+    return {
+        "parsed": [change[0] for change in changes["changed"]],
+        "unchanged": changes["unchanged"],
+        "removed": changes["removed"],
+    }
+
+
+# ============================================================================
+# OFFSET READS
+# ============================================================================
+
+class SectionReader:
+    """Serves section bytes through cached read-only memory maps.
+
+    A map is re-opened when the file's mtime/size no longer match, so a
+    long-running service never serves stale offsets from an old mapping.
+    Callers that stay alive (serve) close() the reader after each request:
+    an open map blocks saving or replacing the file on Windows.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self._maps = {}
+
+    def read(self, path, start, end):
+        full = self.root / path
+        stat = full.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._maps.get(path)
+        if cached is None or cached[0] != key:
+            if cached:
+                self._maps.pop(path)[1].close()
+            if stat.st_size == 0:
+                return ""
+            with open(full, "rb") as handle:
+                mapping = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[path] = cached = (key, mapping)
+        return cached[1][start:end].decode("utf-8", "replace")
+
+    def close(self):
+        for _, mapping in self._maps.values():
+            mapping.close()
+        self._maps.clear()
+
+
+# ============================================================================
+# RETRIEVAL
+# ============================================================================
+
+def _match_expression(query):
+    words = [w for w in WORD_RE.findall(query.lower()) if len(w) > 1]
+    return " OR ".join('"%s"*' % w for w in words)
+
+
+def rank_sections(conn, query, files=None, limit=CANDIDATE_LIMIT):
+    expression = _match_expression(query)
+    if not expression:
+        return []
+    sql = (
+        "SELECT s.*, -bm25(sections_fts, 8.0, 3.0, 1.0) AS score"
+        " FROM sections_fts JOIN sections s ON s.id = sections_fts.rowid"
+        " WHERE sections_fts MATCH ?"
+    )
+    params = [expression]
+    if files:
+        sql += " AND (" + " OR ".join("s.file LIKE ?" for _ in files) + ")"
+        params += ["%%%s%%" % f for f in files]
+    sql += " ORDER BY score DESC LIMIT ?"
+    params.append(limit)
+    return [dict(row) for row in conn.execute(sql, params)]
+
+
+def pack_sections(candidates, budget):
+    """Greedy pack by relevance: take the best sections that still fit.
+
+    Sections are ranked by score; each is added if its token estimate fits
+    in the remaining budget. If not even the best section fits, it is
+    returned truncated to the budget so the caller always gets an answer.
+    """
+    chosen, used = [], 0
+    for candidate in candidates:
+        if used + candidate["tokens"] <= budget:
+            chosen.append(dict(candidate, truncated=False))
+            used += candidate["tokens"]
+    if not chosen and candidates and budget > 0:
+        best = dict(candidates[0], truncated=True)
+        best["end"] = min(best["end"], best["start"] + budget * BYTES_PER_TOKEN)
+        best["tokens"] = budget
+        chosen.append(best)
+    # Present in document order so fragments read naturally
+    chosen.sort(key=lambda s: (s["file"], s["start"]))
+    return chosen
+
+
+def _section_payload(section, text):
+    return {
+        "ref": "%s#%s" % (section["file"], section["anchor"]),
+        "file": section["file"],
+        "anchor": section["anchor"],
+        "title": section["title"],
+        "breadcrumb": section["breadcrumb"],
+        "line": section["line"],
+        "tokens": estimate_tokens(text),
+        "score": round(section.get("score", 0.0), 3),
+        "truncated": section.get("truncated", False),
+        "text": text,
+    }
+
+
+def slice_query(conn, reader, query, budget=DEFAULT_BUDGET, files=None):
+    chosen = pack_sections(rank_sections(conn, query, files=files), budget)
+    payload = []
+    for section in chosen:
+        text = reader.read(section["file"], section["start"], section["end"])
+        if section.get("truncated"):
+            # Byte truncation may split a UTF-8 sequence; trim to the last full line
+            text = text[:text.rfind("\n") + 1] or text
+        payload.append(_section_payload(section, text))
+    return {
+        "query": query,
+        "budget": budget,
+        "used_tokens": sum(p["tokens"] for p in payload),
+        "sections": payload,
+    }
+
+
+def get_section(conn, reader, ref, subtree=True):
+    """Fetch one section by `path#anchor` (with children unless subtree=False)."""
+    path, _, anchor = ref.partition("#")
+    row = conn.execute(
+        "SELECT * FROM sections WHERE file = ? AND anchor = ?", (path.replace(os.sep, "/"), anchor)
+    ).fetchone()
+    if row is None:
+        return None
+    section = dict(row)
+    end = section["subtree_end"] if subtree else section["end"]
+    return _section_payload(section, reader.read(section["file"], section["start"], end))
+
+
+def format_slice(result):
+    lines = []
+    for section in result["sections"]:
+        lines.append(
+            "<!-- %s (~%d tokens%s) -->" % (
+                section["ref"], section["tokens"], ", truncated" if section["truncated"] else ""
+            )
+        )
+        lines.append(section["text"].rstrip("\n"))
+        lines.append("")
+    return "\n".join(lines)
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def cmd_build(args):
+    root = resolve_root(args.root)
+    start = time.perf_counter()
+    conn = connect(root)
+    report = refresh(conn, root, force=args.force)
+    total = conn.execute("SELECT COUNT(*) FROM sections").fetchone()[0]
+    elapsed = (time.perf_counter() - start) * 1000
+    for path in report["parsed"]:
+        print("[INFO] Indexed %s" % path)
+    print(
+        "[SUCCESS] %d sections indexed (%d parsed, %d unchanged) in %.1f ms"
+        % (total, len(report["parsed"]), len(report["unchanged"]), elapsed)
+    )
+    return 0
+
+
+def cmd_slice(args):
+    root = resolve_root(args.root)
+    start = time.perf_counter()
+    conn = connect(root)
+    refresh(conn, root)
+    reader = SectionReader(root)
+    result = slice_query(conn, reader, " ".join(args.query), budget=args.budget, files=args.file)
+    elapsed = (time.perf_counter() - start) * 1000
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(format_slice(result))
+    print(
+        "%d section(s), ~%d/%d tokens in %.1f ms"
+        % (len(result["sections"]), result["used_tokens"], args.budget, elapsed),
+        file=sys.stderr,
+    )
+    return 0 if result["sections"] else 1
+
+
+def cmd_get(args):
+    root = resolve_root(args.root)
+    conn = connect(root)
+    refresh(conn, root)
+    section = get_section(conn, SectionReader(root), args.ref, subtree=not args.no_children)
+    if section is None:
+        print("[ERROR] Section not found: %s (see 'toc')" % args.ref, file=sys.stderr)
+        return 1
+    print(section["text"].rstrip("\n"))
+    print("~%d tokens" % section["tokens"], file=sys.stderr)
+    return 0
+
+
+def cmd_toc(args):
+    root = resolve_root(args.root)
+    conn = connect(root)
+    refresh(conn, root)
+    rows = conn.execute(
+        "SELECT * FROM sections WHERE file LIKE ? ORDER BY file, ordinal", ("%%%s%%" % args.file,)
+    )
+    for row in rows:
+        indent = "  " * max(row["level"] - 1, 0)
+        print(
+            "%s%s  #%s  (~%d / ~%d tokens)"
+            % (indent, row["title"], row["anchor"], row["tokens"], row["subtree_tokens"])
+        )
+    return 0
+
+
+def cmd_serve(args):
+    """Line-delimited JSON over stdio; keeps the index warm.
+
+    Memory maps are released after every request, so the docs stay editable
+    (on Windows a mapped file cannot be saved) while the service idles.
+    """
+    root = resolve_root(args.root)
+    conn = connect(root)
+    refresh(conn, root)
+    reader = SectionReader(root)
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        start = time.perf_counter()
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            if request.get("cmd") == "refresh":
+                response = refresh(conn, root)
+            elif request.get("get"):
+                response = get_section(conn, reader, request["get"], subtree=request.get("children", True))
+                if response is None:
+                    raise KeyError("section not found: %s" % request["get"])
+            else:
+                if not args.no_refresh:
+                    refresh(conn, root)
+                response = slice_query(
+                    conn, reader, request.get("query", ""),
+                    budget=int(request.get("budget", args.budget)), files=request.get("files"),
+                )
+            response = {"id": request_id, "ok": True, "result": response}
+        except Exception as exc:  # report and keep serving
+            response = {"id": request_id, "ok": False, "error": str(exc)}
+        finally:
+            reader.close()
+        response["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Token-budgeted BC27 documentation slicer")
+    parser.add_argument("--root", help="Project root containing BC27/ (default: this template)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Build or incrementally refresh the section index")
+    build.add_argument("--force", action="store_true", help="Re-index every document")
+    build.set_defaults(func=cmd_build)
+
+    slicer = sub.add_parser("slice", help="Return the best sections for a query within a budget")
+    slicer.add_argument("query", nargs="+")
+    slicer.add_argument("--budget", type=int, default=DEFAULT_BUDGET, help="Token budget (default: 2000)")
+    slicer.add_argument("--file", action="append", help="Restrict to files matching (repeatable)")
+    slicer.add_argument("--json", action="store_true", help="Machine-readable output")
+    slicer.set_defaults(func=cmd_slice)
+
+    get = sub.add_parser("get", help="Print one section by path#anchor")
+    get.add_argument("ref")
+    get.add_argument("--no-children", action="store_true", help="Exclude sub-sections")
+    get.set_defaults(func=cmd_get)
+
+    toc = sub.add_parser("toc", help="List headings, anchors and token estimates")
+    toc.add_argument("file", nargs="?", default="", help="Filter by file name")
+    toc.set_defaults(func=cmd_toc)
+
+    serve = sub.add_parser("serve", help="Run the stdio retrieval service (JSON lines)")
+    serve.add_argument("--budget", type=int, default=DEFAULT_BUDGET, help="Default token budget")
+    serve.add_argument("--no-refresh", action="store_true", help="Skip freshness checks per request")
+    serve.set_defaults(func=cmd_serve)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
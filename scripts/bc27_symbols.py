@@ -0,0 +1,819 @@
+#!/usr/bin/env python3
+"""
+BC27 Symbol Index - Indexed lookup over the local base-app AL source tree
+
+Streams the local symbols folder (see .cursor/rules/005-bc-symbols.mdc,
+default C:\\Temp\\BC26Objects: BaseApp, ALAppExtensions, Continia, ...) once,
+in parallel, and extracts every AL object (type, ID, name, file, byte
+range), table fields / enum values, procedures and every
+[IntegrationEvent] / [BusinessEvent] / [InternalEvent] publisher with its
+exact signature. Results go into a SQLite index that is opened memory-mapped
+for lookups and refreshed incrementally (mtime/size, then SHA-256), so a
+second build only re-parses files that actually changed.
+
+Replaces path guessing and grep over 27,000 files with millisecond lookups
+that return a few lines instead of whole files.
+
+Usage:
+    python scripts/bc27_symbols.py build [--source C:\\Temp\\BC26Objects] [--jobs 8] [--force]
+    python scripts/bc27_symbols.py publishers Codeunit 7312 [--name "OnBefore*"]
+    python scripts/bc27_symbols.py object Table 36 [--members field]
+    python scripts/bc27_symbols.py find "Sales-Post" [--kind object|field|procedure|event]
+    python scripts/bc27_symbols.py source Codeunit 80 [--member OnBeforePostSalesDoc] [--lines 40]
+    python scripts/bc27_symbols.py check-catalog
+    python scripts/bc27_symbols.py stats
+
+Objects are given as `<Type> <ID>`, `<ID>` or a (quoted) name.
+
+Source folder: --source, then $BC_SYMBOLS_PATH, then the **Base Path** in
+.cursor/rules/005-bc-symbols.mdc, then C:\\Temp\\BC26Objects.
+
+Index location: BC27/.index/symbols.sqlite3 (git/AI-ignored)
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import re
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from bc27_common import event_catalog_files, index_dir, rel_path, resolve_root
+from bc27_event_index import parse_catalog
+
+SCHEMA_VERSION = 1
+DB_NAME = "symbols.sqlite3"
+
+DEFAULT_SOURCE = r"C:\Temp\BC26Objects"
+SOURCE_ENV = "BC_SYMBOLS_PATH"
+RULE_FILE = Path(".cursor") / "rules" / "005-bc-symbols.mdc"
+RULE_PATH_RE = re.compile(r"\*\*Base Path:\*\*\s*`([^`]+)`")
+
+# Worker pool only pays off for real trees; small refreshes stay in-process
+PARALLEL_MIN_FILES = 64
+CHUNK_FILES = 32
+MMAP_SIZE = 256 << 20
+
+OBJECT_TYPES = {
+    name.lower(): name for name in (
+        "Table", "TableExtension", "Page", "PageExtension", "PageCustomization", "Codeunit",
+        "Report", "ReportExtension", "Query", "XmlPort", "Enum", "EnumExtension", "Interface",
+        "PermissionSet", "PermissionSetExtension", "Profile", "ControlAddIn", "Entitlement",
+    )
+}
+EVENT_ATTRIBUTES = ("IntegrationEvent", "BusinessEvent", "InternalEvent", "ExternalBusinessEvent")
+
+# Matched at candidate line starts of the lower-cased source (offsets are
+# unchanged by bytes.lower()); names and signatures are then sliced from the
+# original bytes. Object headers only match at column 0 (optional UTF-8 BOM).
+TOKEN_RE = re.compile(
+    rb"(?:\xef\xbb\xbf)?(?P<otype>" + b"|".join(sorted((t.encode() for t in OBJECT_TYPES), key=len, reverse=True))
+    + rb")[ \t]+(?:(?P<onum>\d+)[ \t]+)?(?P<oname>\"[^\"\r\n]+\"|\w+)"
+    rb"(?:[ \t]+extends[ \t]+(?P<oext>\"[^\"\r\n]+\"|\w+))?"
+    rb"|[ \t]*\[[ \t]*(?P<attr>" + b"|".join(a.lower().encode() for a in EVENT_ATTRIBUTES)
+    + rb")\b[ \t]*(?:\((?P<aargs>[^)\r\n]*)\))?"
+    rb"|[ \t]*(?:(?:local|internal|protected)[ \t]+)?procedure[ \t]+(?P<pname>\"[^\"\r\n]+\"|\w+)[ \t]*\("
+    rb"|[ \t]*(?P<fkind>field|value)[ \t]*\([ \t]*(?P<fnum>\d+)[ \t]*;[ \t]*(?P<fname>\"[^\"\r\n]*\"|\w+)"
+    rb"[ \t]*(?:;[ \t]*(?P<ftype>[^)\r\n]+?))?[ \t]*\)"
+)
+# Cheap prefilter: every token line contains one of these keywords (event
+# attributes all end in "event") or starts at column 0 (object headers)
+TOKEN_KEYWORDS = (b"procedure", b"event", b"field", b"value")
+COLUMN0_RE = re.compile(rb"\n[a-z]")
+ATTRIBUTE_NAMES = {a.lower().encode(): a for a in EVENT_ATTRIBUTES}
+SPACE_RE = re.compile(rb"\s+")
+
+# Platform trigger events (OnAfterInsertEvent, OnBeforeValidateEvent,
+# OnAfterGetRecordEvent, ...) exist on every table/page without a declaration
+IMPLICIT_EVENT_RE = re.compile(r"^On\w+Event$")
+IMPLICIT_EVENT_TYPES = ("Table", "Page")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    module TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    object_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS objects (
+    id INTEGER PRIMARY KEY,
+    file TEXT NOT NULL,
+    type TEXT NOT NULL,
+    number INTEGER,
+    name TEXT NOT NULL,
+    extends TEXT,
+    line INTEGER NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_objects_type ON objects (type, number);
+CREATE INDEX IF NOT EXISTS ix_objects_number ON objects (number);
+CREATE INDEX IF NOT EXISTS ix_objects_name ON objects (name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS ix_objects_file ON objects (file);
+CREATE TABLE IF NOT EXISTS members (
+    id INTEGER PRIMARY KEY,
+    object_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    number INTEGER,
+    signature TEXT NOT NULL,
+    event_type TEXT,
+    line INTEGER NOT NULL,
+    start INTEGER NOT NULL,
+    end INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_members_object ON members (object_id, kind);
+CREATE INDEX IF NOT EXISTS ix_members_name ON members (name COLLATE NOCASE);
+"""
+
+
+# ============================================================================
+# PARSING
+# ============================================================================
+
+def _unquote(raw):
+    return raw.decode("utf-8", "replace").strip().strip('"')
+
+
+def _signature_end(data, open_paren):
+    """Offset of the end of a procedure signature (its line after the `)`).
+
+    Most parameter lists close at the first `)` with no nested parens or
+    open quotes; otherwise walk them with paren depth and quote tracking,
+    so multi-line lists and quoted names such as "No. (Series)" are
+    handled. The return type is the rest of the closing line.
+    """
+    size = len(data)
+    index = data.find(b")", open_paren)
+    if index < 0:
+        index = size
+    else:
+        inner = data[open_paren + 1:index]
+        if b"(" in inner or inner.count(b'"') % 2 or inner.count(b"'") % 2:
+            index = _matching_paren(data, open_paren)
+    newline = data.find(b"\n", index)
+    return size if newline < 0 else newline
+
+
+def _matching_paren(data, open_paren):
+    depth, index, size = 0, open_paren, len(data)
+    quote = None
+    while index < size:
+        char = data[index]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in (0x22, 0x27):  # " '
+            quote = char
+        elif char == 0x28:  # (
+            depth += 1
+        elif char == 0x29:  # )
+            depth -= 1
+            if depth == 0:
+                break
+        index += 1
+    return index
+
+
+def _line_starts(low):
+    """Sorted offsets of the lines that can hold a token (see TOKEN_KEYWORDS)."""
+    starts = {0}
+    starts.update(match.start() + 1 for match in COLUMN0_RE.finditer(low))
+    for keyword in TOKEN_KEYWORDS:
+        index = low.find(keyword)
+        while index >= 0:
+            starts.add(low.rfind(b"\n", 0, index) + 1)
+            newline = low.find(b"\n", index)
+            if newline < 0:
+                break
+            index = low.find(keyword, newline)
+    return sorted(starts)
+
+
+def parse_al(data):
+    """Extract objects and their members from AL source bytes.
+
+    Returns a list of object tuples
+        (type, number, name, extends, line, start, end, members)
+    with members as (kind, name, number, signature, event_type, line, start, end).
+    Kinds: field (table fields), value (enum values), procedure, event.
+    An object's byte range runs to the next object header (or end of file).
+    """
+    objects = []
+    current = None
+    pending_event = None
+    line, line_pos = 1, 0
+    low = data.lower()
+
+    for pos in _line_starts(low):
+        match = TOKEN_RE.match(low, pos)
+        if match is None:
+            continue
+        line += data.count(b"\n", line_pos, pos)
+        line_pos = pos
+        text = match.group(0)
+        start = pos + (3 if text.startswith(b"\xef\xbb\xbf") else len(text) - len(text.lstrip()))
+
+        if match.group("otype") is not None:
+            number = match.group("onum")
+            extends = match.span("oext")
+            current = [
+                OBJECT_TYPES[match.group("otype").decode()], int(number) if number else None,
+                _unquote(data[slice(*match.span("oname"))]),
+                _unquote(data[slice(*extends)]) if extends[0] >= 0 else None,
+                line, start, len(data), [],
+            ]
+            if objects:
+                objects[-1][6] = start
+            objects.append(current)
+            pending_event = None
+            continue
+        if current is None:
+            continue
+
+        attr = match.group("attr")
+        if attr is not None:
+            name = ATTRIBUTE_NAMES[attr]
+            args = match.span("aargs")
+            if args[0] >= 0:
+                pending_event = "%s(%s)" % (name, data[slice(*args)].decode("utf-8", "replace").strip())
+            else:
+                pending_event = name
+            continue
+
+        if match.group("pname") is not None:
+            end = _signature_end(data, match.end() - 1)
+            signature = SPACE_RE.sub(b" ", data[start:end]).decode("utf-8", "replace").strip()
+            kind = "event" if pending_event else "procedure"
+            current[7].append((
+                kind, _unquote(data[slice(*match.span("pname"))]), None, signature, pending_event,
+                line, start, end,
+            ))
+            pending_event = None
+            continue
+
+        if match.group("fkind") == b"field" and match.group("ftype") is None:
+            continue  # page/report control, not a table field
+        signature = SPACE_RE.sub(b" ", data[start:match.end()]).decode("utf-8", "replace")
+        current[7].append((
+            match.group("fkind").decode(), _unquote(data[slice(*match.span("fname"))]),
+            int(match.group("fnum")), signature, None, line, start, match.end(),
+        ))
+        pending_event = None
+
+    for obj in objects:  # trim trailing whitespace between objects
+        end = obj[6]
+        while end > obj[5] and data[end - 1:end].isspace():
+            end -= 1
+        obj[6] = end
+    return [tuple(obj) for obj in objects]
+
+
+def index_file(task):
+    """Worker: read one file once, hash it and parse it unless unchanged.
+
+    `task` is (absolute path, relative path, previously stored sha256 or
+    None). Returns (relative path, sha256, objects) where objects is None
+    when the content hash matched (only mtime/size moved).
+    """
+    full_path, path, known_sha = task
+    with open(full_path, "rb") as handle:
+        data = handle.read()
+    digest = hashlib.sha256(data).hexdigest()
+    if digest == known_sha:
+        return path, digest, None
+    return path, digest, parse_al(data)
+
+
+def _index_chunk(tasks):
+    return [index_file(task) for task in tasks]
+
+
+# ============================================================================
+# INDEX STORAGE
+# ============================================================================
+
+def source_dir(root, source=None):
+    """Resolve the AL symbols folder (see module docstring for the order)."""
+    if source:
+        return Path(source)
+    if os.environ.get(SOURCE_ENV):
+        return Path(os.environ[SOURCE_ENV])
+    rule = Path(root) / RULE_FILE
+    if rule.is_file():
+        match = RULE_PATH_RE.search(rule.read_text(encoding="utf-8"))
+        if match:
+            return Path(match.group(1))
+    return Path(DEFAULT_SOURCE)
+
+
+def connect(root, db_path=None):
+    path = Path(db_path) if db_path else index_dir(root) / DB_NAME
+    conn = sqlite3.connect(str(path))
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA mmap_size = %d" % MMAP_SIZE)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    version = None
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        version = int(row[0]) if row else None
+    except sqlite3.OperationalError:
+        pass
+    if version != SCHEMA_VERSION:
+        conn.executescript(
+            "DROP TABLE IF EXISTS members; DROP TABLE IF EXISTS objects;"
+            "DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS meta;"
+        )
+        conn.executescript(SCHEMA)
+        conn.execute("INSERT INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+        conn.commit()
+    return conn
+
+
+def get_meta(conn, key):
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def walk_al_files(source):
+    """Yield (absolute path, stat) for every *.al file, streamed via scandir."""
+    stack = [str(source)]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if not entry.name.startswith("."):
+                        stack.append(entry.path)
+                elif entry.name.lower().endswith(".al"):
+                    yield entry.path, entry.stat()
+
+
+def _delete_file(conn, path):
+    conn.execute("DELETE FROM members WHERE object_id IN (SELECT id FROM objects WHERE file = ?)", (path,))
+    conn.execute("DELETE FROM objects WHERE file = ?", (path,))
+
+
+def _store(conn, path, objects):
+    _delete_file(conn, path)
+    for otype, number, name, extends, line, start, end, members in objects:
+        cursor = conn.execute(
+            "INSERT INTO objects (file, type, number, name, extends, line, start, end)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (path, otype, number, name, extends, line, start, end),
+        )
+        conn.executemany(
+            "INSERT INTO members (object_id, kind, name, number, signature, event_type, line, start, end)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(cursor.lastrowid,) + member for member in members],
+        )
+
+
+def refresh(conn, source, force=False, jobs=None, progress=None):
+    """Bring the index up to date with the AL tree.
+
+    Unchanged mtime/size: skipped without reading. Otherwise the file is
+    read once in a worker, hashed, and parsed only if the hash differs.
+    Returns a dict with parsed / touched / unchanged / removed counts.
+    """
+    source = Path(source)
+    if not source.is_dir():
+        raise FileNotFoundError(
+            "AL source folder not found: %s (use --source or set %s)" % (source, SOURCE_ENV)
+        )
+    if get_meta(conn, "source") != str(source.resolve()):
+        conn.execute("DELETE FROM members")
+        conn.execute("DELETE FROM objects")
+        conn.execute("DELETE FROM files")
+        conn.execute("INSERT OR REPLACE INTO meta VALUES ('source', ?)", (str(source.resolve()),))
+
+    known = {row["path"]: row for row in conn.execute("SELECT path, sha256, mtime_ns, size FROM files")}
+    stats, tasks, seen = {}, [], set()
+    unchanged = 0
+    for full_path, stat in walk_al_files(source):
+        path = rel_path(full_path, source)
+        seen.add(path)
+        row = known.get(path)
+        if not force and row and row["mtime_ns"] == stat.st_mtime_ns and row["size"] == stat.st_size:
+            unchanged += 1
+            continue
+        stats[path] = stat
+        tasks.append((full_path, path, None if force or not row else row["sha256"]))
+
+    report = {"parsed": 0, "touched": 0, "unchanged": unchanged, "removed": 0, "objects": 0}
+
+    def apply(results):
+        for path, digest, objects in results:
+            stat = stats[path]
+            if objects is None:
+                conn.execute(
+                    "UPDATE files SET mtime_ns = ?, size = ? WHERE path = ?",
+                    (stat.st_mtime_ns, stat.st_size, path),
+                )
+                report["touched"] += 1
+                continue
+            _store(conn, path, objects)
+            conn.execute(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)",
+                (path, path.split("/", 1)[0], digest, stat.st_mtime_ns, stat.st_size, len(objects)),
+            )
+            report["parsed"] += 1
+            report["objects"] += len(objects)
+        if progress:
+            progress(report["parsed"] + report["touched"], len(tasks))
+
+    chunks = [tasks[i:i + CHUNK_FILES] for i in range(0, len(tasks), CHUNK_FILES)]
+    workers = jobs or os.cpu_count() or 1
+    if len(tasks) < PARALLEL_MIN_FILES or workers < 2:
+        for chunk in chunks:
+            apply(_index_chunk(chunk))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for results in pool.map(_index_chunk, chunks):
+                apply(results)
+
+    for path in set(known) - seen:
+        _delete_file(conn, path)
+        conn.execute("DELETE FROM files WHERE path = ?", (path,))
+        report["removed"] += 1
+    conn.commit()
+    return report
+
+
+# ============================================================================
+# QUERYING
+# ============================================================================
+
+def parse_target(tokens):
+    """["Codeunit", "7312"] / ["7312"] / ["Sales-Post"] -> (type, number, name)."""
+    tokens = [t for t in tokens if t]
+    otype = None
+    if tokens and tokens[0].lower() in OBJECT_TYPES:
+        otype = OBJECT_TYPES[tokens.pop(0).lower()]
+    if len(tokens) == 1 and tokens[0].isdigit():
+        return otype, int(tokens[0]), None
+    name = " ".join(tokens).strip('"') or None
+    if otype and name is None:
+        raise ValueError("object number or name required after '%s'" % otype)
+    return otype, None, name
+
+
+def find_objects(conn, tokens, limit=20):
+    otype, number, name = parse_target(tokens)
+    where, params = [], []
+    if otype:
+        where.append("type = ?")
+        params.append(otype)
+    if number is not None:
+        where.append("number = ?")
+        params.append(number)
+    if name:
+        where.append("name = ? COLLATE NOCASE")
+        params.append(name)
+    sql = "SELECT * FROM objects WHERE %s ORDER BY type, number LIMIT ?" % " AND ".join(where)
+    rows = [dict(row) for row in conn.execute(sql, params + [limit])]
+    if not rows and name:
+        params[-1] = "%%%s%%" % name
+        sql = sql.replace("name = ? COLLATE NOCASE", "name LIKE ?")
+        rows = [dict(row) for row in conn.execute(sql, params + [limit])]
+    return rows
+
+
+def _like(pattern):
+    return pattern.replace("*", "%") if "*" in pattern else pattern
+
+
+def members(conn, object_id, kinds=None, name=None):
+    sql, params = "SELECT * FROM members WHERE object_id = ?", [object_id]
+    if kinds:
+        sql += " AND kind IN (%s)" % ", ".join("?" * len(kinds))
+        params += list(kinds)
+    if name:
+        sql += " AND name LIKE ?"
+        params.append(_like(name))
+    return [dict(row) for row in conn.execute(sql + " ORDER BY start", params)]
+
+
+def publishers(conn, tokens, name=None):
+    """Every event publisher of the matched object(s), in source order."""
+    result = []
+    for obj in find_objects(conn, tokens):
+        events = members(conn, obj["id"], ("event",), name)
+        if events:
+            result.append(dict(obj, events=events))
+    return result
+
+
+def search(conn, pattern, kind=None, limit=50):
+    """Objects and members by name (`*` wildcard, otherwise substring)."""
+    like = _like(pattern) if "*" in pattern else "%%%s%%" % pattern
+    results = []
+    if kind in (None, "object"):
+        for row in conn.execute(
+            "SELECT * FROM objects WHERE name LIKE ? ORDER BY length(name), type LIMIT ?", (like, limit)
+        ):
+            results.append(dict(row, kind="object"))
+    if kind != "object":
+        sql = (
+            "SELECT m.*, o.type AS object_type, o.number AS object_number, o.name AS object_name, o.file"
+            " FROM members m JOIN objects o ON o.id = m.object_id WHERE m.name LIKE ?"
+        )
+        params = [like]
+        if kind:
+            sql += " AND m.kind = ?"
+            params.append(kind)
+        sql += " ORDER BY length(m.name), o.type, o.number LIMIT ?"
+        results.extend(dict(row) for row in conn.execute(sql, params + [limit - len(results)]))
+    return results[:limit]
+
+
+def read_source(source, path, start, end):
+    """Bytes [start:end) of an indexed file via a read-only memory map."""
+    with open(Path(source) / path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            return mapping[start:end].decode("utf-8", "replace")
+
+
+def check_catalog(conn, root):
+    """Catalog events (BC27/events/*.md and the main catalog) missing in the source.
+
+    Returns (checked, missing) where each missing entry has the catalog
+    record plus `reason`: "event not found" when the publisher object is
+    indexed but has no such event, "object not indexed" otherwise.
+    """
+    checked, missing = 0, []
+    for catalog in event_catalog_files(root):
+        for record in parse_catalog(catalog.read_text(encoding="utf-8")):
+            if not (record["object_type"] and record["object_id"] is not None):
+                continue
+            checked += 1
+            objects = conn.execute(
+                "SELECT id FROM objects WHERE type = ? AND number = ?",
+                (record["object_type"], record["object_id"]),
+            ).fetchall()
+            reason = None
+            if not objects:
+                reason = "object not indexed"
+            elif record["object_type"] in IMPLICIT_EVENT_TYPES and IMPLICIT_EVENT_RE.match(record["name"]):
+                pass
+            elif not conn.execute(
+                "SELECT 1 FROM members WHERE object_id IN (%s) AND kind = 'event' AND name = ? COLLATE NOCASE"
+                % ", ".join("?" * len(objects)),
+                [row["id"] for row in objects] + [record["name"]],
+            ).fetchone():
+                reason = "event not found"
+            if reason:
+                missing.append(dict(record, file=rel_path(catalog, root), reason=reason))
+    return checked, missing
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def _open(args, refresh_index=False):
+    root = resolve_root(args.root)
+    conn = connect(root, args.db)
+    source = source_dir(root, args.source)
+    if refresh_index or get_meta(conn, "source") is None:
+        refresh(conn, source, jobs=getattr(args, "jobs", None))
+    return root, conn, Path(get_meta(conn, "source") or source)
+
+
+def _object_label(obj):
+    number = "" if obj["number"] is None else " %d" % obj["number"]
+    extends = ' extends "%s"' % obj["extends"] if obj["extends"] else ""
+    return '%s%s "%s"%s' % (obj["type"], number, obj["name"], extends)
+
+
+def cmd_build(args):
+    root = resolve_root(args.root)
+    source = source_dir(root, args.source)
+    start = time.perf_counter()
+    conn = connect(root, args.db)
+
+    def progress(done, total):
+        if sys.stderr.isatty() and total >= 500 and (done % 500 < CHUNK_FILES or done == total):
+            sys.stderr.write("\r[INFO] %d/%d files" % (done, total))
+            if done == total:
+                sys.stderr.write("\n")
+
+    print("[INFO] Source: %s" % source)
+    report = refresh(conn, source, force=args.force, jobs=args.jobs, progress=progress)
+    elapsed = time.perf_counter() - start
+    totals = conn.execute(
+        "SELECT (SELECT COUNT(*) FROM files), (SELECT COUNT(*) FROM objects),"
+        " (SELECT COUNT(*) FROM members WHERE kind = 'event')"
+    ).fetchone()
+    print(
+        "[SUCCESS] %d files, %d objects, %d event publishers (%d parsed, %d touched, %d unchanged,"
+        " %d removed) in %.1f s" % (
+            totals[0], totals[1], totals[2], report["parsed"], report["touched"],
+            report["unchanged"], report["removed"], elapsed,
+        )
+    )
+    return 0
+
+
+def cmd_publishers(args):
+    start = time.perf_counter()
+    _, conn, _ = _open(args, refresh_index=args.refresh)
+    result = publishers(conn, args.object, name=args.name)
+    elapsed = (time.perf_counter() - start) * 1000
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        for obj in result:
+            print("%s  %s:%d" % (_object_label(obj), obj["file"], obj["line"]))
+            for event in obj["events"]:
+                print("  [%s] %s  :%d" % (event["event_type"], event["signature"], event["line"]))
+    count = sum(len(obj["events"]) for obj in result)
+    print("%d publisher(s) in %.1f ms" % (count, elapsed), file=sys.stderr)
+    return 0 if count else 1
+
+
+def cmd_object(args):
+    _, conn, _ = _open(args, refresh_index=args.refresh)
+    objects = find_objects(conn, args.object)
+    if args.json:
+        print(json.dumps([
+            dict(obj, members=members(conn, obj["id"], args.members)) for obj in objects
+        ], indent=2))
+        return 0 if objects else 1
+    for obj in objects:
+        counts = dict(conn.execute(
+            "SELECT kind, COUNT(*) FROM members WHERE object_id = ? GROUP BY kind", (obj["id"],)
+        ).fetchall())
+        print("%s  %s:%d  bytes %d-%d" % (_object_label(obj), obj["file"], obj["line"], obj["start"], obj["end"]))
+        print("  " + ", ".join("%d %s(s)" % (counts[k], k) for k in sorted(counts)) if counts else "  (no members)")
+        for member in members(conn, obj["id"], args.members) if args.members else ():
+            prefix = "[%s] " % member["event_type"] if member["event_type"] else ""
+            print("  %s%s  :%d" % (prefix, member["signature"], member["line"]))
+    if not objects:
+        print("[ERROR] No object matches: %s" % " ".join(args.object), file=sys.stderr)
+    return 0 if objects else 1
+
+
+def cmd_find(args):
+    start = time.perf_counter()
+    _, conn, _ = _open(args, refresh_index=args.refresh)
+    results = search(conn, args.pattern, kind=args.kind, limit=args.limit)
+    elapsed = (time.perf_counter() - start) * 1000
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for row in results:
+            if row["kind"] == "object":
+                print("%-9s %s  %s:%d" % ("object", _object_label(row), row["file"], row["line"]))
+            else:
+                owner = {"type": row["object_type"], "number": row["object_number"],
+                         "name": row["object_name"], "extends": None}
+                print("%-9s %s  in %s  %s:%d" % (row["kind"], row["signature"], _object_label(owner),
+                                                  row["file"], row["line"]))
+    print("%d match(es) in %.1f ms" % (len(results), elapsed), file=sys.stderr)
+    return 0 if results else 1
+
+
+def cmd_source(args):
+    _, conn, source = _open(args, refresh_index=args.refresh)
+    objects = find_objects(conn, args.object, limit=1)
+    if not objects:
+        print("[ERROR] No object matches: %s" % " ".join(args.object), file=sys.stderr)
+        return 1
+    obj = objects[0]
+    start, end = obj["start"], obj["end"]
+    if args.member:
+        found = members(conn, obj["id"], name=args.member)
+        if not found:
+            print("[ERROR] %s has no member '%s'" % (_object_label(obj), args.member), file=sys.stderr)
+            return 1
+        start = found[0]["start"]
+        following = conn.execute(
+            "SELECT MIN(start) FROM members WHERE object_id = ? AND start > ?", (obj["id"], start)
+        ).fetchone()[0]
+        end = following or obj["end"]
+    lines = read_source(source, obj["file"], start, end).splitlines()
+    # A member runs to the next member; drop that member's attributes
+    while args.member and lines and (not lines[-1].strip() or lines[-1].lstrip().startswith("[")):
+        lines.pop()
+    print("\n".join(lines[:args.lines] if args.lines else lines))
+    if args.lines and len(lines) > args.lines:
+        print("... (%d more lines, use --lines 0 for all)" % (len(lines) - args.lines))
+    return 0
+
+
+def cmd_check_catalog(args):
+    root, conn, _ = _open(args, refresh_index=args.refresh)
+    checked, missing = check_catalog(conn, root)
+    if args.json:
+        print(json.dumps({"checked": checked, "missing": missing}, indent=2))
+        return 1 if missing else 0
+    not_indexed = [r for r in missing if r["reason"] == "object not indexed"]
+    for record in missing:
+        if record["reason"] == "event not found" or args.verbose:
+            print(
+                "[WARNING] %s:%d %s - %s (%s)"
+                % (record["file"], record["line"], record["name"], record["publisher"], record["reason"])
+            )
+    if not_indexed and not args.verbose:
+        objects = sorted({r["publisher"] for r in not_indexed})
+        print(
+            "[INFO] %d event(s) on %d publisher object(s) outside the indexed source (-v to list)"
+            % (len(not_indexed), len(objects))
+        )
+    if len(missing) > len(not_indexed):
+        print(
+            "[ERROR] %d of %d catalog events do not exist in their publisher object"
+            % (len(missing) - len(not_indexed), checked)
+        )
+        return 1
+    print("[SUCCESS] %d of %d catalog events verified in the AL source" % (checked - len(not_indexed), checked))
+    return 0
+
+
+def cmd_stats(args):
+    _, conn, source = _open(args)
+    print("Source: %s" % source)
+    for row in conn.execute(
+        "SELECT module, COUNT(*) AS files, SUM(object_count) AS objects, SUM(size) AS bytes"
+        " FROM files GROUP BY module ORDER BY files DESC"
+    ):
+        print("%-35s %6d files %7d objects %8.1f MB" % (row["module"], row["files"], row["objects"], row["bytes"] / 1e6))
+    for row in conn.execute("SELECT kind, COUNT(*) FROM members GROUP BY kind ORDER BY kind"):
+        print("%-35s %6d" % (row[0], row[1]))
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Indexed lookup over the local AL base-app source")
+    parser.add_argument("--root", help="Project root containing BC27/ (default: this template)")
+    parser.add_argument("--source", help="AL symbols folder (default: see 005-bc-symbols.mdc)")
+    parser.add_argument("--db", help="Index file (default: BC27/.index/symbols.sqlite3)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Build or incrementally refresh the symbol index")
+    build.add_argument("--force", action="store_true", help="Re-parse every file")
+    build.add_argument("--jobs", type=int, help="Worker processes (default: CPU count)")
+    build.set_defaults(func=cmd_build)
+
+    pubs = sub.add_parser("publishers", help="Event publishers of an object with exact signatures")
+    pubs.add_argument("object", nargs="+", help="e.g. Codeunit 7312")
+    pubs.add_argument("--name", help="Filter event names (* wildcard)")
+    pubs.set_defaults(func=cmd_publishers)
+
+    obj = sub.add_parser("object", help="Object location, byte range and members")
+    obj.add_argument("object", nargs="+", help='e.g. Table 36, 7312, "Sales Header"')
+    obj.add_argument("--members", nargs="*", choices=("field", "value", "procedure", "event"),
+                     help="List members of these kinds (all when given without values)")
+    obj.set_defaults(func=cmd_object)
+
+    find = sub.add_parser("find", help="Find objects and members by name")
+    find.add_argument("pattern")
+    find.add_argument("--kind", choices=("object", "field", "value", "procedure", "event"))
+    find.add_argument("--limit", type=int, default=50)
+    find.set_defaults(func=cmd_find)
+
+    src = sub.add_parser("source", help="Print an object or member straight from the source file")
+    src.add_argument("object", nargs="+")
+    src.add_argument("--member", help="Procedure/event/field name (* wildcard)")
+    src.add_argument("--lines", type=int, default=60, help="Max lines to print (0 = all)")
+    src.set_defaults(func=cmd_source)
+
+    check = sub.add_parser("check-catalog", help="Flag BC27 catalog events missing in the AL source")
+    check.add_argument("-v", "--verbose", action="store_true", help="Also list events on objects not indexed")
+    check.set_defaults(func=cmd_check_catalog)
+
+    stats = sub.add_parser("stats", help="Indexed files, objects and members per module")
+    stats.set_defaults(func=cmd_stats)
+
+    for command in (pubs, obj, find, src, check):
+        command.add_argument("--refresh", action="store_true", help="Refresh the index before the lookup")
+        if command is not src:
+            command.add_argument("--json", action="store_true", help="Machine-readable output")
+
+    args = parser.parse_args(argv)
+    if args.command == "object" and args.members == []:
+        args.members = ["field", "value", "procedure", "event"]
+    try:
+        return args.func(args)
+    except (FileNotFoundError, ValueError) as exc:
+        print("[ERROR] %s" % exc, file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,14 @@
 # BC26 Development Template - Auto Installation Script (PowerShell)
 # Installs .cursor rules, .claude commands, hooks, and configuration files
 # Usage: .\install-rules.ps1 -TargetDirectory "C:\Path\To\Project" -ProjectPrefix "ABC" [-RepoUrl "https://..."]
+#        .\install-rules.ps1 -TargetDirectory "C:\Path\To\Project" -Update [-ProjectPrefix "ABC"] [-Force] [-DryRun]
+#        .\install-rules.ps1 -TargetDirectory "C:\Path\To\Workspace" -Batch [-DryRun]   (all app.json projects, parallel)
 
 param(
     [Parameter(Mandatory = $true, HelpMessage = "Path to your AL project")]
     [string]$TargetDirectory,
 
-    [Parameter(Mandatory = $true, HelpMessage = "3-letter customer prefix (e.g., CON for Contoso)")]
+    [Parameter(Mandatory = $false, HelpMessage = "3-letter customer prefix (e.g., CON for Contoso)")]
     [ValidatePattern('^[A-Z]{3}$')]
     [string]$ProjectPrefix,
 
@@ -14,7 +16,19 @@ param(
     [string]$RepoUrl = "",
 
     [Parameter(Mandatory = $false, HelpMessage = "Git branch to clone (default: main)")]
-    [string]$RepoBranch = "main"
+    [string]$RepoBranch = "main",
+
+    [Parameter(Mandatory = $false, HelpMessage = "Incremental update: copy only changed template files")]
+    [switch]$Update,
+
+    [Parameter(Mandatory = $false, HelpMessage = "Update every app.json project under TargetDirectory in parallel")]
+    [switch]$Batch,
+
+    [Parameter(Mandatory = $false, HelpMessage = "With -Update/-Batch: overwrite local modifications")]
+    [switch]$Force,
+
+    [Parameter(Mandatory = $false, HelpMessage = "With -Update/-Batch: only report what would change")]
+    [switch]$DryRun
 )
 
 $ErrorActionPreference = "Stop"
@@ -29,6 +43,29 @@ function Write-Success { param([string]$Message) Write-Host "[SUCCESS] $Message"
 function Write-Warning { param([string]$Message) Write-Host "[WARNING] $Message" -ForegroundColor Yellow }
 function Write-ErrorMsg { param([string]$Message) Write-Host "[ERROR] $Message" -ForegroundColor Red }
 
+# Update modes: hand off to the manifest-driven updater (non-interactive)
+if ($Update -or $Batch) {
+    $Python = Get-Command python3, python -ErrorAction SilentlyContinue | Select-Object -First 1
+    if (-not $Python) {
+        Write-ErrorMsg "Python 3 is required for -Update/-Batch (or run a full install without them)"
+        exit 1
+    }
+    $SyncArgs = @((Join-Path $ScriptDir "template_sync.py"), "--template", $TemplateDir)
+    $SyncArgs += if ($Batch) { "batch" } else { "update" }
+    $SyncArgs += $TargetDirectory
+    if ($ProjectPrefix) { $SyncArgs += @("--prefix", $ProjectPrefix) }
+    if ($Force) { $SyncArgs += "--force" }
+    if ($DryRun) { $SyncArgs += "--dry-run" }
+    Write-Info "Template: $TemplateDir"
+    & $Python.Source @SyncArgs
+    exit $LASTEXITCODE
+}
+
+if (-not $ProjectPrefix) {
+    Write-ErrorMsg "ProjectPrefix is required for a full install (e.g., -ProjectPrefix CON)"
+    exit 1
+}
+
 # Resolve target directory
 $TargetDirectory = Resolve-Path -Path $TargetDirectory -ErrorAction SilentlyContinue
 
@@ -247,25 +284,21 @@ if (Test-Path $SourceGitIgnore) {
         # Merge existing .gitignore with template (add missing patterns)
         Write-Info "Merging with existing .gitignore..."
         
-        # Extract patterns from template that don't exist in existing file
-        $templateLines = Get-Content $SourceGitIgnore | Where-Object { $_ -notmatch '^\s*$' -and $_ -notmatch '^\s*#' }
-        $existingLines = Get-Content $TargetGitIgnore | Where-Object { $_ -notmatch '^\s*$' -and $_ -notmatch '^\s*#' }
-        
-        $missingPatterns = @()
-        foreach ($line in $templateLines) {
+        # Extract patterns from template that don't exist in existing file (set lookup)
+        $existingSet = [System.Collections.Generic.HashSet[string]]::new()
+        foreach ($line in (Get-Content $TargetGitIgnore)) { [void]$existingSet.Add($line.Trim()) }
+
+        $missingPatterns = [System.Collections.Generic.List[string]]::new()
+        foreach ($line in (Get-Content $SourceGitIgnore)) {
             $pattern = $line.Trim()
-            if ($pattern -and $pattern -notmatch '^#' -and $existingLines -notcontains $pattern) {
-                $missingPatterns += $pattern
+            if ($pattern -and -not $pattern.StartsWith('#') -and $existingSet.Add($pattern)) {
+                $missingPatterns.Add($pattern)
             }
         }
-        
+
         if ($missingPatterns.Count -gt 0) {
-            # Append missing patterns
-            Add-Content -Path $TargetGitIgnore -Value ""
-            Add-Content -Path $TargetGitIgnore -Value "# Added by BC27 Template installer"
-            foreach ($pattern in $missingPatterns) {
-                Add-Content -Path $TargetGitIgnore -Value $pattern
-            }
+            # Append missing patterns (one write)
+            Add-Content -Path $TargetGitIgnore -Value (@("", "# Added by BC27 Template installer") + $missingPatterns)
             Write-Success "Updated .gitignore with $($missingPatterns.Count) missing patterns at $TargetGitIgnore"
         }
         else {
@@ -309,16 +342,34 @@ if (Test-Path $SourceBC27) {
     Write-Success "Copied BC27\ documentation ($FileCount files)"
 }
 
+# Copy BC27 documentation tools (Python, standard library only)
+$SourceTools = Get-ChildItem -Path (Join-Path $TemplateDir "scripts") -Filter "bc27_*.py" -ErrorAction SilentlyContinue
+if ($SourceTools) {
+    $TargetTools = Join-Path $TargetDirectory ".claude\tools"
+    if (-not (Test-Path $TargetTools)) {
+        New-Item -ItemType Directory -Path $TargetTools -Force | Out-Null
+    }
+    $SourceTools | Copy-Item -Destination $TargetTools -Force
+    Write-Success "Copied BC27 tools to .claude\tools\ ($($SourceTools.Count) files)"
+}
+
 # Step 5: Replace ABC prefix with project prefix
 Write-Info "Replacing ABC prefix with $ProjectPrefix in all files..."
 
 # Function to replace text in file
+# Byte-for-byte like template_sync.py render (and sed on Linux/macOS): exact,
+# case-sensitive .Replace() and UTF-8 without an added BOM, so the hashes
+# recorded by the manifest snapshot below match the installed files
 function Replace-InFile {
     param([string]$FilePath, [string]$Find, [string]$Replace)
 
-    $content = Get-Content $FilePath -Raw -Encoding UTF8
-    $content = $content -replace $Find, $Replace
-    Set-Content -Path $FilePath -Value $content -Encoding UTF8 -NoNewline
+    $Utf8NoBom = New-Object System.Text.UTF8Encoding $false
+    $bytes = [System.IO.File]::ReadAllBytes($FilePath)
+    $content = $Utf8NoBom.GetString($bytes)  # a BOM already in the file is kept as U+FEFF
+    $updated = $content.Replace($Find, $Replace)
+    if ($updated -cne $content) {
+        [System.IO.File]::WriteAllBytes($FilePath, $Utf8NoBom.GetBytes($updated))
+    }
 }
 
 # Find all relevant files and replace ABC with project prefix
@@ -341,6 +392,20 @@ if (Test-Path $AgentsMdPath) {
 
 Write-Success "Prefix replacement complete (ABC → $ProjectPrefix)"
 
+# Record installed files in .cursor\template-manifest.json so later
+# -Update runs copy only changed files and keep local modifications
+$Python = Get-Command python3, python -ErrorAction SilentlyContinue | Select-Object -First 1
+$SyncScript = Join-Path $ScriptDir "template_sync.py"
+if ($Python -and (Test-Path $SyncScript)) {
+    & $Python.Source $SyncScript --template $TemplateDir snapshot $TargetDirectory --prefix $ProjectPrefix | Out-Null
+    if ($LASTEXITCODE -eq 0) {
+        Write-Success "Recorded template manifest (.cursor\template-manifest.json)"
+    }
+    else {
+        Write-Warning "Could not record template manifest; -Update will treat differing files as local edits"
+    }
+}
+
 # Step 6: Install hooks to user's home directory
 Write-Info "Installing Cursor hooks..."
 
@@ -461,7 +526,7 @@ Write-Host "   • .claudeignore / .cursorignore - Exclude ~50% of files from AI
 Write-Host "   • Token savings: 60-96% for typical AI code assistant queries"
 Write-Host ""
 Write-Host "⚡ Hooks active:" -ForegroundColor Blue
-Write-Host "   • after-file-edit.ps1 - ESC validation"
+Write-Host "   • hook_client.py → hook_daemon.py - ESC validation, file & shell safety (warm daemon)"
 Write-Host "   • before-read-file.ps1 - Security (blocks sensitive files)"
 Write-Host "   • before-shell-execution.ps1 - Safety (prevents dangerous commands)"
 Write-Host "   • after-agent-response.ps1 - Usage analytics"
@@ -3,6 +3,8 @@
 # BC26 Development Template - Auto Installation Script
 # Installs .cursor rules, .claude commands, hooks, and configuration files
 # Usage: ./install-rules.sh <target_directory> <project_prefix> [repo_url]
+#        ./install-rules.sh --update <target_directory> [project_prefix]   (incremental, manifest-driven)
+#        ./install-rules.sh --batch <workspace> [project_prefix]           (all app.json projects, parallel)
 
 set -e
 
@@ -39,9 +41,55 @@ show_usage() {
     echo "  $0 . ABC https://github.com/yourorg/ProjectTemplate.git"
     echo "  $0 . ABC https://github.com/yourorg/ProjectTemplate.git develop"
     echo ""
+    echo "Update modes (non-interactive, Python 3 required):"
+    echo "  $0 --update <target_directory> [project_prefix]  Copy only changed template files"
+    echo "  $0 --batch <workspace> [project_prefix]          Update every app.json project in parallel"
+    echo "  Add --force to overwrite local modifications, --dry-run to only report changes."
+    echo "  Locally modified files are kept; the template version is written as <file>.template-new"
+    echo ""
     exit 1
 }
 
+# Parse options (positional arguments keep their original order)
+MODE="install"
+SYNC_ARGS=()
+POSITIONAL=()
+for arg in "$@"; do
+    case "$arg" in
+        --update) MODE="update" ;;
+        --batch) MODE="batch" ;;
+        --force|--dry-run|--verbose) SYNC_ARGS+=("$arg") ;;
+        -h|--help) show_usage ;;
+        -*)
+            print_error "Unknown option: $arg"
+            show_usage
+            ;;
+        *) POSITIONAL+=("$arg") ;;
+    esac
+done
+set -- "${POSITIONAL[@]}"
+
+# Update modes: hand off to the manifest-driven updater
+if [ "$MODE" != "install" ]; then
+    if [ $# -lt 1 ]; then
+        show_usage
+    fi
+    PYTHON_BIN="$(command -v python3 || command -v python || true)"
+    if [ -z "$PYTHON_BIN" ]; then
+        print_error "Python 3 is required for --update/--batch (or run a full install without them)"
+        exit 1
+    fi
+    if [ -n "${2:-}" ]; then
+        if [[ ! "$2" =~ ^[A-Z]{3}$ ]]; then
+            print_error "Project prefix must be exactly 3 uppercase letters (e.g., CON, ABC, FAB)"
+            exit 1
+        fi
+        SYNC_ARGS+=(--prefix "$2")
+    fi
+    print_info "Template: $TEMPLATE_DIR"
+    exec "$PYTHON_BIN" "$SCRIPT_DIR/template_sync.py" --template "$TEMPLATE_DIR" "$MODE" "$1" "${SYNC_ARGS[@]}"
+fi
+
 # Check arguments
 if [ $# -lt 2 ]; then
     show_usage
@@ -265,31 +313,24 @@ if [ -f "$TEMPLATE_DIR/.gitignore.template" ]; then
         # Merge existing .gitignore with template (add missing patterns)
         print_info "Merging with existing .gitignore..."
         
-        # Check which patterns are missing
+        # Collect missing patterns in one pass (set lookup instead of a grep per line)
+        MISSING_PATTERNS=$(awk '
+            { gsub(/^[ \t]+|[ \t]+$/, "") }
+            FILENAME == ARGV[1] { have[$0] = 1; next }
+            $0 == "" || /^#/ || ($0 in have) { next }
+            { have[$0] = 1; print }
+        ' "$TARGET_DIR/.gitignore" "$TEMPLATE_DIR/.gitignore.template")
+
         MISSING_COUNT=0
-        ADDED_SECTION=0
-        
-        while IFS= read -r line; do
-            # Skip empty lines and comments
-            if [[ -z "$line" ]] || [[ "$line" =~ ^[[:space:]]*# ]]; then
-                continue
-            fi
-            
-            # Trim whitespace
-            pattern=$(echo "$line" | sed 's/^[[:space:]]*//;s/[[:space:]]*$//')
-            
-            # Check if pattern exists in target .gitignore
-            if [ -n "$pattern" ] && ! grep -qFx "$pattern" "$TARGET_DIR/.gitignore" 2>/dev/null; then
-                if [ $ADDED_SECTION -eq 0 ]; then
-                    echo "" >> "$TARGET_DIR/.gitignore"
-                    echo "# Added by BC27 Template installer" >> "$TARGET_DIR/.gitignore"
-                    ADDED_SECTION=1
-                fi
-                echo "$pattern" >> "$TARGET_DIR/.gitignore"
-                MISSING_COUNT=$((MISSING_COUNT + 1))
-            fi
-        done < "$TEMPLATE_DIR/.gitignore.template"
-        
+        if [ -n "$MISSING_PATTERNS" ]; then
+            MISSING_COUNT=$(printf '%s\n' "$MISSING_PATTERNS" | wc -l | tr -d ' ')
+            {
+                echo ""
+                echo "# Added by BC27 Template installer"
+                printf '%s\n' "$MISSING_PATTERNS"
+            } >> "$TARGET_DIR/.gitignore"
+        fi
+
         if [ $MISSING_COUNT -gt 0 ]; then
             print_success "Updated .gitignore with $MISSING_COUNT missing patterns at $TARGET_DIR/.gitignore"
         else
@@ -324,6 +365,14 @@ if [ -d "$TEMPLATE_DIR/BC27" ]; then
     print_success "Copied BC27/ documentation (${GREEN}${BC27_COUNT}${NC} files)"
 fi
 
+# Copy BC27 documentation tools (Python, standard library only)
+if ls "$TEMPLATE_DIR/scripts"/bc27_*.py >/dev/null 2>&1; then
+    mkdir -p "$TARGET_DIR/.claude/tools"
+    cp "$TEMPLATE_DIR/scripts"/bc27_*.py "$TARGET_DIR/.claude/tools/"
+    TOOLS_COUNT=$(ls -1 "$TEMPLATE_DIR/scripts"/bc27_*.py | wc -l)
+    print_success "Copied BC27 tools to .claude/tools/ (${GREEN}${TOOLS_COUNT}${NC} files)"
+fi
+
 # Step 5: Replace ABC prefix with project prefix
 print_info "Replacing ABC prefix with $PROJECT_PREFIX in all files..."
 
@@ -340,6 +389,15 @@ fi
 
 print_success "Prefix replacement complete (ABC → $PROJECT_PREFIX)"
 
+# Record installed files in .cursor/template-manifest.json so later
+# --update runs copy only changed files and keep local modifications
+PYTHON_BIN="$(command -v python3 || command -v python || true)"
+if [ -n "$PYTHON_BIN" ] && [ -f "$SCRIPT_DIR/template_sync.py" ]; then
+    "$PYTHON_BIN" "$SCRIPT_DIR/template_sync.py" --template "$TEMPLATE_DIR" snapshot "$TARGET_DIR" --prefix "$PROJECT_PREFIX" >/dev/null \
+        && print_success "Recorded template manifest (.cursor/template-manifest.json)" \
+        || print_warning "Could not record template manifest; --update will treat differing files as local edits"
+fi
+
 # Step 6: Install hooks to user's home directory
 print_info "Installing Cursor hooks..."
 
@@ -480,7 +538,7 @@ echo "   • .claudeignore / .cursorignore - Exclude ~50% of files from AI conte
 echo "   • Token savings: 60-96% for typical AI code assistant queries"
 echo ""
 echo "⚡ Hooks active:"
-echo "   • after-file-edit.ps1 - ESC validation"
+echo "   • hook_client.py → hook_daemon.py - ESC validation, file & shell safety (warm daemon)"
 echo "   • before-read-file.ps1 - Security (blocks sensitive files)"
 echo "   • before-shell-execution.ps1 - Safety (prevents dangerous commands)"
 echo "   • after-agent-response.ps1 - Usage analytics"
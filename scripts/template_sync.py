@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+Template Sync - Manifest-driven incremental install/update of the template
+
+Used by install-rules.sh / install-rules.ps1 for --update / --batch runs.
+Instead of a full `cp -r` of rules, hooks, commands, skills, memories and
+BC27 docs on every run, each installed project keeps a content-hashed
+manifest of what the installer wrote:
+
+    <project>/.cursor/template-manifest.json
+
+On update every template file is rendered (ABC -> project prefix, exactly
+like the installer's sed step), hashed and compared with the manifest and
+the file on disk:
+    - identical to the rendered template    -> skipped (no write)
+    - unchanged since the last install      -> updated
+    - edited locally                        -> kept; template version is
+                                               written next to it as
+                                               <file>.template-new
+    - removed from the template             -> deleted if unmodified
+.gitignore is merged with a set lookup (template patterns not yet present
+are appended under "# Added by BC27 Template installer").
+
+Usage:
+    python scripts/template_sync.py update <project> [--prefix CON] [--force] [--dry-run]
+    python scripts/template_sync.py batch <workspace> [--jobs 4] [--dry-run]
+    python scripts/template_sync.py snapshot <project> --prefix CON
+    python scripts/template_sync.py manifest [--json]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from bc27_common import TEMPLATE_DIR, sha256_file
+
+MANIFEST_PATH = ".cursor/template-manifest.json"
+MANIFEST_VERSION = 1
+TEMPLATE_PREFIX = "ABC"
+CONFLICT_SUFFIX = ".template-new"
+GITIGNORE_HEADER = "# Added by BC27 Template installer"
+
+# (template source, target) - mirrors the copy steps of install-rules.sh
+TREES = (
+    (".cursor/rules", ".cursor/rules"),
+    (".cursor/hooks", ".cursor/hooks"),
+    (".claude/commands", ".claude/commands"),
+    (".claude/memories", ".claude/memories"),
+    (".claude/skills", ".claude/skills"),
+    ("docs", "docs"),
+    ("BC27", "BC27"),
+)
+FILES = (
+    (".claude/settings.json", ".claude/settings.json"),
+    ("CLAUDE.md", "CLAUDE.md"),
+    (".cursorignore", ".cursorignore"),
+    (".claudeignore", ".claudeignore"),
+)
+SKIP_PARTS = {".index", "__pycache__", ".git"}
+SKIP_SUFFIXES = (".pyc", CONFLICT_SUFFIX)
+
+PREFIX_RE = re.compile(r"\*\*Prefix:\*\*\s*([A-Z]{3})\b")
+APP_JSON_DEPTH = 3
+
+
+# ============================================================================
+# TEMPLATE MANIFEST
+# ============================================================================
+
+def template_files(template_dir, project=None):
+    """Map target-relative path -> template source path."""
+    template_dir = Path(template_dir)
+    mapping = {}
+    for source, target in TREES:
+        base = template_dir / source
+        if not base.is_dir():
+            continue
+        for path in sorted(base.rglob("*")):
+            rel = path.relative_to(base)
+            if path.is_file() and not SKIP_PARTS.intersection(rel.parts) and not path.name.endswith(SKIP_SUFFIXES):
+                mapping["%s/%s" % (target, rel.as_posix())] = path
+    for source, target in FILES:
+        if (template_dir / source).is_file():
+            mapping[target] = template_dir / source
+    for path in sorted((template_dir / "scripts").glob("bc27_*.py")):
+        mapping[".claude/tools/%s" % path.name] = path
+    # src/AGENTS.md only goes into projects that have a src/ folder
+    agents = template_dir / "src" / "AGENTS.md"
+    if agents.is_file() and (project is None or (Path(project) / "src").is_dir()):
+        mapping["src/AGENTS.md"] = agents
+    return mapping
+
+
+def needs_prefix(target):
+    """Same file set the installer's sed/Replace-InFile step rewrites."""
+    if target in ("CLAUDE.md", "src/AGENTS.md"):
+        return True
+    return target.startswith((".cursor/", ".claude/")) and target.endswith((".mdc", ".md", ".json"))
+
+
+def render(source, target, prefix):
+    data = Path(source).read_bytes()
+    if prefix != TEMPLATE_PREFIX and needs_prefix(target):
+        data = data.replace(TEMPLATE_PREFIX.encode("ascii"), prefix.encode("ascii"))
+    return data
+
+
+def template_manifest(template_dir):
+    """Content hashes of the template itself (what `manifest` prints)."""
+    return {target: sha256_file(source) for target, source in template_files(template_dir).items()}
+
+
+# ============================================================================
+# PROJECT MANIFEST
+# ============================================================================
+
+def load_manifest(project):
+    try:
+        data = json.loads((Path(project) / MANIFEST_PATH).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if data.get("version") == MANIFEST_VERSION else {}
+
+
+def save_manifest(project, prefix, files):
+    path = Path(project) / MANIFEST_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {"version": MANIFEST_VERSION, "prefix": prefix, "files": dict(sorted(files.items()))}
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, indent=1) + "\n", encoding="utf-8")
+    os.replace(str(tmp), str(path))
+
+
+def detect_prefix(project, manifest=None):
+    """Prefix recorded by the last install, else from 000-project-overview.mdc."""
+    if manifest and manifest.get("prefix"):
+        return manifest["prefix"]
+    overview = Path(project) / ".cursor" / "rules" / "000-project-overview.mdc"
+    try:
+        match = PREFIX_RE.search(overview.read_text(encoding="utf-8"))
+    except OSError:
+        return None
+    return match.group(1) if match else None
+
+
+def _disk_sha(path, entry):
+    """Hash of the file on disk; the mtime/size fast path skips re-hashing."""
+    stat = path.stat()
+    if entry and entry.get("mtime_ns") == stat.st_mtime_ns and entry.get("size") == stat.st_size:
+        return entry["sha256"], stat
+    return sha256_file(path), stat
+
+
+def _drop_conflict_copy(path):
+    """Remove a <file>.template-new left by an earlier run once it is resolved."""
+    stale = Path(str(path) + CONFLICT_SUFFIX)
+    if stale.exists():
+        stale.unlink()
+
+
+def _entry(sha, stat):
+    return {"sha256": sha, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+# ============================================================================
+# UPDATE
+# ============================================================================
+
+def merge_gitignore(template_dir, project, dry_run=False):
+    """Append template patterns missing from the project's .gitignore. Returns count."""
+    source = Path(template_dir) / ".gitignore.template"
+    target = Path(project) / ".gitignore"
+    if not source.is_file():
+        return 0
+    patterns = [line.strip() for line in source.read_text(encoding="utf-8").splitlines()]
+    patterns = [p for p in patterns if p and not p.startswith("#")]
+    if not target.is_file():
+        if not dry_run:
+            target.write_bytes(source.read_bytes())
+        return len(patterns)
+    existing = {line.strip() for line in target.read_text(encoding="utf-8").splitlines()}
+    missing = []
+    for pattern in patterns:
+        if pattern not in existing:
+            missing.append(pattern)
+            existing.add(pattern)
+    if missing and not dry_run:
+        with open(target, "a", encoding="utf-8") as handle:
+            handle.write("\n%s\n%s\n" % (GITIGNORE_HEADER, "\n".join(missing)))
+    return len(missing)
+
+
+def update_project(project, template_dir=TEMPLATE_DIR, prefix=None, force=False, dry_run=False):
+    """Bring one project up to date with the template. Returns a report dict."""
+    start = time.perf_counter()
+    project = Path(project).resolve()
+    manifest = load_manifest(project)
+    prefix = prefix or detect_prefix(project, manifest)
+    if not prefix:
+        raise ValueError("%s: no prefix recorded or found in 000-project-overview.mdc (use --prefix)" % project)
+    known = manifest.get("files", {}) if manifest.get("prefix") == prefix else {}
+
+    report = {"project": str(project), "prefix": prefix, "added": [], "updated": [], "unchanged": [],
+              "conflicts": [], "removed": [], "kept": [], "gitignore": 0}
+    files = {}
+    mapping = template_files(template_dir, project)
+    for target, source in mapping.items():
+        data = render(source, target, prefix)
+        new_sha = hashlib.sha256(data).hexdigest()
+        path = project / target
+        entry = known.get(target)
+
+        if not path.exists():
+            action = "added"
+        else:
+            disk_sha, stat = _disk_sha(path, entry)
+            if disk_sha == new_sha:
+                report["unchanged"].append(target)
+                files[target] = _entry(new_sha, stat)
+                if not dry_run:
+                    _drop_conflict_copy(path)
+                continue
+            locally_modified = entry is None or entry["sha256"] != disk_sha
+            if locally_modified and not force:
+                report["conflicts"].append(target)
+                if not dry_run:
+                    Path(str(path) + CONFLICT_SUFFIX).write_bytes(data)
+                if entry:
+                    files[target] = entry  # keep the last installed baseline
+                continue
+            action = "updated"
+
+        report[action].append(target)
+        if dry_run:
+            continue
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        _drop_conflict_copy(path)
+        files[target] = _entry(new_sha, path.stat())
+
+    # Files the template no longer ships
+    for target in sorted(set(known) - set(mapping)):
+        path = project / target
+        if not path.exists():
+            continue
+        disk_sha, _ = _disk_sha(path, known[target])
+        if disk_sha == known[target]["sha256"] or force:
+            report["removed"].append(target)
+            if not dry_run:
+                path.unlink()
+        else:
+            report["kept"].append(target)
+
+    report["gitignore"] = merge_gitignore(template_dir, project, dry_run)
+    if not dry_run:
+        save_manifest(project, prefix, files)
+    report["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return report
+
+
+def snapshot(project, prefix, template_dir=TEMPLATE_DIR):
+    """Record installed template files after a full install (no copying)."""
+    project = Path(project).resolve()
+    files = {}
+    for target, source in template_files(template_dir, project).items():
+        path = project / target
+        if path.is_file():
+            sha = sha256_file(path)
+            if sha == hashlib.sha256(render(source, target, prefix)).hexdigest():
+                files[target] = _entry(sha, path.stat())
+    save_manifest(project, prefix, files)
+    return len(files)
+
+
+def find_projects(workspace, depth=APP_JSON_DEPTH):
+    """Folders with an app.json, up to `depth` levels below the workspace (like find -maxdepth)."""
+    workspace = Path(workspace).resolve()
+    projects = []
+    for dirpath, dirnames, filenames in os.walk(workspace):
+        rel_depth = len(Path(dirpath).relative_to(workspace).parts)
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith(".") and d != "node_modules")
+        if rel_depth >= depth - 1:
+            dirnames[:] = []
+        if "app.json" in filenames:
+            projects.append(Path(dirpath))
+    return projects
+
+
+def update_batch(workspace, template_dir=TEMPLATE_DIR, prefix=None, force=False, dry_run=False, jobs=None):
+    """Update every app.json project in parallel (file copying is I/O bound: threads)."""
+    projects = find_projects(workspace)
+
+    def run(project):
+        try:
+            return update_project(project, template_dir, prefix, force, dry_run)
+        except (OSError, ValueError) as exc:
+            return {"project": str(project), "error": str(exc)}
+
+    with ThreadPoolExecutor(max_workers=jobs or min(8, len(projects) or 1)) as pool:
+        return list(pool.map(run, projects))
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def format_report(report, verbose=False):
+    if "error" in report:
+        return "[ERROR] %s" % report["error"]
+    counts = ", ".join("%d %s" % (len(report[key]), key)
+                       for key in ("added", "updated", "removed", "conflicts") if report[key])
+    lines = ["[SUCCESS] %s (%s): %s, %d unchanged, %d .gitignore pattern(s), %.0f ms" % (
+        report["project"], report["prefix"], counts or "up to date", len(report["unchanged"]),
+        report["gitignore"], report["elapsed_ms"])]
+    for target in report["conflicts"]:
+        lines.append("[WARNING]   modified locally, kept: %s (template version: %s%s)"
+                     % (target, target, CONFLICT_SUFFIX))
+    for target in report["kept"]:
+        lines.append("[WARNING]   removed from template but modified locally, kept: %s" % target)
+    if verbose:
+        for key in ("added", "updated", "removed"):
+            lines.extend("[INFO]   %s: %s" % (key, target) for target in report[key])
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manifest-driven incremental template install/update")
+    parser.add_argument("--template", default=str(TEMPLATE_DIR), help="Template checkout (default: this repo)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    for name, help_text in (("update", "Update one project"), ("batch", "Update every app.json project in a workspace")):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("target")
+        p.add_argument("--prefix", help="Project prefix (default: from the project's manifest or rules)")
+        p.add_argument("--force", action="store_true", help="Overwrite local modifications")
+        p.add_argument("--dry-run", action="store_true", help="Report what would change, write nothing")
+        p.add_argument("--verbose", "-v", action="store_true")
+        p.add_argument("--json", action="store_true")
+        if name == "batch":
+            p.add_argument("--jobs", "-j", type=int, help="Projects updated in parallel (default: up to 8)")
+
+    snap = sub.add_parser("snapshot", help="Record a full install in the project manifest")
+    snap.add_argument("target")
+    snap.add_argument("--prefix", required=True)
+
+    man = sub.add_parser("manifest", help="Print content hashes of the template")
+    man.add_argument("--json", action="store_true")
+
+    args = parser.parse_args(argv)
+    if args.command == "manifest":
+        manifest = template_manifest(args.template)
+        if args.json:
+            print(json.dumps(manifest, indent=1))
+        else:
+            digest = hashlib.sha256(json.dumps(manifest, sort_keys=True).encode("utf-8")).hexdigest()
+            print("%s  %d files" % (digest, len(manifest)))
+        return 0
+    if args.command == "snapshot":
+        count = snapshot(args.target, args.prefix, args.template)
+        print("[SUCCESS] Recorded %d template files in %s" % (count, MANIFEST_PATH))
+        return 0
+
+    try:
+        if args.command == "update":
+            reports = [update_project(args.target, args.template, args.prefix, args.force, args.dry_run)]
+        else:
+            reports = update_batch(args.target, args.template, args.prefix, args.force, args.dry_run, args.jobs)
+            if not reports:
+                print("[WARNING] No app.json projects found under %s" % args.target)
+                return 1
+    except ValueError as exc:
+        print("[ERROR] %s" % exc, file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        for report in reports:
+            print(format_report(report, args.verbose))
+    return 1 if any("error" in report for report in reports) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
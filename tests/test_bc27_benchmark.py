@@ -0,0 +1,124 @@
+"""Benchmark corpus: per-query without-tools load sets, baseline and report checks."""
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import bc27_benchmark  # noqa: E402
+
+CATALOG = """# Event Catalog
+
+## Sales
+
+#### OnAlphaPost
+Alpha widget posting with a long explanation of the alpha widget.
+
+#### OnBetaPost
+Beta gadget posting with a long explanation of the beta gadget.
+"""
+
+WAREHOUSE = """# Warehouse Events
+
+#### OnGammaPick
+Gamma crate picking with a long explanation of the gamma crate.
+"""
+
+GUIDE = "# Guide\n\n%s\n%s\n\nMore text.\n" % (bc27_benchmark.REPORT_BEGIN, bc27_benchmark.REPORT_END)
+
+LOAD = [bc27_benchmark.EVENT_RULE, bc27_benchmark.QUICKREF]
+CORPUS = (
+    {"query": "alpha widget", "load": LOAD, "answer": ["OnAlphaPost"]},
+    {"query": "beta gadget", "load": LOAD, "answer": ["OnBetaPost"]},
+    {"query": "gamma crate", "load": LOAD, "answer": ["OnGammaPick"]},
+)
+
+
+class BenchmarkTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.write("CLAUDE.md", "Project context.\n")
+        self.write(bc27_benchmark.EVENT_RULE, "# Event Discovery\n\nCheck the catalogs.\n")
+        self.write(bc27_benchmark.QUICKREF, "# Quick Reference\n\n| Sales | OnAlphaPost |\n")
+        self.write(bc27_benchmark.EVENT_INDEX, "# Event Index\n\n- OnAlphaPost\n- OnBetaPost\n")
+        self.write(bc27_benchmark.MAIN_CATALOG, CATALOG)
+        self.write("BC27/events/BC27_EVENTS_WAREHOUSE.md", WAREHOUSE)
+        self.write(str(bc27_benchmark.GUIDE_FILE), GUIDE)
+        patcher = mock.patch.object(bc27_benchmark, "CORPUS", CORPUS)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write(self, rel, text):
+        path = self.root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def main(self, *args):
+        with contextlib.redirect_stdout(io.StringIO()) as out, contextlib.redirect_stderr(io.StringIO()):
+            code = bc27_benchmark.main(["--root", str(self.root)] + list(args))
+        return code, out.getvalue()
+
+    def test_each_query_gets_its_own_without_tools_load_set(self):
+        result = bc27_benchmark.run_benchmark(self.root, repeat=1)
+        queries = {q["query"]: q for q in result["queries"]}
+        for query in queries.values():
+            self.assertEqual(query["problems"], [])
+        quickref, index, rule, main = (bc27_benchmark.QUICKREF, bc27_benchmark.EVENT_INDEX,
+                                       bc27_benchmark.EVENT_RULE, bc27_benchmark.MAIN_CATALOG)
+        self.assertEqual(queries["alpha widget"]["manual_files"], [quickref, main])
+        self.assertEqual(queries["beta gadget"]["manual_files"], [quickref, index, main])
+        self.assertEqual(queries["gamma crate"]["manual_files"],
+                         [quickref, index, rule, main, "BC27/events/BC27_EVENTS_WAREHOUSE.md"])
+        self.assertLess(queries["alpha widget"]["whole_file_tokens"], queries["beta gadget"]["whole_file_tokens"])
+        self.assertEqual(queries["gamma crate"]["sections"], ["BC27/events/BC27_EVENTS_WAREHOUSE.md#ongammapick"])
+
+    def test_undocumented_answer_is_a_problem(self):
+        corpus = ({"query": "alpha widget", "load": [bc27_benchmark.QUICKREF], "answer": ["OnMissing"]},)
+        with mock.patch.object(bc27_benchmark, "CORPUS", corpus):
+            code, _ = self.main("run", "--update-baseline", "--repeat", "1")
+        self.assertEqual(code, 1)
+        self.assertFalse((self.root / bc27_benchmark.BASELINE_FILE).exists())
+
+    def test_run_fails_when_a_loaded_file_grows(self):
+        self.assertEqual(self.main("run", "--update-baseline", "--repeat", "1")[0], 0)
+        self.assertEqual(self.main("run", "--repeat", "1")[0], 0)
+
+        self.write(bc27_benchmark.EVENT_RULE, "# Event Discovery\n\n" + "Check the catalogs.\n" * 200)
+        code, output = self.main("run", "--repeat", "1", "--json")
+        self.assertEqual(code, 1)
+        errors = json.loads(output)["errors"]
+        self.assertEqual(len(errors), 3)
+        self.assertIn("tier 2", errors[0])
+
+    def test_report_check_detects_stale_report(self):
+        self.assertEqual(self.main("report", "--check")[0], 1)  # markers still empty
+        self.assertEqual(self.main("report", "--write")[0], 0)
+        code, output = self.main("report", "--check")
+        self.assertEqual(code, 0)
+        self.assertIn("up to date", output)
+        guide = (self.root / bc27_benchmark.GUIDE_FILE).read_text(encoding="utf-8")
+        self.assertIn("`%s`" % bc27_benchmark.MAIN_CATALOG, guide)
+        self.assertTrue(guide.endswith("More text.\n"))
+
+        self.write(bc27_benchmark.MAIN_CATALOG, CATALOG + "\n#### OnDeltaPost\nDelta.\n")
+        code, output = self.main("report", "--check")
+        self.assertEqual(code, 1)
+        self.assertIn("out of date", output)
+
+        self.write(str(bc27_benchmark.GUIDE_FILE), "# Guide without markers\n")
+        self.assertEqual(self.main("report", "--check")[0], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+"""Dependency graph: bitset closure, cycle detection and the check command."""
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import bc27_dependencies  # noqa: E402
+
+OVERVIEW = """# Modules Overview
+
+## 1. CORE MODULES
+
+### BaseApp
+- **Path**: `/BaseApp/`
+- **Dependencies**: None (foundation layer)
+
+### Alpha
+- **Path**: `/Alpha/`
+- **Dependencies**: BaseApp
+
+## 2. EXTENSION MODULES
+
+### Beta (Beta Extension Module)
+- **Path**: `/BetaExt/`
+- **Dependencies**: Alpha
+
+### Gamma
+- **Path**: `/Gamma/`
+- **Dependencies**: Beta, Graph API
+
+### Delta
+- **Path**: `/Delta/`
+- **Dependencies**: None
+"""
+
+# Alpha ⤳ Gamma closes Alpha -> Beta -> Gamma into a cycle once optional
+# edges are followed; "requires" alone stays acyclic
+REFERENCE = """# Dependency Reference
+
+## Core Foundation Dependencies
+
+```
+Delta
+    → BaseApp
+```
+
+## Dependency Groups
+
+- Alpha ⤳ Gamma
+- Delta ≈ Alpha
+
+## Dependency Matrix
+
+| Module | Depends On |
+|--------|------------|
+| Delta | BaseApp |
+"""
+
+CLEAN_REFERENCE = REFERENCE.replace("- Alpha ⤳ Gamma\n", "")
+DANGLING_REFERENCE = CLEAN_REFERENCE + "| Zeta | BaseApp |\n"
+
+REQUIRES = bc27_dependencies.edge_mask("requires")
+
+
+class DependencyGraphTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.write(bc27_dependencies.OVERVIEW_DOC, OVERVIEW)
+        self.write(bc27_dependencies.REFERENCE_DOC, REFERENCE)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write(self, doc, text):
+        path = self.root / "BC27" / doc
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+
+    def graph(self):
+        return bc27_dependencies.load_graph(self.root)[0]
+
+    def check(self, *args):
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            code = bc27_dependencies.main(["--root", str(self.root), "check"] + list(args))
+        return code, out.getvalue()
+
+    def test_parsed_modules_and_edges(self):
+        graph = self.graph()
+        self.assertEqual(graph.names, ["Alpha", "BaseApp", "Beta", "Delta", "Gamma"])
+        self.assertEqual(graph.resolve("betaext"), "Beta")  # path folder alias
+        self.assertEqual(graph.modules[graph.ids["Gamma"]]["external"], ["Graph API"])
+        edges = {(src, dst, kind): refs for src, dst, kind, refs in graph.edges_of("Delta")}
+        self.assertEqual(sorted(edges), [("Delta", "Alpha", "events"), ("Delta", "BaseApp", "requires")])
+        self.assertEqual(len(edges[("Delta", "BaseApp", "requires")]), 2)  # tree and matrix merged
+
+    def test_closure_by_edge_type(self):
+        graph = self.graph()
+        self.assertEqual(graph.upstream("Gamma", REQUIRES),
+                         {"direct": ["Beta"], "transitive": ["Alpha", "BaseApp"]})
+        self.assertEqual(graph.upstream("Gamma", REQUIRES, direct_only=True),
+                         {"direct": ["Beta"], "transitive": []})
+        self.assertEqual(graph.downstream("BaseApp", REQUIRES),
+                         {"direct": ["Alpha", "Delta"], "transitive": ["Beta", "Gamma"]})
+        self.assertEqual(graph.downstream("Alpha", bc27_dependencies.edge_mask("events")),
+                         {"direct": ["Delta"], "transitive": []})
+
+        impact = graph.impact("Alpha", REQUIRES)
+        self.assertEqual(impact["count"], 2)
+        self.assertEqual(impact["by_category"], {"Extension Modules": ["Beta", "Gamma"]})
+
+    def test_closure_matches_breadth_first_search(self):
+        graph = self.graph()
+        edges = graph.data["edges"]
+        for mask in range(1, bc27_dependencies.ALL_EDGES + 1):
+            for node, name in enumerate(graph.names):
+                seen, frontier = set(), [node]
+                while frontier:
+                    current = frontier.pop()
+                    for src, dst, kind, _ in edges:
+                        if src == current and mask & (1 << kind) and dst not in seen:
+                            seen.add(dst)
+                            frontier.append(dst)
+                result = graph.upstream(name, mask)
+                self.assertEqual(set(result["direct"]) | set(result["transitive"]),
+                                 {graph.names[i] for i in seen}, (name, mask))
+
+    def test_cycle_detection(self):
+        graph = self.graph()
+        self.assertEqual(graph.data["cycles"], [["Alpha", "Beta", "Gamma"]])
+        edges = [(src, dst, kind) for src, dst, kind, _ in graph.data["edges"]]
+        self.assertEqual(bc27_dependencies.find_cycles(graph.names, edges, mask=REQUIRES), [])
+        self.assertEqual(bc27_dependencies.find_cycles(["A", "B"], [(0, 0, 0), (0, 1, 0)]), [[0]])
+
+        code, output = self.check()
+        self.assertEqual(code, 1)
+        self.assertIn("[ERROR] Dependency cycle: Alpha <-> Beta <-> Gamma", output)
+        self.assertIn("Alpha optional Gamma", output)
+
+    def test_check_clean_and_dangling(self):
+        self.write(bc27_dependencies.REFERENCE_DOC, CLEAN_REFERENCE)
+        code, output = self.check()
+        self.assertEqual(code, 0)
+        self.assertIn("[SUCCESS] 5 modules", output)
+
+        self.write(bc27_dependencies.REFERENCE_DOC, DANGLING_REFERENCE)
+        code, output = self.check("--json")
+        self.assertEqual(code, 1)
+        report = json.loads(output)
+        self.assertEqual(report["cycles"], [])
+        self.assertEqual([name for name, _ in report["dangling"]], ["Zeta"])
+
+    def test_index_rebuilt_only_when_docs_change(self):
+        self.assertTrue(bc27_dependencies.load_graph(self.root)[1])
+        self.assertFalse(bc27_dependencies.load_graph(self.root)[1])
+        self.write(bc27_dependencies.REFERENCE_DOC, CLEAN_REFERENCE)
+        graph, rebuilt = bc27_dependencies.load_graph(self.root)
+        self.assertTrue(rebuilt)
+        self.assertEqual(graph.data["cycles"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
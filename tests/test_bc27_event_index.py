@@ -0,0 +1,185 @@
+"""Event catalog parsing, query filters and incremental rebuild."""
+
+import contextlib
+import io
+import os
+import shlex
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_DIR / "scripts"))
+
+import bc27_event_index  # noqa: E402
+
+MAIN_CATALOG = """# BC27 Event Catalog
+
+## Sales Events
+
+### Posting Events
+
+#### OnBeforePostSalesDoc
+- **Publisher**: Codeunit 80 "Sales-Post"
+- **Type**: IntegrationEvent
+- **Parameters**: `var SalesHeader: Record "Sales Header"`, `var Handled: Boolean`
+- **When**: Before any sales document posting begins
+- **Cancellable**: Yes (set `Handled := true`)
+- **Common Uses**:
+  - Custom document validation
+  - Trigger approval workflows
+- **Source**: [SalesPost.Codeunit.al](https://example.com/SalesPost.Codeunit.al)
+
+```al
+#### OnIgnoredInsideCode
+- **Publisher**: Codeunit 1 "Nope"
+```
+
+#### OnAfterPostSalesDoc
+- **Publisher**: Codeunit 80 "Sales-Post"
+- **Type**: IntegrationEvent
+- **Parameters**: `var SalesHeader: Record "Sales Header"`
+- **Cancellable**: No
+
+---
+
+#### OnHeadingWithoutPublisher
+Just prose.
+
+## Table Events
+
+#### OnAfterValidateEvent (Customer."No.")
+- **Publisher**: Table 18 Customer
+- **Type**: BusinessEvent
+"""
+
+WAREHOUSE_CATALOG = """# Warehouse Events
+
+## Picks
+
+### OnBeforeCreatePick
+- **Publisher**: Codeunit 7312 "Create Pick"
+- **Type**: IntegrationEvent
+- **Parameters**: `var WhseActivityHeader: Record "Warehouse Activity Header"`, `var IsHandled: Boolean`
+- **Cancellable**: Yes
+- **Uses**: Custom pick creation
+"""
+
+
+class ParseCatalogTest(unittest.TestCase):
+    def setUp(self):
+        self.records = {r["name"]: r for r in bc27_event_index.parse_catalog(MAIN_CATALOG)}
+
+    def test_only_blocks_with_publisher_outside_code(self):
+        self.assertEqual(sorted(self.records),
+                         ["OnAfterPostSalesDoc", "OnAfterValidateEvent", "OnBeforePostSalesDoc"])
+
+    def test_fields(self):
+        record = self.records["OnBeforePostSalesDoc"]
+        self.assertEqual((record["object_type"], record["object_id"], record["object_name"]),
+                         ("Codeunit", 80, "Sales-Post"))
+        self.assertEqual(record["event_type"], "IntegrationEvent")
+        self.assertEqual(record["parameters"], 'var SalesHeader: Record "Sales Header", var Handled: Boolean')
+        self.assertEqual(record["cancellable"], 1)
+        self.assertEqual(record["uses"], "Custom document validation; Trigger approval workflows")
+        self.assertEqual(record["source_url"], "https://example.com/SalesPost.Codeunit.al")
+        self.assertEqual(record["section"], "Sales Events / Posting Events")
+        self.assertEqual(record["line"], 7)
+        self.assertEqual(self.records["OnAfterPostSalesDoc"]["cancellable"], 0)
+
+    def test_qualifier_and_unquoted_publisher(self):
+        record = self.records["OnAfterValidateEvent"]
+        self.assertEqual(record["qualifier"], 'Customer."No."')
+        self.assertEqual((record["object_type"], record["object_id"], record["object_name"]),
+                         ("Table", 18, "Customer"))
+        self.assertIsNone(record["cancellable"])
+        self.assertEqual(record["section"], "Table Events")
+
+    def test_publisher_type_and_number_without_quotes(self):
+        filters, words = bc27_event_index.parse_query(["publisher:Codeunit", "7312", "pick"])
+        self.assertEqual(filters, [("publisher", "Codeunit 7312")])
+        self.assertEqual(words, ["pick"])
+
+
+class IndexTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.main = self.write("BC27/BC27_EVENT_CATALOG.md", MAIN_CATALOG)
+        self.warehouse = self.write("BC27/events/BC27_EVENTS_WAREHOUSE.md", WAREHOUSE_CATALOG)
+        self.conn = bc27_event_index.connect(self.root)
+        bc27_event_index.refresh(self.conn, self.root)
+
+    def tearDown(self):
+        self.conn.close()
+        self._tmp.cleanup()
+
+    def write(self, rel, text):
+        path = self.root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def names(self, query):
+        return sorted(event["name"] for event in bc27_event_index.query(self.conn, query))
+
+    def test_filters(self):
+        self.assertEqual(self.names('publisher:"Sales-Post"'), ["OnAfterPostSalesDoc", "OnBeforePostSalesDoc"])
+        self.assertEqual(self.names("publisher:Codeunit 7312"), ["OnBeforeCreatePick"])
+        self.assertEqual(self.names("publisher:18"), ["OnAfterValidateEvent"])
+        self.assertEqual(self.names("id:80 cancellable:yes"), ["OnBeforePostSalesDoc"])
+        self.assertEqual(self.names("cancellable:no"), ["OnAfterPostSalesDoc", "OnAfterValidateEvent"])
+        self.assertEqual(self.names("type:table"), ["OnAfterValidateEvent"])
+        self.assertEqual(self.names("event:business"), ["OnAfterValidateEvent"])
+        self.assertEqual(self.names("name:OnBefore*"), ["OnBeforeCreatePick", "OnBeforePostSalesDoc"])
+        self.assertEqual(self.names("name:PostSales"), ["OnAfterPostSalesDoc", "OnBeforePostSalesDoc"])
+        self.assertEqual(self.names("file:warehouse"), ["OnBeforeCreatePick"])
+
+    def test_free_text_is_prefix_match(self):
+        self.assertEqual(self.names("approval"), ["OnBeforePostSalesDoc"])
+        self.assertEqual(self.names('publisher:"Sales-Post" valid'), ["OnBeforePostSalesDoc"])
+        self.assertEqual(self.names("customer"), ["OnAfterValidateEvent"])
+        self.assertEqual(self.names("nothing-matches-this"), [])
+
+    def test_incremental_rebuild_reparses_only_changed_file(self):
+        report = bc27_event_index.refresh(self.conn, self.root)
+        self.assertEqual(report["parsed"], [])
+        self.assertEqual(len(report["unchanged"]), 2)
+
+        self.warehouse.write_text(WAREHOUSE_CATALOG.replace("OnBeforeCreatePick", "OnAfterCreatePick"),
+                                  encoding="utf-8")
+        report = bc27_event_index.refresh(self.conn, self.root)
+        self.assertEqual(report["parsed"], ["BC27/events/BC27_EVENTS_WAREHOUSE.md"])
+        self.assertEqual(self.names("file:warehouse"), ["OnAfterCreatePick"])
+        self.assertEqual(self.names("pick"), ["OnAfterCreatePick"])  # FTS rows replaced too
+
+        # Same content, new mtime: touched but not re-parsed
+        stat = self.main.stat()
+        os.utime(self.main, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertEqual(bc27_event_index.refresh(self.conn, self.root)["parsed"], [])
+
+        self.warehouse.unlink()
+        report = bc27_event_index.refresh(self.conn, self.root)
+        self.assertEqual(report["removed"], ["BC27/events/BC27_EVENTS_WAREHOUSE.md"])
+        self.assertEqual(self.names("pick"), [])
+        self.assertEqual(self.conn.execute("SELECT COUNT(*) FROM events").fetchone()[0], 3)
+
+
+class DocstringExamplesTest(unittest.TestCase):
+    def test_usage_queries_return_results_on_shipped_catalogs(self):
+        examples = [line.split(" query ", 1)[1] for line in bc27_event_index.__doc__.splitlines()
+                    if "bc27_event_index.py query " in line]
+        self.assertTrue(examples)
+        with tempfile.TemporaryDirectory() as tmp:
+            shutil.copytree(str(REPO_DIR / "BC27" / "events"), str(Path(tmp) / "BC27" / "events"))
+            shutil.copy(str(REPO_DIR / "BC27" / "BC27_EVENT_CATALOG.md"), str(Path(tmp) / "BC27"))
+            for example in examples:
+                with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                    code = bc27_event_index.main(["--root", tmp, "query"] + shlex.split(example))
+                self.assertEqual(code, 0, example)
+
+
+if __name__ == "__main__":
+    unittest.main()
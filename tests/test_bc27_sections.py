@@ -0,0 +1,73 @@
+"""Section parsing, index build and SectionReader."""
+
+import contextlib
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import bc27_sections  # noqa: E402
+
+
+class AnchorTest(unittest.TestCase):
+    def anchors(self, *titles):
+        data = "".join("## %s\n\nText\n\n" % title for title in titles).encode("utf-8")
+        return [section["anchor"] for section in bc27_sections.parse_sections(data)]
+
+    def test_duplicate_headings_get_first_free_suffix(self):
+        self.assertEqual(self.anchors("Example", "Example", "Example 1"),
+                         ["example", "example-1", "example-1-1"])
+        self.assertEqual(self.anchors("Example 1", "Example", "Example", "Example"),
+                         ["example-1", "example", "example-2", "example-3"])
+
+    def test_build_indexes_colliding_headings(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            doc = Path(tmp) / "BC27" / "DOC.md"
+            doc.parent.mkdir()
+            doc.write_text("# Example\n\nA\n\n# Example\n\nB\n\n# Example 1\n\nC\n", encoding="utf-8")
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertEqual(bc27_sections.main(["--root", tmp, "build"]), 0)
+            conn = bc27_sections.connect(Path(tmp))
+            try:
+                rows = conn.execute("SELECT anchor FROM sections ORDER BY start").fetchall()
+            finally:
+                conn.close()
+            self.assertEqual([row[0] for row in rows], ["example", "example-1", "example-1-1"])
+
+
+class SectionReaderTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.doc = self.root / "BC27" / "DOC.md"
+        self.doc.parent.mkdir()
+        self.doc.write_bytes(b"# Title\n\nFirst version\n")
+        self.reader = bc27_sections.SectionReader(self.root)
+
+    def tearDown(self):
+        self.reader.close()
+        self._tmp.cleanup()
+
+    def test_close_releases_maps(self):
+        self.assertEqual(self.reader.read("BC27/DOC.md", 0, 7), "# Title")
+        self.assertEqual(len(self.reader._maps), 1)
+        self.reader.close()
+        self.assertEqual(self.reader._maps, {})
+        # The file can be replaced once the reader is closed (Windows refuses while mapped)
+        self.doc.write_bytes(b"# Other\n")
+        self.assertEqual(self.reader.read("BC27/DOC.md", 0, 7), "# Other")
+
+    def test_changed_file_is_remapped(self):
+        self.reader.read("BC27/DOC.md", 0, 7)
+        self.doc.write_bytes(b"# Title\n\nSecond, longer version\n")
+        self.assertEqual(self.reader.read("BC27/DOC.md", 9, 15), "Second")
+        self.doc.write_bytes(b"")
+        self.assertEqual(self.reader.read("BC27/DOC.md", 0, 7), "")
+        self.assertEqual(self.reader._maps, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
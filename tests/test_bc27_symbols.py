@@ -0,0 +1,222 @@
+"""AL parsing, member slicing and catalog verification on a synthetic tree."""
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import bc27_symbols  # noqa: E402
+
+SALES_POST = """codeunit 80 "Sales-Post"
+{
+    procedure Run(var SalesHeader: Record "Sales Header")
+    begin
+        OnBeforePostSalesDoc(SalesHeader, false, IsHandled);
+    end;
+
+    [IntegrationEvent(false, false)]
+    local procedure OnBeforePostSalesDoc(var SalesHeader: Record "Sales Header"; "Amount (LCY)": Decimal;
+        CommitIsSuppressed: Boolean;
+        var IsHandled: Boolean)
+    begin
+    end;
+
+    [BusinessEvent(false)]
+    procedure OnAfterPostSalesDoc(var SalesHeader: Record "Sales Header"; "No. (Series)": Code[20]): Boolean
+    begin
+    end;
+}
+"""
+
+SALES_HEADER = """﻿table 36 "Sales Header"
+{
+    fields
+    {
+        field(1; "Document Type"; Enum "Sales Document Type")
+        {
+        }
+        field(3; "No."; Code[20]) { }
+    }
+}
+
+tableextension 50100 "ABC Sales Header" extends "Sales Header"
+{
+    fields
+    {
+        field(50100; "ABC Approved"; Boolean) { }
+    }
+}
+"""
+
+STATUS_PAGE = """enum 50101 "ABC Status"
+{
+    value(0; Open) { }
+    value(1; "In Progress") { }
+}
+
+page 50102 "ABC Card"
+{
+    layout
+    {
+        area(Content)
+        {
+            field(Status; Rec.Status) { }
+        }
+    }
+}
+"""
+
+CATALOG = """# Events
+
+## Sales
+
+#### OnBeforePostSalesDoc
+- **Publisher**: Codeunit 80 "Sales-Post"
+
+#### OnAfterInsertEvent
+- **Publisher**: Table 36 "Sales Header"
+
+#### OnBeforeCreatePick
+- **Publisher**: Codeunit 7312 "Create Pick"
+"""
+
+MISSING_EVENT = """
+#### OnBeforeReleaseSalesDoc
+- **Publisher**: Codeunit 80 "Sales-Post"
+"""
+
+
+class ParseAlTest(unittest.TestCase):
+    def parse(self, text):
+        return {obj[2]: obj for obj in bc27_symbols.parse_al(text.encode("utf-8"))}
+
+    def test_multi_line_publisher_signature(self):
+        members = {m[1]: m for m in self.parse(SALES_POST)["Sales-Post"][7]}
+        kind, _, _, signature, event_type, line, _, _ = members["OnBeforePostSalesDoc"]
+        self.assertEqual((kind, event_type, line), ("event", "IntegrationEvent(false, false)", 9))
+        # The first ")" closes "(LCY)" on the first line, not the parameter list
+        self.assertEqual(signature, 'local procedure OnBeforePostSalesDoc(var SalesHeader: Record "Sales Header";'
+                                    ' "Amount (LCY)": Decimal; CommitIsSuppressed: Boolean; var IsHandled: Boolean)')
+        # Quoted parameter with parentheses, return type on the closing line
+        self.assertEqual(members["OnAfterPostSalesDoc"][3:5], (
+            'procedure OnAfterPostSalesDoc(var SalesHeader: Record "Sales Header"; "No. (Series)": Code[20]): Boolean',
+            "BusinessEvent(false)"))
+        self.assertEqual(members["Run"][0], "procedure")
+        self.assertIsNone(members["Run"][4])
+
+    def test_fields_values_and_object_ranges(self):
+        data = SALES_HEADER.encode("utf-8")
+        objects = self.parse(SALES_HEADER)
+        table = objects["Sales Header"]
+        self.assertEqual(table[:5], ("Table", 36, "Sales Header", None, 1))
+        self.assertEqual(table[5], 3)  # after the BOM
+        self.assertEqual([(m[0], m[2], m[1]) for m in table[7]],
+                         [("field", 1, "Document Type"), ("field", 3, "No.")])
+        self.assertEqual(table[7][0][3], 'field(1; "Document Type"; Enum "Sales Document Type")')
+        self.assertTrue(data[table[5]:table[6]].endswith(b"}"))
+
+        extension = objects["ABC Sales Header"]
+        self.assertEqual(extension[:5], ("TableExtension", 50100, "ABC Sales Header", "Sales Header", 12))
+        self.assertLess(table[6], extension[5])
+
+        objects = self.parse(STATUS_PAGE)
+        self.assertEqual([(m[0], m[2], m[1]) for m in objects["ABC Status"][7]],
+                         [("value", 0, "Open"), ("value", 1, "In Progress")])
+        self.assertEqual(objects["ABC Card"][7], [])  # page controls are not table fields
+
+
+class SymbolIndexTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name) / "project"
+        self.source = Path(self._tmp.name) / "symbols"
+        self.write(self.source, "BaseApp/Sales/SalesPost.Codeunit.al", SALES_POST)
+        self.write(self.source, "BaseApp/Sales/SalesHeader.Table.al", SALES_HEADER)
+        self.write(self.source, "ABC/Status.al", STATUS_PAGE)
+        self.catalog = self.write(self.root, "BC27/BC27_EVENT_CATALOG.md", CATALOG)
+        self.db = Path(self._tmp.name) / "symbols.sqlite3"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write(self, base, rel, text):
+        path = base / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def run_cli(self, *args):
+        with contextlib.redirect_stdout(io.StringIO()) as out, contextlib.redirect_stderr(io.StringIO()):
+            code = bc27_symbols.main(["--root", str(self.root), "--source", str(self.source),
+                                      "--db", str(self.db)] + list(args))
+        return code, out.getvalue()
+
+    def test_incremental_refresh(self):
+        conn = bc27_symbols.connect(self.root, self.db)
+        try:
+            report = bc27_symbols.refresh(conn, self.source)
+            self.assertEqual((report["parsed"], report["objects"]), (3, 5))
+            self.assertEqual(bc27_symbols.refresh(conn, self.source)["unchanged"], 3)
+
+            self.write(self.source, "ABC/Status.al", STATUS_PAGE.replace("Open", "Closed"))
+            (self.source / "BaseApp" / "Sales" / "SalesHeader.Table.al").unlink()
+            report = bc27_symbols.refresh(conn, self.source)
+            self.assertEqual((report["parsed"], report["removed"]), (1, 1))
+            self.assertEqual([r["name"] for r in bc27_symbols.search(conn, "Closed")], ["Closed"])
+            self.assertEqual(bc27_symbols.find_objects(conn, ["Table", "36"]), [])
+        finally:
+            conn.close()
+
+    def test_publishers(self):
+        code, output = self.run_cli("publishers", "Codeunit", "80", "--json")
+        self.assertEqual(code, 0)
+        events = json.loads(output)[0]["events"]
+        self.assertEqual([e["name"] for e in events], ["OnBeforePostSalesDoc", "OnAfterPostSalesDoc"])
+        code, output = self.run_cli("publishers", "Sales-Post", "--name", "OnAfter*", "--json")
+        self.assertEqual([e["name"] for e in json.loads(output)[0]["events"]], ["OnAfterPostSalesDoc"])
+
+    def test_source_member_slice(self):
+        code, output = self.run_cli("source", "Codeunit", "80", "--member", "OnBeforePostSalesDoc")
+        self.assertEqual(code, 0)
+        self.assertEqual(output.splitlines(), [
+            'local procedure OnBeforePostSalesDoc(var SalesHeader: Record "Sales Header"; "Amount (LCY)": Decimal;',
+            "        CommitIsSuppressed: Boolean;",
+            "        var IsHandled: Boolean)",
+            "    begin",
+            "    end;",
+        ])
+
+        code, output = self.run_cli("source", "Table", "36", "--member", "Document*")
+        self.assertEqual(output.splitlines(), [
+            'field(1; "Document Type"; Enum "Sales Document Type")', "        {", "        }"])
+
+        code, output = self.run_cli("source", "Sales-Post", "--lines", "2")
+        self.assertEqual(output.splitlines(),
+                         ['codeunit 80 "Sales-Post"', "{", "... (17 more lines, use --lines 0 for all)"])
+
+        self.assertEqual(self.run_cli("source", "Codeunit", "80", "--member", "OnNothing")[0], 1)
+
+    def test_check_catalog(self):
+        code, output = self.run_cli("check-catalog")
+        self.assertEqual(code, 0)
+        self.assertIn("[SUCCESS] 2 of 3 catalog events verified", output)
+        self.assertIn("1 event(s) on 1 publisher object(s) outside the indexed source", output)
+
+        self.catalog.write_text(CATALOG + MISSING_EVENT, encoding="utf-8")
+        code, output = self.run_cli("check-catalog", "--json")
+        self.assertEqual(code, 1)
+        report = json.loads(output)
+        self.assertEqual(report["checked"], 4)
+        self.assertEqual(sorted((r["name"], r["reason"]) for r in report["missing"]), [
+            ("OnBeforeCreatePick", "object not indexed"),
+            ("OnBeforeReleaseSalesDoc", "event not found"),
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+"""Workspace lint: discovery, pool path, cache invalidation, SARIF output."""
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / ".cursor" / "hooks"))
+
+import esc_lint  # noqa: E402
+
+CLEAN = 'codeunit 50100 "{prefix} Helper"\n{{\n    procedure Run()\n    begin\n    end;\n}}\n'
+NESTED_IF = (
+    'codeunit 50101 "{prefix} Nested"\n{{\n    procedure Run()\n    begin\n'
+    "        if A then\n            if B then\n                exit;\n    end;\n}}\n"
+)
+
+
+class EscLintTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.workspace = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write(self, rel, text):
+        path = self.workspace / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def add_app(self, folder, prefix):
+        self.write("%s/app.json" % folder, "{}")
+        self.write("%s/.cursor/rules/000-project-overview.mdc" % folder, "**Prefix:** %s\n" % prefix)
+
+    def test_discovery_skips_build_folders_and_uses_app_prefix(self):
+        self.add_app("AppA", "CON")
+        self.add_app("AppB", "FAB")
+        self.write("AppA/src/Helper.Codeunit.al", CLEAN.format(prefix="CON"))
+        self.write("AppB/src/Helper.Codeunit.al", CLEAN.format(prefix="CON"))  # wrong prefix for AppB
+        self.write("AppA/.alpackages/Base.al", CLEAN.format(prefix="XYZ"))
+        self.write("AppA/src/readme.txt", "not AL")
+
+        results, stats = esc_lint.lint_workspace(self.workspace, use_cache=False)
+        self.assertEqual(sorted(results), ["AppA/src/Helper.Codeunit.al", "AppB/src/Helper.Codeunit.al"])
+        self.assertEqual(sorted(stats["apps"]), ["AppA", "AppB"])
+        self.assertEqual(stats["prefixes"], ["CON", "FAB"])
+        self.assertEqual(results["AppA/src/Helper.Codeunit.al"], [])
+        self.assertEqual([v[0] for v in results["AppB/src/Helper.Codeunit.al"]], ["ESC001"])
+
+    def test_multi_line_nested_if(self):
+        self.write("src/Nested.Codeunit.al", NESTED_IF.format(prefix="ABC"))
+        results, _ = esc_lint.lint_workspace(self.workspace, use_cache=False)
+        self.assertEqual(results["src/Nested.Codeunit.al"], [("ESC005", 5, 9)])
+
+    def test_process_pool_matches_serial_scan(self):
+        count = esc_lint.POOL_THRESHOLD + 8
+        for index in range(count):
+            template = NESTED_IF if index % 2 else CLEAN
+            self.write("src/File%02d.Codeunit.al" % index, template.format(prefix="ABC"))
+        with mock.patch.object(esc_lint, "ProcessPoolExecutor", wraps=esc_lint.ProcessPoolExecutor) as pool:
+            pooled, stats = esc_lint.lint_workspace(self.workspace, jobs=2, use_cache=False)
+        self.assertTrue(pool.called)
+        self.assertEqual(stats["scanned"], count)
+        serial, _ = esc_lint.lint_workspace(self.workspace, jobs=1, use_cache=False)
+        self.assertEqual(pooled, serial)
+
+    def test_cache_reuses_results_until_rules_change(self):
+        path = self.write("src/Nested.Codeunit.al", NESTED_IF.format(prefix="ABC"))
+        first, stats = esc_lint.lint_workspace(self.workspace)
+        self.assertEqual((stats["scanned"], stats["cached"]), (1, 0))
+        self.assertTrue((self.workspace / ".cursor" / esc_lint.CACHE_NAME).is_file())
+
+        again, stats = esc_lint.lint_workspace(self.workspace)
+        self.assertEqual((stats["scanned"], stats["cached"]), (0, 1))
+        self.assertEqual(again, first)
+
+        path.write_text(CLEAN.format(prefix="ABC") + "\n", encoding="utf-8")
+        edited, stats = esc_lint.lint_workspace(self.workspace)
+        self.assertEqual(stats["scanned"], 1)
+        self.assertEqual(edited["src/Nested.Codeunit.al"], [])
+
+        # A different esc_rules.py fingerprint throws the whole cache away
+        with mock.patch.object(esc_lint, "rules_fingerprint", return_value="changed"):
+            _, stats = esc_lint.lint_workspace(self.workspace)
+        self.assertEqual((stats["scanned"], stats["cached"]), (1, 0))
+
+    def test_sarif_output_shape(self):
+        self.write("src/Nested.Codeunit.al", NESTED_IF.format(prefix="ABC"))
+        output = self.workspace / "esc.sarif"
+        with contextlib.redirect_stdout(io.StringIO()):
+            code = esc_lint.main([str(self.workspace), "--format", "sarif", "--output", str(output),
+                                  "--no-cache", "--fail-on", "warning"])
+        self.assertEqual(code, 1)
+        sarif = json.loads(output.read_text(encoding="utf-8"))
+        self.assertEqual(sarif["version"], "2.1.0")
+        self.assertIn("sarif-2.1.0", sarif["$schema"])
+        run = sarif["runs"][0]
+        rule_ids = [rule["id"] for rule in run["tool"]["driver"]["rules"]]
+        self.assertEqual(len(rule_ids), len(set(rule_ids)))
+        self.assertIn("ESC005", rule_ids)
+        result = run["results"][0]
+        self.assertEqual(result["ruleId"], "ESC005")
+        self.assertIn(result["level"], ("none", "note", "warning", "error"))
+        location = result["locations"][0]["physicalLocation"]
+        self.assertEqual(location["artifactLocation"], {"uri": "src/Nested.Codeunit.al", "uriBaseId": "%SRCROOT%"})
+        self.assertEqual(location["region"], {"startLine": 5, "startColumn": 9})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+"""Incremental ESC checks must equal a full scan of the edited file."""
+
+import random
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / ".cursor" / "hooks"))
+
+import esc_rules  # noqa: E402
+
+SOURCE = '''codeunit 50100 "Sales Helper"
+{
+    procedure Post(var SalesHeader: Record "Sales Header")
+    var
+        KlantNaam: Text[100];
+    begin
+        if SalesHeader.Find() then if SalesHeader.Ship then
+            exit;
+        SalesHeader.SetLoadFields("No.");
+        SalesHeader.Modify(true);
+        if not Confirm('Post?') then
+            Error('Cancelled');
+    end;
+}
+'''
+
+# Lines that trigger (or break) rules, including both halves of the ESC007 pair
+SNIPPETS = (
+    "        Customer.SetLoadFields(Name);",
+    "        Customer.Modify();",
+    "        Item.Insert(true);",
+    "        if A then if B then",
+    "        if Customer.Blocked then",
+    "            if Item.Blocked then",
+    "        if Confirm('Sure?') then",
+    "        Error('Failed');",
+    "    [TryFunction]",
+    "        field(1; \"No.\"; Code[20])",
+    "        DataClassification = CustomerContent;",
+    "        GebruikerId: Code[50];",
+    "        // deze regel is voor de test",
+    "table 50101 \"Other Table\"",
+    "        exit;",
+    "",
+)
+
+
+class IncrementalCheckerTest(unittest.TestCase):
+    def assert_matches_full_scan(self, checker, lines):
+        text = "\n".join(lines)
+        violations, _ = checker.check("Test.al", text)
+        self.assertEqual(violations, esc_rules.check_text(text))
+
+    def test_insert_delete_replace(self):
+        checker = esc_rules.IncrementalChecker()
+        lines = SOURCE.split("\n")
+        self.assert_matches_full_scan(checker, lines)
+
+        lines.insert(9, SNIPPETS[0])              # insert: SetLoadFields right before Modify
+        self.assert_matches_full_scan(checker, lines)
+        del lines[8]                              # delete the original SetLoadFields line
+        self.assert_matches_full_scan(checker, lines)
+        lines[9] = SNIPPETS[2]                    # replace Modify by Insert (pair still holds)
+        self.assert_matches_full_scan(checker, lines)
+        lines[8] = "        exit;"                # replace first half of the pair
+        self.assert_matches_full_scan(checker, lines)
+        lines[1:1] = [SNIPPETS[6], SNIPPETS[7]]   # TryFunction closes the ESC008 gate
+        self.assert_matches_full_scan(checker, lines)
+        del lines[0:3]                            # delete from the top
+        self.assert_matches_full_scan(checker, lines)
+        del lines[-3:]                            # delete from the bottom
+        self.assert_matches_full_scan(checker, lines)
+
+    def test_unchanged_text_rescans_nothing(self):
+        checker = esc_rules.IncrementalChecker()
+        checker.check("Test.al", SOURCE)
+        violations, rescanned = checker.check("Test.al", SOURCE)
+        self.assertEqual(rescanned, 0)
+        self.assertEqual(violations, esc_rules.check_text(SOURCE))
+
+    def test_random_edits(self):
+        rng = random.Random(27)
+        checker = esc_rules.IncrementalChecker()
+        lines = SOURCE.split("\n")
+        for _ in range(500):
+            action = rng.choice(("insert", "delete", "replace", "block"))
+            at = rng.randrange(len(lines) + 1)
+            if action == "insert" or not lines:
+                lines.insert(at, rng.choice(SNIPPETS))
+            elif action == "delete":
+                del lines[min(at, len(lines) - 1)]
+            elif action == "replace":
+                lines[min(at, len(lines) - 1)] = rng.choice(SNIPPETS)
+            else:
+                lines[at:at + rng.randrange(4)] = rng.sample(SNIPPETS, rng.randrange(4))
+            self.assert_matches_full_scan(checker, lines)
+
+    def test_prefix_change_rescans(self):
+        checker = esc_rules.IncrementalChecker()
+        checker.check("Test.al", SOURCE, prefix="ABC")
+        violations, rescanned = checker.check("Test.al", SOURCE, prefix="XYZ")
+        self.assertEqual(rescanned, len(SOURCE.split("\n")))
+        self.assertEqual(violations, esc_rules.check_text(SOURCE, prefix="XYZ"))
+
+    def test_cache_is_bounded(self):
+        checker = esc_rules.IncrementalChecker(max_files=3)
+        for index in range(5):
+            checker.check("File%d.al" % index, SOURCE)
+        self.assertEqual(len(checker), 3)
+        # File2.al is still cached, File0.al was evicted and is scanned in full
+        self.assertEqual(checker.check("File2.al", SOURCE)[1], 0)
+        self.assertEqual(checker.check("File0.al", SOURCE)[1], len(SOURCE.split("\n")))
+
+
+class RulesTest(unittest.TestCase):
+    def test_nested_if_on_separate_lines(self):
+        # Same cases as [regex]::Matches($content, 'if\s+.*\s+then\s+if') in after-file-edit.ps1
+        text = "        if A then\n            if B then\n                exit;"
+        self.assertEqual([v.rule for v in esc_rules.check_text(text)], ["ESC005"])
+        self.assertEqual(esc_rules.check_text(text)[0].line, 1)
+        self.assertEqual(esc_rules.check_text("        if A then if B then")[0].rule, "ESC005")
+        self.assertEqual(esc_rules.check_text("        if A then\n            exit;"), [])
+
+    def test_dutch_variable_names_ignore_case(self):
+        for line in ("KlantNaam: Text;", "klantnaam: Text;", "KLANTNAAM: Text;"):
+            rules = [v.rule for v in esc_rules.check_text("    " + line)]
+            self.assertIn("ESC004", rules, line)
+
+
+if __name__ == "__main__":
+    unittest.main()
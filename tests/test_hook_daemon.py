@@ -0,0 +1,111 @@
+"""Hook client <-> daemon round trip and single-instance start-up."""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+HOOKS_DIR = Path(__file__).resolve().parents[1] / ".cursor" / "hooks"
+
+
+class HookDaemonTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.home = Path(self._tmp.name) / "home"
+        self.home.mkdir()
+        self.workspace = Path(self._tmp.name) / "workspace"
+        (self.workspace / "src").mkdir(parents=True)
+        # The daemon keys its socket and state file by hooks folder under ~/.cursor
+        self.env = dict(os.environ, HOME=str(self.home), USERPROFILE=str(self.home))
+        self.env.pop("BC27_HOOKS_NO_DAEMON", None)
+        self.processes = []
+
+    def tearDown(self):
+        self.daemon("stop")
+        for process in self.processes:
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        self._tmp.cleanup()
+
+    def daemon(self, *args):
+        return subprocess.run([sys.executable, str(HOOKS_DIR / "hook_daemon.py")] + list(args),
+                              env=self.env, capture_output=True, text=True, timeout=30)
+
+    def client(self, hook, payload, cwd):
+        result = subprocess.run([sys.executable, str(HOOKS_DIR / "hook_client.py"), hook],
+                                input=json.dumps(payload), env=self.env, cwd=str(cwd),
+                                capture_output=True, text=True, timeout=30)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return json.loads(result.stdout)
+
+    def stats(self):
+        result = self.daemon("status", "--json")
+        return json.loads(result.stdout) if result.returncode == 0 else None
+
+    def test_round_trip_through_daemon(self):
+        self.assertEqual(self.daemon("start").returncode, 0)
+
+        response = self.client("beforeReadFile", {"file_path": "config/.env"}, self.workspace)
+        self.assertFalse(response["allow"])
+
+        # Relative path resolved against the client's cwd, not the daemon's
+        (self.workspace / "src" / "Foo.al").write_text(
+            'codeunit 50100 "Foo"\n{\n}\n', encoding="utf-8")
+        response = self.client("afterFileEdit", {"file_path": "src/Foo.al"}, self.workspace)
+        self.assertIn("Missing ABC prefix", response["userMessage"])
+
+        hooks = self.stats()["hooks"]
+        self.assertEqual(hooks["beforeReadFile"]["count"], 1)
+        self.assertEqual(hooks["afterFileEdit"]["count"], 1)
+
+    def foreground(self):
+        command = [sys.executable, str(HOOKS_DIR / "hook_daemon.py"), "start", "--foreground",
+                   "--idle-timeout", "60"]
+        process = subprocess.Popen(command, env=self.env, stdout=subprocess.DEVNULL,
+                                   stderr=subprocess.DEVNULL)
+        self.processes.append(process)
+        return process
+
+    def test_second_daemon_exits_while_first_holds_the_lock(self):
+        first = self.foreground()
+        deadline = time.monotonic() + 10
+        while not self.stats() and time.monotonic() < deadline:
+            time.sleep(0.1)
+        state = self.stats()
+        self.assertEqual(state["pid"], first.pid)
+
+        # Without its state file the second daemon cannot ping the first (the
+        # window between bind and state write); only the lock stops it
+        state_files = list((self.home / ".cursor").glob("hooks-daemon-*.json"))
+        self.assertEqual(len(state_files), 1)
+        saved = state_files[0].read_bytes()
+        state_files[0].unlink()
+        second = self.foreground()
+        self.assertEqual(second.wait(timeout=10), 0)
+        self.assertIsNone(first.poll())
+        state_files[0].write_bytes(saved)
+        self.assertEqual(self.stats()["pid"], first.pid)
+
+    def test_concurrent_starts_leave_one_daemon(self):
+        for _ in range(6):
+            self.foreground()
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            running = [p for p in self.processes if p.poll() is None]
+            if len(running) == 1 and self.stats():
+                break
+            time.sleep(0.1)
+        running = [p for p in self.processes if p.poll() is None]
+        self.assertEqual(len(running), 1)
+        self.assertEqual(self.stats()["pid"], running[0].pid)
+
+
+if __name__ == "__main__":
+    unittest.main()
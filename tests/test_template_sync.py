@@ -0,0 +1,110 @@
+"""update_project: in-place updates, local edits kept, files removed upstream."""
+
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+import template_sync  # noqa: E402
+
+
+class UpdateProjectTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        root = Path(self._tmp.name)
+        self.template = root / "template"
+        self.project = root / "project"
+        self.project.mkdir()
+        self.write(self.template, ".cursor/rules/000-project-overview.mdc", "**Prefix:** ABC\n")
+        self.write(self.template, ".cursor/rules/002-patterns.mdc", "Use ABC objects (not abc).\n")
+        self.write(self.template, "docs/guide.md", "Guide v1\n")
+        self.write(self.template, "BC27/old.md", "Old doc\n")
+        report = self.update()
+        self.assertEqual(len(report["added"]), 4)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write(self, base, rel, text):
+        path = base / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+
+    def read(self, rel):
+        return (self.project / rel).read_text(encoding="utf-8")
+
+    def update(self, **kwargs):
+        return template_sync.update_project(self.project, self.template, prefix="CON", **kwargs)
+
+    def test_install_renders_prefix_case_sensitively(self):
+        self.assertEqual(self.read(".cursor/rules/002-patterns.mdc"), "Use CON objects (not abc).\n")
+        self.assertEqual(template_sync.detect_prefix(self.project), "CON")
+
+    def test_unchanged_file_is_updated_in_place(self):
+        self.write(self.template, ".cursor/rules/002-patterns.mdc", "Use ABC objects, v2.\n")
+        report = self.update()
+        self.assertEqual(report["updated"], [".cursor/rules/002-patterns.mdc"])
+        self.assertEqual(report["conflicts"], [])
+        self.assertEqual(self.read(".cursor/rules/002-patterns.mdc"), "Use CON objects, v2.\n")
+        self.assertEqual(self.update()["updated"], [])  # second run: nothing to do
+
+    def test_locally_edited_file_gets_template_new_copy(self):
+        self.write(self.project, "docs/guide.md", "Guide v1 with team notes\n")
+        self.write(self.template, "docs/guide.md", "Guide v2\n")
+        report = self.update()
+        self.assertEqual(report["conflicts"], ["docs/guide.md"])
+        self.assertEqual(self.read("docs/guide.md"), "Guide v1 with team notes\n")
+        self.assertEqual(self.read("docs/guide.md" + template_sync.CONFLICT_SUFFIX), "Guide v2\n")
+
+        # Resolving the conflict by taking the template version drops the copy
+        self.write(self.project, "docs/guide.md", "Guide v2\n")
+        report = self.update()
+        self.assertEqual(report["conflicts"], [])
+        self.assertFalse((self.project / ("docs/guide.md" + template_sync.CONFLICT_SUFFIX)).exists())
+
+    def test_file_removed_upstream(self):
+        (self.template / "BC27" / "old.md").unlink()
+        report = self.update()
+        self.assertEqual(report["removed"], ["BC27/old.md"])
+        self.assertFalse((self.project / "BC27" / "old.md").exists())
+
+    def test_file_removed_upstream_but_edited_locally_is_kept(self):
+        self.write(self.project, "BC27/old.md", "Old doc, annotated\n")
+        shutil.rmtree(str(self.template / "BC27"))
+        report = self.update()
+        self.assertEqual(report["kept"], ["BC27/old.md"])
+        self.assertEqual(self.read("BC27/old.md"), "Old doc, annotated\n")
+
+    def test_dry_run_writes_nothing(self):
+        self.write(self.template, "docs/guide.md", "Guide v2\n")
+        report = self.update(dry_run=True)
+        self.assertEqual(report["updated"], ["docs/guide.md"])
+        self.assertEqual(self.read("docs/guide.md"), "Guide v1\n")
+
+
+@unittest.skipUnless(shutil.which("bash"), "bash not available")
+class InstallScriptOptionsTest(unittest.TestCase):
+    def run_install(self, *args):
+        return subprocess.run(["bash", str(SCRIPTS_DIR / "install-rules.sh")] + list(args),
+                              capture_output=True, text=True, timeout=30)
+
+    def test_unknown_option_is_rejected(self):
+        with tempfile.TemporaryDirectory() as project:
+            result = self.run_install("--update", project, "-v")
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("Unknown option: -v", result.stdout)
+
+    def test_update_prefix_is_validated(self):
+        with tempfile.TemporaryDirectory() as project:
+            result = self.run_install("--update", project, "con")
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("3 uppercase letters", result.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+"""Byte-offset ingest and aggregates of the usage log."""
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / ".cursor" / "hooks"))
+
+import usage_analytics  # noqa: E402
+
+
+def entry(day, user="ann", model="gpt-5", workspace="/ws/app", tokens=(100, 20), tools=None, conversation="c1"):
+    return {
+        "timestamp": "%sT10:00:00" % day, "user": user, "conversationId": conversation,
+        "model": model, "workspaceFolder": workspace,
+        "usage": {"promptTokens": tokens[0], "completionTokens": tokens[1], "totalTokens": sum(tokens)},
+        "tools": tools,
+    }
+
+
+def line(item):
+    return (json.dumps(item) + "\n").encode("utf-8")
+
+
+class UsageAnalyticsTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.logs = Path(self._tmp.name) / "logs"
+        self.logs.mkdir()
+        self.log = self.logs / "cursor-usage-2026-10.jsonl"
+        self.conn = usage_analytics.connect(self.logs / usage_analytics.DB_NAME)
+
+    def tearDown(self):
+        self.conn.close()
+        self._tmp.cleanup()
+
+    def total(self, **filters):
+        rows = usage_analytics.token_totals(self.conn, by=(), **filters)
+        return rows[0]["total_tokens"] if rows else 0
+
+    def test_ingest_resumes_at_byte_offset(self):
+        first, second, third = (line(entry("2026-10-01")), line(entry("2026-10-01", tokens=(5, 5))),
+                                line(entry("2026-10-02")))
+        self.log.write_bytes(first + second + third[:10])  # last line still being written
+        self.assertEqual(usage_analytics.ingest(self.conn, self.log), 2)
+        self.assertEqual(usage_analytics.ingest(self.conn, self.log), 0)
+
+        with open(self.log, "ab") as handle:
+            handle.write(third[10:])
+        self.assertEqual(usage_analytics.ingest(self.conn, self.log), 1)
+        self.assertEqual(self.total(), 120 + 10 + 120)
+
+    def test_truncated_log_is_reingested(self):
+        self.log.write_bytes(line(entry("2026-10-01")) + line(entry("2026-10-01")))
+        usage_analytics.ingest(self.conn, self.log)
+        self.log.write_bytes(line(entry("2026-10-03")))
+        self.assertEqual(usage_analytics.ingest(self.conn, self.log), 1)
+
+    def test_aggregates(self):
+        self.log.write_bytes(
+            line(entry("2026-10-01", tools=["read_file", "grep"]))
+            + line(entry("2026-10-01", model="claude", tokens=(300, 50), tools=[{"name": "grep"}],
+                         conversation="c2"))
+            + line(entry("2026-10-02", user="bob", tools="read_file"))
+            + b"not json\n"
+        )
+        self.assertEqual(usage_analytics.ingest_all(self.conn, self.logs), 3)
+
+        by_day = usage_analytics.token_totals(self.conn, by=("day",))
+        self.assertEqual([(r["day"], r["responses"], r["total_tokens"]) for r in by_day],
+                         [("2026-10-01", 2, 470), ("2026-10-02", 1, 120)])
+        by_model = usage_analytics.token_totals(self.conn, by=("model",), user="ann")
+        self.assertEqual([(r["model"], r["total_tokens"]) for r in by_model], [("claude", 350), ("gpt-5", 120)])
+        self.assertEqual(self.total(date_from="2026-10-02"), 120)
+        self.assertEqual(usage_analytics.tool_totals(self.conn),
+                         [{"tool": "grep", "uses": 2}, {"tool": "read_file", "uses": 2}])
+        self.assertEqual(usage_analytics.conversation_count(self.conn, "2026-10-01", "2026-10-01"), 2)
+        with self.assertRaises(ValueError):
+            usage_analytics.token_totals(self.conn, by=("tool",))
+
+        summary = usage_analytics.daily_summary(self.conn, "2026-10-01", "ann")
+        self.assertIn("Total Conversations: 2", summary)
+        self.assertIn("Total Tokens Used: 470", summary)
+        self.assertIn("Average Tokens/Conversation: 235", summary)
+
+    def test_hook_appends_and_writes_summary(self):
+        hook = usage_analytics.AfterAgentResponse(self.logs)
+        payload = {"conversation_id": "c9", "model": "gpt-5", "workspace_folder": "/ws",
+                   "usage": {"prompt_tokens": 7, "completion_tokens": 3, "total_tokens": 10}}
+        self.assertTrue(hook(payload)["allow"])
+        self.assertTrue(hook(payload)["allow"])
+        logs = list(self.logs.glob(usage_analytics.LOG_PATTERN))
+        self.assertEqual(sum(len(p.read_bytes().splitlines()) for p in logs), 2)
+        summaries = list(self.logs.glob("daily-summary-*.txt"))
+        self.assertEqual(len(summaries), 1)
+        self.assertIn("Total Tokens Used: 20", summaries[0].read_text(encoding="utf-8"))
+
+    def test_report_does_not_create_logs_dir(self):
+        missing = Path(self._tmp.name) / "no-logs"
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            self.assertEqual(usage_analytics.main(["--logs-dir", str(missing), "report", "--json"]), 0)
+        self.assertEqual(json.loads(out.getvalue()), [])
+        self.assertFalse(missing.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()